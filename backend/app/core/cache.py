@@ -0,0 +1,441 @@
+import asyncio
+import json
+import os
+import sqlite3
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Optional
+from app.core.singleflight import SingleFlight
+
+
+def json_size(value: Any) -> int:
+    """Approximate memory footprint of a JSON-like value by its serialized length."""
+    return len(json.dumps(value, default=str))
+
+
+class MemoryCache:
+    """
+    In-process LRU cache with a per-entry TTL.
+
+    Bounded by entry count and, when max_bytes is set, by the approximate
+    size of the stored values (measured once, on set).
+    """
+
+    def __init__(self, max_entries: int = 1000, ttl: float = 3600, max_bytes: Optional[int] = None,
+                 sizeof: Callable[[Any], int] = json_size):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.sizeof = sizeof
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self.bytes = 0
+        self.evictions = 0
+
+    def get(self, key: str) -> Optional[Any]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        value, expires_at, _ = entry
+        if expires_at <= time.time():
+            self.delete(key)
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None, expires_at: Optional[float] = None):
+        if expires_at is None:
+            expires_at = time.time() + (self.ttl if ttl is None else ttl)
+        size = self.sizeof(value) if self.max_bytes else 0
+        self.delete(key)
+        self._entries[key] = (value, expires_at, size)
+        self.bytes += size
+        while len(self._entries) > self.max_entries or (self.max_bytes and self.bytes > self.max_bytes and len(self._entries) > 1):
+            _, (_, _, evicted_size) = self._entries.popitem(last=False)
+            self.bytes -= evicted_size
+            self.evictions += 1
+
+    def delete(self, key: str):
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self.bytes -= entry[2]
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class SQLiteStore:
+    """
+    JSON key/value store in a SQLite file.
+
+    The file can be shared by every uvicorn worker on the host, so entries
+    survive restarts and a value fetched by one worker is visible to all.
+    Expired rows are purged by writes at most once per PURGE_INTERVAL seconds.
+    """
+
+    PURGE_INTERVAL = 60
+
+    def __init__(self, path: str):
+        self.path = path
+        self._last_purge = 0.0
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS cache_entries ("
+                " namespace TEXT NOT NULL,"
+                " key TEXT NOT NULL,"
+                " value TEXT NOT NULL,"
+                " expires_at REAL NOT NULL,"
+                " PRIMARY KEY (namespace, key))"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS cache_entries_expires_idx ON cache_entries (expires_at)")
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.path, timeout=5)
+
+    def get(self, namespace: str, key: str) -> Optional[tuple]:
+        """Return (value, expires_at) for a live entry, or None."""
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT value, expires_at FROM cache_entries WHERE namespace = ? AND key = ?",
+                (namespace, key),
+            ).fetchone()
+        if row is None or row[1] <= time.time():
+            return None
+        return json.loads(row[0]), row[1]
+
+    def set(self, namespace: str, key: str, value: Any, expires_at: float):
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO cache_entries (namespace, key, value, expires_at) VALUES (?, ?, ?, ?)",
+                (namespace, key, json.dumps(value), expires_at),
+            )
+            now = time.time()
+            if now - self._last_purge >= self.PURGE_INTERVAL:
+                self._last_purge = now
+                conn.execute("DELETE FROM cache_entries WHERE expires_at <= ?", (now,))
+
+    def delete(self, namespace: str, key: str):
+        with self._connect() as conn:
+            conn.execute("DELETE FROM cache_entries WHERE namespace = ? AND key = ?", (namespace, key))
+
+
+class CacheBackend(ABC):
+    """
+    Shared storage tier behind the in-memory caches.
+
+    Values are JSON-serializable and stored per (namespace, key) with an
+    absolute expiry time. Backends raise on I/O failure; callers treat that
+    as a miss.
+    """
+
+    name = "backend"
+
+    @abstractmethod
+    async def get(self, namespace: str, key: str) -> Optional[tuple]:
+        """Return (value, expires_at) for a live entry, or None."""
+
+    @abstractmethod
+    async def set(self, namespace: str, key: str, value: Any, expires_at: float):
+        """Store value until expires_at (epoch seconds)."""
+
+    @abstractmethod
+    async def delete(self, namespace: str, key: str):
+        """Remove the entry if present."""
+
+
+class SQLiteBackend(CacheBackend):
+    """SQLiteStore run off the event loop. Shared by every worker on one host."""
+
+    name = "sqlite"
+
+    def __init__(self, path: str):
+        self.store = SQLiteStore(path)
+
+    async def get(self, namespace: str, key: str) -> Optional[tuple]:
+        return await asyncio.to_thread(self.store.get, namespace, key)
+
+    async def set(self, namespace: str, key: str, value: Any, expires_at: float):
+        await asyncio.to_thread(self.store.set, namespace, key, value, expires_at)
+
+    async def delete(self, namespace: str, key: str):
+        await asyncio.to_thread(self.store.delete, namespace, key)
+
+
+class RedisBackend(CacheBackend):
+    """
+    Any Redis-protocol server (Redis, Valkey, KeyDB...). Shared across hosts.
+
+    Entries are stored as JSON under "<prefix><namespace>:<key>" and expire
+    server-side. Needs the optional `redis` package.
+    """
+
+    name = "redis"
+
+    def __init__(self, url: str, prefix: str = "vidyamitra:"):
+        try:
+            import redis.asyncio as redis_asyncio
+        except ImportError as e:
+            raise RuntimeError("CACHE_BACKEND=redis needs the 'redis' package (pip install redis)") from e
+        self.prefix = prefix
+        # RESP2 works with every Redis-protocol server, including ones without HELLO
+        self.client = redis_asyncio.from_url(url, protocol=2, socket_timeout=1, socket_connect_timeout=1)
+
+    def _key(self, namespace: str, key: str) -> str:
+        return f"{self.prefix}{namespace}:{key}"
+
+    async def get(self, namespace: str, key: str) -> Optional[tuple]:
+        raw = await self.client.get(self._key(namespace, key))
+        if raw is None:
+            return None
+        entry = json.loads(raw)
+        if entry["expires_at"] <= time.time():
+            return None
+        return entry["value"], entry["expires_at"]
+
+    async def set(self, namespace: str, key: str, value: Any, expires_at: float):
+        ttl_ms = int((expires_at - time.time()) * 1000)
+        if ttl_ms <= 0:
+            return
+        payload = json.dumps({"value": value, "expires_at": expires_at})
+        await self.client.set(self._key(namespace, key), payload, px=ttl_ms)
+
+    async def delete(self, namespace: str, key: str):
+        await self.client.delete(self._key(namespace, key))
+
+    async def close(self):
+        await self.client.aclose()
+
+
+_backends: dict = {}
+
+
+def cache_backend(sqlite_path: Optional[str] = None) -> Optional[CacheBackend]:
+    """
+    Shared tier for a cache, chosen by settings.CACHE_BACKEND.
+
+      - "memory": None, the cache keeps its in-process LRU only
+      - "sqlite": a SQLiteBackend on sqlite_path (None if no path is given)
+      - "redis":  one RedisBackend on settings.CACHE_REDIS_URL for every cache
+
+    Backends are created once and shared. Returns None (memory only) if the
+    backend cannot be set up.
+    """
+    from app.core.config import settings
+
+    kind = settings.CACHE_BACKEND.lower()
+    if kind == "redis":
+        ident = ("redis", settings.CACHE_REDIS_URL)
+    elif kind == "sqlite" and sqlite_path:
+        ident = ("sqlite", os.path.abspath(sqlite_path))
+    else:
+        return None
+
+    if ident not in _backends:
+        try:
+            _backends[ident] = RedisBackend(settings.CACHE_REDIS_URL) if kind == "redis" else SQLiteBackend(sqlite_path)
+        except Exception as e:
+            print(f"Warning: {kind} cache backend unavailable, using memory only: {e}")
+            _backends[ident] = None
+    return _backends[ident]
+
+
+async def close_backends():
+    for backend in _backends.values():
+        if isinstance(backend, RedisBackend):
+            await backend.close()
+    _backends.clear()
+
+
+class ResponseCache:
+    """
+    Two-level cache: an in-memory LRU in front of an optional shared CacheBackend.
+
+    Memory misses fall through to the backend and are promoted on a hit,
+    keeping the remaining TTL of the stored entry. Backend failures are logged
+    and treated as misses.
+    """
+
+    def __init__(self, namespace: str, ttl: float, max_entries: int, store: Optional[CacheBackend] = None):
+        self.namespace = namespace
+        self.ttl = ttl
+        self.memory = MemoryCache(max_entries=max_entries, ttl=ttl)
+        self.store = store
+        self.hits = 0
+        self.misses = 0
+        self.store_hits = 0
+        self.store_errors = 0
+
+    async def get(self, key: str) -> Optional[Any]:
+        value = self.memory.get(key)
+        if value is not None:
+            self.hits += 1
+            return value
+
+        if self.store:
+            try:
+                stored = await self.store.get(self.namespace, key)
+            except Exception as e:
+                self.store_errors += 1
+                print(f"Cache store read error ({self.namespace}): {e}")
+                stored = None
+            if stored is not None:
+                value, expires_at = stored
+                self.memory.set(key, value, expires_at=expires_at)
+                self.hits += 1
+                self.store_hits += 1
+                return value
+
+        self.misses += 1
+        return None
+
+    async def set(self, key: str, value: Any):
+        expires_at = time.time() + self.ttl
+        self.memory.set(key, value, expires_at=expires_at)
+        if self.store:
+            try:
+                await self.store.set(self.namespace, key, value, expires_at)
+            except Exception as e:
+                self.store_errors += 1
+                print(f"Cache store write error ({self.namespace}): {e}")
+
+    async def delete(self, key: str):
+        self.memory.delete(key)
+        if self.store:
+            try:
+                await self.store.delete(self.namespace, key)
+            except Exception as e:
+                self.store_errors += 1
+                print(f"Cache store delete error ({self.namespace}): {e}")
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+            "store_hits": self.store_hits,
+            "store_errors": self.store_errors,
+            "entries": len(self.memory),
+            "max_entries": self.memory.max_entries,
+            "evictions": self.memory.evictions,
+            "ttl_seconds": self.ttl,
+            "backend": self.store.name if self.store else "memory",
+        }
+
+
+class StaleWhileRevalidateCache:
+    """
+    Bounded in-memory cache that keeps serving an entry for a while after it
+    goes stale.
+
+    A fresh hit returns straight away. A stale hit also returns straight away,
+    and a background refresh is started for that key. A miss loads inline.
+    Loads and refreshes for the same key are coalesced. Values that
+    should_cache rejects (e.g. error payloads) are returned but not stored.
+    With a shared store, memory misses are looked up there first and loaded
+    values are written through, so other workers pick them up.
+    """
+
+    def __init__(self, name: str, fresh_ttl: float, stale_ttl: float, max_entries: int,
+                 max_bytes: Optional[int] = None, should_cache: Callable[[Any], bool] = lambda value: True,
+                 store: Optional[CacheBackend] = None):
+        self.name = name
+        self.store = store
+        self.fresh_ttl = fresh_ttl
+        self.stale_ttl = stale_ttl
+        self.should_cache = should_cache
+        # Entries live until the end of the stale window; each value carries its own fresh-until time
+        self.memory = MemoryCache(max_entries=max_entries, ttl=fresh_ttl + stale_ttl, max_bytes=max_bytes,
+                                  sizeof=lambda entry: json_size(entry[0]))
+        self._flights = SingleFlight()
+        self._refreshing: set = set()
+        self._tasks: set = set()
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.refreshes = 0
+        self.refresh_errors = 0
+        self.store_errors = 0
+
+    async def _store_get(self, key: str) -> Optional[tuple]:
+        try:
+            stored = await self.store.get(self.name, key)
+        except Exception as e:
+            self.store_errors += 1
+            print(f"Cache store read error ({self.name}): {e}")
+            return None
+        if stored is None:
+            return None
+        (value, fresh_until), expires_at = stored
+        entry = (value, fresh_until)
+        self.memory.set(key, entry, expires_at=expires_at)
+        return entry
+
+    async def _store_set(self, key: str, entry: tuple):
+        try:
+            await self.store.set(self.name, key, list(entry), entry[1] + self.stale_ttl)
+        except Exception as e:
+            self.store_errors += 1
+            print(f"Cache store write error ({self.name}): {e}")
+
+    async def _load(self, key: str, loader: Callable[[], Awaitable[Any]]) -> Any:
+        async def load_and_store():
+            value = await loader()
+            if self.should_cache(value):
+                entry = (value, time.time() + self.fresh_ttl)
+                self.memory.set(key, entry)
+                if self.store:
+                    await self._store_set(key, entry)
+            return value
+        return await self._flights.do(key, load_and_store)
+
+    async def _refresh(self, key: str, loader: Callable[[], Awaitable[Any]]):
+        try:
+            await self._load(key, loader)
+            self.refreshes += 1
+        except Exception as e:
+            self.refresh_errors += 1
+            print(f"Cache refresh error ({self.name}, {key}): {e}")
+        finally:
+            self._refreshing.discard(key)
+
+    async def get_or_load(self, key: str, loader: Callable[[], Awaitable[Any]]) -> Any:
+        entry = self.memory.get(key)
+        if entry is None and self.store:
+            entry = await self._store_get(key)
+        if entry is not None:
+            value, fresh_until = entry
+            if fresh_until > time.time():
+                self.hits += 1
+            else:
+                self.stale_hits += 1
+                if key not in self._refreshing:
+                    self._refreshing.add(key)
+                    task = asyncio.create_task(self._refresh(key, loader))
+                    self._tasks.add(task)
+                    task.add_done_callback(self._tasks.discard)
+            return value
+
+        self.misses += 1
+        return await self._load(key, loader)
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.stale_hits + self.misses
+        return {
+            "hits": self.hits,
+            "stale_hits": self.stale_hits,
+            "misses": self.misses,
+            "hit_rate": round((self.hits + self.stale_hits) / lookups, 3) if lookups else 0.0,
+            "refreshes": self.refreshes,
+            "refresh_errors": self.refresh_errors,
+            "entries": len(self.memory),
+            "max_entries": self.memory.max_entries,
+            "bytes": self.memory.bytes,
+            "max_bytes": self.memory.max_bytes,
+            "evictions": self.memory.evictions,
+            "store_errors": self.store_errors,
+            "backend": self.store.name if self.store else "memory",
+        }
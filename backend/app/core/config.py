@@ -17,11 +17,63 @@ class Settings(BaseSettings):
     # Database - Made optional
     SUPABASE_URL: Optional[str] = None
     SUPABASE_KEY: Optional[str] = None
+    # Connections kept open to Supabase's REST API (also the cap on in-flight queries per worker), and per-query timeout.
+    # More is not free: the async connection pool checks every connection on each request
+    DB_MAX_CONNECTIONS: int = 10
+    DB_TIMEOUT_SECONDS: float = 10.0
     
     # Security - Made optional with default for dev
     JWT_SECRET: str = "dev_secret_key" 
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
+    # Compatibility for clients that identify users with ?user_id= / the /{user_id} path instead of a
+    # bearer token. Anyone can claim any id that way, so keep it off outside local development.
+    ALLOW_USER_ID_WITHOUT_TOKEN: bool = False
+
+    # Shared cache tier: "memory" (per worker), "sqlite" (per host, the *_DB_PATH files) or "redis" (CACHE_REDIS_URL, any host)
+    CACHE_BACKEND: str = "sqlite"
+    CACHE_REDIS_URL: str = "redis://localhost:6379/0"
+    # SQLite file for caches that have no file of their own (job search, exchange rates)
+    CACHE_DB_PATH: Optional[str] = "data/cache.sqlite3"
+
+    # How often the dashboard's news / exchange-rate snapshot is refreshed
+    MARKET_REFRESH_MINUTES: int = 30
+
+    # PDF text extraction worker pool
+    PDF_WORKERS: int = 2
+    PDF_MAX_PENDING: int = 16
+    PDF_TIMEOUT_SECONDS: float = 10.0
+    PDF_MAX_PAGES: int = 20
+    # Text sent to the LLM; extraction stops once it has this many characters
+    PDF_MAX_CHARS: int = 4000
+    # Uploads over these are rejected while they stream in
+    PDF_MAX_UPLOAD_BYTES: int = 5 * 1024 * 1024
+    PDF_MAX_UPLOAD_PAGES: int = 100
+
+    # Password hashing pool (bcrypt for /auth/login and /auth/register)
+    AUTH_WORKERS: int = 2
+    AUTH_MAX_PENDING: int = 16
+    AUTH_TIMEOUT_SECONDS: float = 10.0
+
+    # Resume PDF rendering pool for batch exports (/resume/generate/batch)
+    RENDER_WORKERS: int = 2
+    RENDER_MAX_PENDING: int = 16
+    RENDER_TIMEOUT_SECONDS: float = 30.0
+
+    # Bulk resume ingestion (/resume/bulk)
+    BULK_LLM_CONCURRENCY: int = 4
+    BULK_MAX_UPLOAD_BYTES: int = 200 * 1024 * 1024
+
+    # LLM response cache - set LLM_CACHE_DB_PATH to persist entries across restarts/workers
+    LLM_CACHE_ENABLED: bool = True
+    LLM_CACHE_DB_PATH: Optional[str] = None
+
+    # Pre-generated quiz question bank
+    QUESTION_POOL_DB_PATH: str = "data/question_pool.sqlite3"
+
+    # YouTube search results cache (set to empty to keep it in memory only)
+    YOUTUBE_CACHE_DB_PATH: Optional[str] = "data/youtube_cache.sqlite3"
+    YOUTUBE_CACHE_TTL_DAYS: int = 7
 
     class Config:
         import os
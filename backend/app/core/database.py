@@ -1,18 +1,98 @@
-from supabase import create_client, Client
+import asyncio
+import time
+from collections import defaultdict
+from typing import Any, Awaitable, Callable, Dict, Optional
+import httpx
+from supabase import AsyncClient, AsyncClientOptions, acreate_client
 from app.core.config import settings
-from typing import Optional
-
-def get_supabase_client() -> Optional[Client]:
-    if not settings.SUPABASE_URL or not settings.SUPABASE_KEY:
-        print("Warning: Supabase credentials not found. Database features will be disabled.")
-        return None
-        
-    try:
-        url: str = settings.SUPABASE_URL
-        key: str = settings.SUPABASE_KEY
-        return create_client(url, key)
-    except Exception as e:
-        print(f"Error connecting to Supabase: {e}")
-        return None
-
-supabase: Optional[Client] = get_supabase_client()
+from app.core.http import HostMetrics
+
+
+class Database:
+    """
+    Async Supabase data access.
+
+    The client and its keep-alive connection pool are created on first use,
+    or up front by connect() from the app lifespan, and shared by every
+    request. Queries are awaited on the event loop rather than parked on
+    threadpool threads, so a handler can issue independent queries together
+    with asyncio.gather. Every query is timed per table (RPCs as "rpc:<name>").
+
+        res = await db.query("quizzes", lambda t: t.select("id, score").eq("user_id", user_id).limit(10))
+    """
+
+    def __init__(self):
+        self._client: Optional[AsyncClient] = None
+        self._http: Optional[httpx.AsyncClient] = None
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._lock = asyncio.Lock()
+        self._failed = False
+        self.metrics: Dict[str, HostMetrics] = defaultdict(HostMetrics)
+
+    @property
+    def enabled(self) -> bool:
+        """False when Supabase is not configured (or could not be set up); callers skip persistence."""
+        return bool(settings.SUPABASE_URL and settings.SUPABASE_KEY) and not self._failed
+
+    async def client(self) -> AsyncClient:
+        if self._client is None:
+            async with self._lock:
+                if self._client is None:
+                    self._slots = asyncio.Semaphore(settings.DB_MAX_CONNECTIONS)
+                    self._http = httpx.AsyncClient(
+                        timeout=httpx.Timeout(settings.DB_TIMEOUT_SECONDS, connect=3.0),
+                        limits=httpx.Limits(max_connections=settings.DB_MAX_CONNECTIONS,
+                                            max_keepalive_connections=settings.DB_MAX_CONNECTIONS),
+                    )
+                    self._client = await acreate_client(
+                        settings.SUPABASE_URL, settings.SUPABASE_KEY, options=AsyncClientOptions(httpx_client=self._http)
+                    )
+        return self._client
+
+    async def connect(self):
+        """Create the client at startup so the first request does not pay for it."""
+        if not settings.SUPABASE_URL or not settings.SUPABASE_KEY:
+            print("Warning: Supabase credentials not found. Database features will be disabled.")
+            return
+        try:
+            await self.client()
+        except Exception as e:
+            self._failed = True
+            print(f"Error connecting to Supabase: {e}")
+
+    async def _timed(self, name: str, run: Callable[[], Awaitable[Any]]) -> Any:
+        metrics = self.metrics[name]
+        metrics.requests += 1
+        started = time.perf_counter()
+        try:
+            # Queries beyond the pool size wait here rather than in httpcore, whose pool
+            # rescans every queued request on each state change and slows down as the queue grows
+            async with self._slots:
+                return await run()
+        except Exception:
+            metrics.errors += 1
+            raise
+        finally:
+            metrics.latencies.append(time.perf_counter() - started)
+
+    async def query(self, table: str, build: Callable[[Any], Any]):
+        """Run the query that build() makes from client.table(table), e.g. lambda t: t.insert(row)."""
+        client = await self.client()
+        return await self._timed(table, lambda: build(client.table(table)).execute())
+
+    async def rpc(self, fn: str, params: dict):
+        client = await self.client()
+        return await self._timed(f"rpc:{fn}", lambda: client.rpc(fn, params).execute())
+
+    async def close(self):
+        if self._http is not None:
+            await self._http.aclose()
+        self._client = None
+        self._http = None
+        self._slots = None
+
+    def stats(self) -> dict:
+        return {name: metrics.stats() for name, metrics in self.metrics.items()}
+
+
+db = Database()
@@ -0,0 +1,118 @@
+import asyncio
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Optional
+
+class PoolSaturated(Exception):
+    """Raised when a BoundedProcessPool already has as many jobs as it accepts."""
+
+
+class BoundedProcessPool:
+    """
+    Process pool for CPU-bound work called from async endpoints.
+
+    Jobs run in worker processes, so they neither block the event loop nor
+    contend for the GIL with request handling. At most max_workers jobs run at
+    once and at most max_pending more wait; anything beyond that is rejected
+    with PoolSaturated instead of queueing without bound. A job that exceeds
+    its timeout raises asyncio.TimeoutError, and the workers are replaced,
+    since a running job cannot be cancelled inside its process. Other jobs
+    caught in that replacement are resubmitted once to the new workers, so
+    job functions must be safe to run twice.
+
+    Workers are spawned on first use. Job functions must be importable
+    module-level functions with picklable arguments.
+    """
+
+    def __init__(self, name: str, max_workers: int, max_pending: int, timeout: Optional[float] = None):
+        self.name = name
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self.timeout = timeout
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._in_flight = 0
+        self.submitted = 0
+        self.completed = 0
+        self.failed = 0
+        self.timeouts = 0
+        self.rejected = 0
+        self.restarts = 0
+        self.resubmitted = 0
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            # spawn: workers must not inherit the event loop, sockets or threads of the server process
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.max_workers, mp_context=multiprocessing.get_context("spawn")
+            )
+        return self._executor
+
+    def _restart(self, executor: ProcessPoolExecutor):
+        """Tear down executor if it is still the current one; later jobs already use its replacement."""
+        if executor is not self._executor:
+            return
+        self._executor = None
+        self.restarts += 1
+        # Jobs still running or queued in it fail with BrokenProcessPool and are resubmitted by run()
+        for process in list((executor._processes or {}).values()):
+            process.terminate()
+        executor.shutdown(wait=False)
+
+    @property
+    def saturated(self) -> bool:
+        return self._in_flight >= self.max_workers + self.max_pending
+
+    async def run(self, fn: Callable[..., Any], *args, timeout: Optional[float] = None) -> Any:
+        if self.saturated:
+            self.rejected += 1
+            raise PoolSaturated(f"{self.name} pool is busy")
+
+        self._in_flight += 1
+        self.submitted += 1
+        timeout = timeout or self.timeout
+        loop = asyncio.get_running_loop()
+        try:
+            for attempt in range(2):
+                executor = self._get_executor()
+                try:
+                    result = await asyncio.wait_for(loop.run_in_executor(executor, fn, *args), timeout)
+                    self.completed += 1
+                    return result
+                except asyncio.TimeoutError:
+                    self.timeouts += 1
+                    print(f"Warning: {self.name} pool job exceeded {timeout}s, restarting workers")
+                    self._restart(executor)
+                    raise
+                except BrokenProcessPool:
+                    if attempt == 0 and executor is not self._executor:
+                        # Another job's timeout or crash replaced the workers under this one
+                        self.resubmitted += 1
+                        continue
+                    self.failed += 1
+                    self._restart(executor)
+                    raise
+                except Exception:
+                    self.failed += 1
+                    raise
+        finally:
+            self._in_flight -= 1
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    def stats(self) -> dict:
+        return {
+            "max_workers": self.max_workers,
+            "max_pending": self.max_pending,
+            "in_flight": self._in_flight,
+            "submitted": self.submitted,
+            "completed": self.completed,
+            "failed": self.failed,
+            "timeouts": self.timeouts,
+            "rejected": self.rejected,
+            "restarts": self.restarts,
+            "resubmitted": self.resubmitted,
+        }
@@ -0,0 +1,137 @@
+import asyncio
+import random
+import time
+from collections import defaultdict, deque
+from typing import Dict, Optional
+from urllib.parse import urlsplit
+import httpx
+
+# Strict defaults for third-party APIs: fail fast rather than hold a request open
+DEFAULT_TIMEOUT = httpx.Timeout(5.0, connect=2.0)
+DEFAULT_LIMITS = httpx.Limits(max_connections=100, max_keepalive_connections=20, keepalive_expiry=30)
+
+# Per-service policy: timeout, retry attempts after the first try, and max concurrent connections to its host
+SERVICES = {
+    "youtube": {"timeout": httpx.Timeout(4.0, connect=2.0), "retries": 1, "max_connections": 10},
+    "pexels": {"timeout": httpx.Timeout(4.0, connect=2.0), "retries": 1, "max_connections": 5},
+    "jsearch": {"timeout": httpx.Timeout(10.0, connect=3.0), "retries": 2, "max_connections": 10},
+    "newsapi": {"timeout": httpx.Timeout(5.0, connect=2.0), "retries": 2, "max_connections": 5},
+    "exchangerate": {"timeout": httpx.Timeout(5.0, connect=2.0), "retries": 2, "max_connections": 5},
+}
+DEFAULT_SERVICE = {"timeout": DEFAULT_TIMEOUT, "retries": 1, "max_connections": 10}
+
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+BACKOFF_BASE = 0.2   # seconds
+BACKOFF_CAP = 2.0    # seconds
+LATENCY_SAMPLES = 200
+
+_client: Optional[httpx.AsyncClient] = None
+_host_slots: Dict[str, asyncio.Semaphore] = {}
+
+
+class HostMetrics:
+    """Request counters and recent latencies for one upstream host."""
+
+    def __init__(self):
+        self.requests = 0
+        self.errors = 0
+        self.retries = 0
+        self.latencies = deque(maxlen=LATENCY_SAMPLES)
+
+    def stats(self) -> dict:
+        samples = sorted(self.latencies)
+        def percentile(p):
+            return round(samples[min(len(samples) - 1, int(p * len(samples)))] * 1000, 1) if samples else 0.0
+        return {
+            "requests": self.requests,
+            "errors": self.errors,
+            "retries": self.retries,
+            "p50_ms": percentile(0.5),
+            "p95_ms": percentile(0.95),
+            "max_ms": round(samples[-1] * 1000, 1) if samples else 0.0,
+        }
+
+
+metrics: Dict[str, HostMetrics] = defaultdict(HostMetrics)
+
+
+def get_client() -> httpx.AsyncClient:
+    """Shared keep-alive client for outbound calls, created on first use."""
+    global _client
+    if _client is None or _client.is_closed:
+        _client = httpx.AsyncClient(timeout=DEFAULT_TIMEOUT, limits=DEFAULT_LIMITS)
+    return _client
+
+
+def _host_slot(host: str, policy: dict) -> asyncio.Semaphore:
+    slot = _host_slots.get(host)
+    if slot is None:
+        slot = _host_slots[host] = asyncio.Semaphore(policy["max_connections"])
+    return slot
+
+
+def _backoff(attempt: int, retry_after: Optional[str] = None) -> float:
+    if retry_after and retry_after.isdigit():
+        return min(float(retry_after), BACKOFF_CAP)
+    # Full jitter so clients retrying together spread out
+    return random.uniform(0, min(BACKOFF_CAP, BACKOFF_BASE * 2 ** attempt))
+
+
+async def request(service: str, method: str, url: str, **kwargs) -> httpx.Response:
+    """
+    Send a request through the shared client using the service's policy.
+
+    Connection errors, timeouts and 429/5xx responses are retried with jittered
+    exponential backoff. Concurrency per host is capped, and every attempt is
+    recorded in the per-host latency metrics. After the last attempt the final
+    response is returned (or its exception raised), so callers keep their own
+    status handling.
+    """
+    policy = SERVICES.get(service, DEFAULT_SERVICE)
+    host = urlsplit(url).hostname or service
+    host_metrics = metrics[host]
+    kwargs.setdefault("timeout", policy["timeout"])
+
+    attempt = 0
+    while True:
+        host_metrics.requests += 1
+        try:
+            async with _host_slot(host, policy):
+                # Time the upstream call only, not the wait for a host slot
+                started = time.perf_counter()
+                try:
+                    response = await get_client().request(method, url, **kwargs)
+                finally:
+                    host_metrics.latencies.append(time.perf_counter() - started)
+        except httpx.TransportError:
+            host_metrics.errors += 1
+            if attempt >= policy["retries"]:
+                raise
+            retry_after = None
+        else:
+            if response.status_code not in RETRY_STATUSES:
+                return response
+            host_metrics.errors += 1
+            if attempt >= policy["retries"]:
+                return response
+            retry_after = response.headers.get("Retry-After")
+
+        host_metrics.retries += 1
+        await asyncio.sleep(_backoff(attempt, retry_after))
+        attempt += 1
+
+
+async def get(service: str, url: str, **kwargs) -> httpx.Response:
+    return await request(service, "GET", url, **kwargs)
+
+
+def stats() -> dict:
+    return {host: host_metrics.stats() for host, host_metrics in metrics.items()}
+
+
+async def close():
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
+    _host_slots.clear()
@@ -0,0 +1,228 @@
+import json
+import re
+from typing import Any, List, Optional, Tuple
+
+# (kind, field name, value) where kind is "field", "item" or "delta"
+Event = Tuple[str, str, Any]
+
+_PARTIAL_UNICODE_ESCAPE = re.compile(r"\\u[0-9a-fA-F]{0,3}$")
+_HIGH_SURROGATE_ESCAPE = re.compile(r"\\u[dD][89abAB][0-9a-fA-F]{2}$")
+# LLMs sometimes put raw newlines inside strings; accept them
+_decoder = json.JSONDecoder(strict=False)
+
+
+class StreamingJSONParser:
+    """
+    Incremental parser for the top-level JSON object in a streamed LLM response.
+
+    Feed it text chunks as they arrive; each call returns the events that
+    became available:
+      - ("item", field, value): an element of a top-level array field closed
+      - ("field", field, value): a top-level field's value closed
+      - ("delta", field, text): more of a top-level string value arrived
+
+    Anything before the first "{" (markdown fences, chatter) is skipped. Call
+    close() at the end of the stream to get the parsed object; if the stream
+    was cut off it returns only the fields and array items that had completed.
+    """
+
+    def __init__(self):
+        self.buffer = ""
+        self.fields = {}
+        self.done = False
+        self.truncated = False
+        self._pos = 0
+        self._depth = 0
+        self._stack: List[str] = []
+        self._in_string = False
+        self._escape = False
+        self._expect_key = True
+        self._key: Optional[str] = None
+        self._key_start: Optional[int] = None
+        self._value_start: Optional[int] = None
+        self._item_start: Optional[int] = None
+        self._delta_from: Optional[int] = None
+        self._items: List[Any] = []
+
+    def feed(self, chunk: str) -> List[Event]:
+        events: List[Event] = []
+        self.buffer += chunk
+        buf = self.buffer
+
+        while self._pos < len(buf) and not self.done:
+            i = self._pos
+            ch = buf[i]
+            self._pos += 1
+
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif ch == "\\":
+                    self._escape = True
+                elif ch == '"':
+                    self._in_string = False
+                    self._string_closed(i, events)
+                continue
+
+            if self._depth == 0:
+                if ch == "{":
+                    self._depth = 1
+                    self._stack.append("{")
+                    self._expect_key = True
+                continue
+
+            if ch == '"':
+                self._value_begin(i, is_string=True)
+                self._in_string = True
+            elif ch in "{[":
+                self._value_begin(i)
+                self._stack.append(ch)
+                self._depth += 1
+            elif ch in "}]":
+                self._scalar_end(i, events)
+                self._stack.pop()
+                self._depth -= 1
+                self._container_closed(i, events)
+            elif ch == ",":
+                self._scalar_end(i, events)
+                if self._depth == 1:
+                    self._expect_key = True
+            elif ch == ":" and self._depth == 1:
+                self._expect_key = False
+            elif not ch.isspace():
+                self._value_begin(i)
+
+        if self._in_string and self._delta_from is not None:
+            self._emit_delta(len(buf), events, final=False)
+        return events
+
+    @property
+    def started(self) -> bool:
+        return self.done or bool(self._stack)
+
+    def close(self) -> dict:
+        """Finish the stream and return the top-level object, recovering what completed if it was cut off."""
+        if self.done or not self.started:
+            return self.fields
+
+        self.truncated = True
+        if self._key is not None and self._value_start is not None:
+            if len(self._stack) > 1 and self._stack[1] == "[":
+                # Array cut off mid-way: keep the elements that closed
+                self.fields[self._key] = list(self._items)
+            # A scalar at the very end of the stream is dropped: '{"score": 8' may have been cut from 85
+        return self.fields
+
+    # --- helpers ---
+    def _in_top_array(self) -> bool:
+        return self._depth == 2 and self._stack[1] == "["
+
+    def _value_begin(self, i: int, is_string: bool = False):
+        if self._depth == 1:
+            if self._expect_key:
+                if is_string:
+                    self._key_start = i
+            elif self._value_start is None:
+                self._value_start = i
+                self._items = []
+                if is_string:
+                    self._delta_from = i + 1
+        elif self._in_top_array() and self._item_start is None:
+            self._item_start = i
+
+    def _string_closed(self, i: int, events: List[Event]):
+        if self._depth == 1:
+            if self._key_start is not None:
+                self._key = _decoder.decode(self.buffer[self._key_start:i + 1])
+                self._key_start = None
+            elif self._value_start is not None:
+                self._emit_delta(i, events, final=True)
+                self._field_closed(i + 1, events)
+        elif self._in_top_array() and self._item_start is not None:
+            self._item_closed(i + 1, events)
+
+    def _scalar_end(self, i: int, events: List[Event]):
+        # Bare numbers / true / false / null end at the next "," or closing bracket
+        if self._depth == 1 and self._value_start is not None:
+            self._field_closed(i, events)
+        elif self._in_top_array() and self._item_start is not None:
+            self._item_closed(i, events)
+
+    def _container_closed(self, i: int, events: List[Event]):
+        if self._depth == 0:
+            self.done = True
+        elif self._depth == 1 and self._value_start is not None:
+            self._field_closed(i + 1, events)
+        elif self._in_top_array() and self._item_start is not None:
+            self._item_closed(i + 1, events)
+
+    def _field_closed(self, end: int, events: List[Event]):
+        value = _decoder.decode(self.buffer[self._value_start:end])
+        self._value_start = None
+        self.fields[self._key] = value
+        events.append(("field", self._key, value))
+
+    def _item_closed(self, end: int, events: List[Event]):
+        value = _decoder.decode(self.buffer[self._item_start:end])
+        self._item_start = None
+        self._items.append(value)
+        events.append(("item", self._key, value))
+
+    def _emit_delta(self, end: int, events: List[Event], final: bool):
+        raw = self.buffer[self._delta_from:end]
+        if not final:
+            # Hold back an escape sequence that is split across chunks, and the high half
+            # of a surrogate pair until its low half arrives
+            trailing = len(raw) - len(raw.rstrip("\\"))
+            if trailing % 2:
+                raw = raw[:-1]
+            else:
+                raw = _hold_back(raw, _PARTIAL_UNICODE_ESCAPE)
+            raw = _hold_back(raw, _HIGH_SURROGATE_ESCAPE)
+        if raw:
+            events.append(("delta", self._key, _decoder.decode(f'"{raw}"')))
+            self._delta_from += len(raw)
+        if final:
+            self._delta_from = None
+
+
+def _hold_back(raw: str, pattern: re.Pattern) -> str:
+    """Cut a trailing escape matched by `pattern` off `raw`, unless its backslash is itself escaped."""
+    match = pattern.search(raw)
+    if match:
+        prefix = raw[:match.start()]
+        if (len(prefix) - len(prefix.rstrip("\\"))) % 2 == 0:
+            return prefix
+    return raw
+
+
+def parse_llm_json(content: str) -> dict:
+    """
+    Extract the JSON object from a complete LLM response.
+
+    Tries the whole span between the first "{" and the last "}" first; if that
+    does not decode (truncated output, trailing chatter with braces) the text
+    goes through StreamingJSONParser so completed fields and array items are
+    still recovered. Raises ValueError when nothing usable is found.
+    """
+    start_idx = content.find('{')
+    end_idx = content.rfind('}')
+    if start_idx == -1:
+        raise ValueError("No JSON found in LLM response")
+
+    if end_idx > start_idx:
+        try:
+            data = _decoder.decode(content[start_idx:end_idx+1])
+            if isinstance(data, dict):
+                return data
+        except ValueError:
+            pass
+
+    parser = StreamingJSONParser()
+    parser.feed(content)
+    data = parser.close()
+    if not data:
+        raise ValueError("No JSON found in LLM response")
+    if parser.truncated:
+        print(f"Recovered {len(data)} field(s) from truncated LLM response")
+    return data
@@ -0,0 +1,121 @@
+import hashlib
+import json
+from collections import defaultdict
+from typing import AsyncIterator, Optional
+import google.generativeai as genai
+from app.core.config import settings
+from app.core.cache import ResponseCache, cache_backend
+from app.core.singleflight import SingleFlight
+
+# Using gemini-3-flash-preview as verified in list_models.py
+MODEL_NAME = "gemini-3-flash-preview"
+
+# Configure Gemini once for the whole process
+api_key = settings.GEMINI_API_KEY or settings.GOOGLE_API_KEY
+if api_key:
+    genai.configure(api_key=api_key)
+else:
+    print("Warning: No Google/Gemini API key found in settings.")
+
+model = genai.GenerativeModel(MODEL_NAME)
+
+# Per-endpoint response cache policy. Endpoints not listed here are never cached.
+CACHE_POLICIES = {
+    "plan": {"ttl": 7 * 24 * 3600, "max_entries": 500},
+    "evaluate": {"ttl": 24 * 3600, "max_entries": 1000},
+    "evaluate_batch": {"ttl": 24 * 3600, "max_entries": 200},
+    "resume_parse": {"ttl": 30 * 24 * 3600, "max_entries": 1000},
+}
+
+
+def _build_caches() -> dict:
+    if not settings.LLM_CACHE_ENABLED:
+        return {}
+
+    store = cache_backend(settings.LLM_CACHE_DB_PATH)
+    return {
+        endpoint: ResponseCache(f"llm:{endpoint}", policy["ttl"], policy["max_entries"], store)
+        for endpoint, policy in CACHE_POLICIES.items()
+    }
+
+
+caches = _build_caches()
+
+# One coalescing group per endpoint so the saved-call counters can be reported separately
+flights = defaultdict(SingleFlight)
+
+
+def cache_key(prompt: str, generation_config: Optional[dict] = None) -> str:
+    """Content address of a request: model name + prompt + generation config."""
+    payload = json.dumps([MODEL_NAME, prompt, generation_config or {}], sort_keys=True)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+async def generate(prompt: str, endpoint: Optional[str] = None, generation_config: Optional[dict] = None) -> str:
+    """
+    Send a prompt to the shared Gemini model and return the stripped response text.
+
+    Uses the async client so a slow generation awaits on the event loop instead
+    of holding one of the threadpool workers that sync endpoints run on.
+    Responses for endpoints with a cache policy are served from the cache when
+    the same prompt and config were seen before, and identical prompts that
+    are already in flight share a single upstream call.
+    """
+    cache = caches.get(endpoint)
+    key = cache_key(prompt, generation_config)
+    if cache:
+        cached = await cache.get(key)
+        if cached is not None:
+            return cached
+
+    async def call_model() -> str:
+        response = await model.generate_content_async(prompt, generation_config=generation_config)
+        text = response.text.strip()
+        if cache and text:
+            await cache.set(key, text)
+        return text
+
+    return await flights[endpoint or "default"].do(key, call_model)
+
+
+async def stream(prompt: str, endpoint: Optional[str] = None, generation_config: Optional[dict] = None) -> AsyncIterator[str]:
+    """
+    Yield response text chunks as Gemini produces them.
+
+    Shares the response cache with generate(): a cached response is yielded as
+    a single chunk, and a completed stream is stored for later callers.
+    """
+    cache = caches.get(endpoint)
+    key = cache_key(prompt, generation_config)
+    if cache:
+        cached = await cache.get(key)
+        if cached is not None:
+            yield cached
+            return
+
+    response = await model.generate_content_async(prompt, generation_config=generation_config, stream=True)
+    parts = []
+    async for chunk in response:
+        text = chunk.text
+        if text:
+            parts.append(text)
+            yield text
+
+    full_text = "".join(parts).strip()
+    if cache and full_text:
+        await cache.set(key, full_text)
+
+
+async def forget(prompt: str, endpoint: str, generation_config: Optional[dict] = None):
+    """Drop a cached response, e.g. when the caller could not parse it."""
+    cache = caches.get(endpoint)
+    if cache:
+        await cache.delete(cache_key(prompt, generation_config))
+
+
+def stats() -> dict:
+    return {
+        "model": MODEL_NAME,
+        "cache": {endpoint: cache.stats() for endpoint, cache in caches.items()},
+        "single_flight": {endpoint: flight.stats() for endpoint, flight in flights.items()},
+    }
@@ -0,0 +1,81 @@
+from typing import Optional
+import jwt
+from fastapi import Depends, HTTPException, Query
+from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
+from app.core.cache import MemoryCache
+from app.core.config import settings
+
+TOKEN_CACHE_SIZE = 10000
+# Only for tokens without an exp claim; everything else is cached until it expires
+TOKEN_CACHE_TTL = 300
+
+bearer_scheme = HTTPBearer(auto_error=False)
+
+# Decoded claims by raw token. A token is immutable and signed, so once verified
+# its claims stay valid until exp and repeat requests skip the HMAC check.
+token_cache = MemoryCache(max_entries=TOKEN_CACHE_SIZE, ttl=TOKEN_CACHE_TTL)
+token_hits = 0
+token_misses = 0
+
+
+def decode_access_token(token: str) -> dict:
+    """Verify and decode a token issued by auth.create_access_token. Raises jwt.InvalidTokenError."""
+    return jwt.decode(token, settings.JWT_SECRET, algorithms=[settings.ALGORITHM])
+
+
+def token_claims(token: str) -> dict:
+    global token_hits, token_misses
+    claims = token_cache.get(token)
+    if claims is not None:
+        token_hits += 1
+        return claims
+    token_misses += 1
+    claims = decode_access_token(token)
+    token_cache.set(token, claims, expires_at=claims.get("exp"))
+    return claims
+
+
+def _unauthorized(detail: str) -> HTTPException:
+    return HTTPException(status_code=401, detail=detail, headers={"WWW-Authenticate": "Bearer"})
+
+
+async def current_claims(credentials: Optional[HTTPAuthorizationCredentials] = Depends(bearer_scheme)) -> Optional[dict]:
+    """Claims of the bearer token, or None when the request has none. A bad or expired token is a 401."""
+    if credentials is None:
+        return None
+    try:
+        return token_claims(credentials.credentials)
+    except jwt.ExpiredSignatureError:
+        raise _unauthorized("Token has expired")
+    except jwt.InvalidTokenError:
+        raise _unauthorized("Invalid token")
+
+
+async def current_user_id(
+    claims: Optional[dict] = Depends(current_claims),
+    user_id: Optional[str] = Query(None, description="Used only when no bearer token is sent and ALLOW_USER_ID_WITHOUT_TOKEN is on"),
+) -> Optional[str]:
+    """
+    The signed-in user's id from the bearer token, or None for anonymous requests.
+
+    The user_id query parameter is only honoured when ALLOW_USER_ID_WITHOUT_TOKEN
+    is on; otherwise an anonymous request stays anonymous whatever it claims.
+    """
+    if claims is not None:
+        return claims.get("id")
+    return user_id if settings.ALLOW_USER_ID_WITHOUT_TOKEN else None
+
+
+async def authorized_user_id(user_id: str, claims: Optional[dict] = Depends(current_claims)) -> str:
+    """For /{user_id} routes: only the token's own user can be read; no token is a 401 unless ALLOW_USER_ID_WITHOUT_TOKEN is on."""
+    if claims is None:
+        if settings.ALLOW_USER_ID_WITHOUT_TOKEN:
+            return user_id
+        raise _unauthorized("Not authenticated")
+    if claims.get("id") != user_id:
+        raise HTTPException(status_code=403, detail="Not allowed to access another user's data")
+    return user_id
+
+
+def stats() -> dict:
+    return {"cached": len(token_cache), "hits": token_hits, "misses": token_misses}
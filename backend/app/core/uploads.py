@@ -0,0 +1,76 @@
+import json
+import re
+from typing import Iterable
+
+# Page objects in an uncompressed PDF ("/Type /Page", not "/Type /Pages")
+_PAGE_MARKER = re.compile(rb"/Type\s*/Page(?![a-zA-Z])")
+_MARKER_OVERLAP = 16
+
+
+class UploadLimitMiddleware:
+    """
+    Rejects oversized PDF uploads while the request body is still arriving.
+
+    Applies to POST requests on the given paths. A Content-Length over
+    max_bytes is refused before any of the body is read. Otherwise the body is
+    counted chunk by chunk, along with the PDF page objects visible in it, and
+    the request is cut off with 413 as soon as either cap is passed, instead
+    of after the whole upload has been spooled. Page objects inside compressed
+    object streams are not visible here; the extraction page cap still
+    applies to those.
+    """
+
+    def __init__(self, app, paths: Iterable[str], max_bytes: int, max_pages: int):
+        self.app = app
+        self.paths = set(paths)
+        self.max_bytes = max_bytes
+        self.max_pages = max_pages
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] != "POST" or scope["path"] not in self.paths:
+            await self.app(scope, receive, send)
+            return
+
+        headers = dict(scope["headers"])
+        content_length = headers.get(b"content-length")
+        if content_length and content_length.isdigit() and int(content_length) > self.max_bytes:
+            await self._reject(send, f"Upload exceeds {self.max_bytes // (1024 * 1024)} MB")
+            return
+
+        state = {"bytes": 0, "pages": 0, "tail": b"", "error": None}
+
+        async def limited_receive():
+            message = await receive()
+            if message["type"] == "http.request" and state["error"] is None:
+                chunk = message.get("body", b"")
+                state["bytes"] += len(chunk)
+                window = state["tail"] + chunk
+                # Count markers that end in the new bytes; the tail only catches ones split across chunks
+                state["pages"] += sum(1 for m in _PAGE_MARKER.finditer(window) if m.end() > len(state["tail"]))
+                state["tail"] = window[-_MARKER_OVERLAP:]
+                if state["bytes"] > self.max_bytes:
+                    state["error"] = f"Upload exceeds {self.max_bytes // (1024 * 1024)} MB"
+                elif state["pages"] > self.max_pages:
+                    state["error"] = f"PDF has more than {self.max_pages} pages"
+                if state["error"]:
+                    # Stop feeding the app; it sees an empty final chunk and fails fast
+                    return {"type": "http.request", "body": b"", "more_body": False}
+            return message
+
+        async def guarded_send(message):
+            if state["error"] is None:
+                await send(message)
+            elif message["type"] == "http.response.start":
+                await self._reject(send, state["error"])
+
+        await self.app(scope, limited_receive, guarded_send)
+
+    @staticmethod
+    async def _reject(send, detail: str):
+        body = json.dumps({"detail": detail}).encode()
+        await send({
+            "type": "http.response.start",
+            "status": 413,
+            "headers": [(b"content-type", b"application/json"), (b"content-length", str(len(body)).encode())],
+        })
+        await send({"type": "http.response.body", "body": body})
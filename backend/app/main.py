@@ -1,7 +1,18 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from app.routers import resume, quiz, progress, evaluate, plan, interview, jobs, auth
 from app.core.config import settings
+from app.services.question_pool import question_pool
+from app.services.market_data import market_snapshot
+from app.services.resume_parser import pdf_pool
+from app.services.bulk_resume import MAX_BULK_FILES, bulk_processor
+from app.services.resume_export import render_pool
+from app.routers.auth import auth_pool
+from app.core import http
+from app.core.database import db
+from app.core.cache import close_backends
+from app.core.uploads import UploadLimitMiddleware
 import nltk
 
 # Download NLTK data
@@ -10,7 +21,24 @@ try:
 except LookupError:
     nltk.download('punkt')
 
-app = FastAPI(title="VidyāMitra API", version="1.0.0")
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    await db.connect()
+    # Background workers
+    question_pool.start()
+    market_snapshot.start()
+    yield
+    await market_snapshot.stop()
+    await bulk_processor.stop()
+    pdf_pool.shutdown()
+    render_pool.shutdown()
+    auth_pool.shutdown()
+    await question_pool.stop()
+    await http.close()
+    await db.close()
+    await close_backends()
+
+app = FastAPI(title="VidyāMitra API", version="1.0.0", lifespan=lifespan)
 
 # CORS Configuration
 origins = [
@@ -20,6 +48,20 @@ origins = [
     "*"
 ]
 
+# Cap resume uploads while they stream in, before the multipart body is spooled
+app.add_middleware(
+    UploadLimitMiddleware,
+    paths=["/resume/parse"],
+    max_bytes=settings.PDF_MAX_UPLOAD_BYTES,
+    max_pages=settings.PDF_MAX_UPLOAD_PAGES,
+)
+app.add_middleware(
+    UploadLimitMiddleware,
+    paths=["/resume/bulk"],
+    max_bytes=settings.BULK_MAX_UPLOAD_BYTES,
+    max_pages=MAX_BULK_FILES * settings.PDF_MAX_UPLOAD_PAGES,
+)
+
 app.add_middleware(
     CORSMiddleware,
     allow_origins=origins,
@@ -45,16 +87,55 @@ def root():
 
 @app.get("/health/ai")
 async def health_ai():
-    import google.generativeai as genai
-    from app.core.config import settings
+    from app.core import llm
     api_key = settings.GEMINI_API_KEY or settings.GOOGLE_API_KEY
     if not api_key:
         return {"status": "error", "message": "No API key found"}
     
     try:
-        genai.configure(api_key=api_key)
-        model = genai.GenerativeModel('gemini-3-flash-preview')
-        response = model.generate_content("ping")
-        return {"status": "ok", "response": response.text}
+        response_text = await llm.generate("ping")
+        return {"status": "ok", "response": response_text}
     except Exception as e:
         return {"status": "error", "message": str(e)}
+
+@app.get("/health/llm")
+def health_llm():
+    from app.core import llm
+    return {**llm.stats(), "question_pool": question_pool.stats()}
+
+@app.get("/health/http")
+def health_http():
+    return http.stats()
+
+@app.get("/health/db")
+def health_db():
+    return db.stats()
+
+@app.get("/health/pools")
+def health_pools():
+    return {
+        "auth": auth_pool.stats(),
+        "pdf": pdf_pool.stats(),
+        "render": render_pool.stats(),
+        "resume_batches": bulk_processor.stats(),
+    }
+
+@app.get("/health/cache")
+def health_cache():
+    from app.services.job_service import job_cache
+    from app.routers.plan import video_cache
+    from app.services.market_data import rates_cache, news_cache
+    from app.services.resume_export import pdf_cache, pdf_renders
+    from app.services import user_service
+    from app.core import security
+    return {
+        "jobs": job_cache.stats(),
+        "youtube": video_cache.stats(),
+        "exchange_rates": rates_cache.stats(),
+        "news": news_cache.stats(),
+        "market_snapshot": market_snapshot.stats(),
+        "resume_pdf": {"entries": len(pdf_cache), "bytes": pdf_cache.bytes, "evictions": pdf_cache.evictions,
+                       **pdf_renders.stats()},
+        "users": user_service.stats(),
+        "tokens": security.stats(),
+    }
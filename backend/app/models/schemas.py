@@ -115,6 +115,14 @@ class UserProgressBase(BaseModel):
     completed_activities: int = 0
     average_quiz_score: int = 0
     overall_profile_score: int = 0
+    quizzes_taken: int = 0
+    quiz_score_total: int = 0
+    quiz_questions_total: int = 0
+    interviews_done: int = 0
+    interview_score_total: int = 0
+    evaluations_done: int = 0
+    last_match_score: Optional[int] = None
+    completed_modules: int = 0
 
 class UserProgressCreate(UserProgressBase):
     user_id: UUID
@@ -1,8 +1,11 @@
 from fastapi import APIRouter, HTTPException, Depends
 from pydantic import BaseModel, EmailStr
-from app.core.database import supabase
+from app.core.database import db
 from app.core.config import settings
-from passlib.context import CryptContext
+from app.core.executors import BoundedProcessPool, PoolSaturated
+from app.services.passwords import check_password, hash_password
+from app.services.user_service import find_user, forget_missing
+import asyncio
 import jwt
 from datetime import datetime, timedelta
 from typing import Optional
@@ -10,7 +13,15 @@ from typing import Optional
 router = APIRouter()
 
 # Password Hashing
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# bcrypt is slow on purpose. It gets its own small process pool so a burst of logins
+# queues there (and is shed with 503) instead of tying up the request threadpool.
+auth_pool = BoundedProcessPool(
+    "auth",
+    max_workers=settings.AUTH_WORKERS,
+    max_pending=settings.AUTH_MAX_PENDING,
+    timeout=settings.AUTH_TIMEOUT_SECONDS,
+)
+AUTH_RETRY_AFTER_SECONDS = 2
 
 # JWT Utils
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
@@ -23,13 +34,18 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     encoded_jwt = jwt.encode(to_encode, settings.JWT_SECRET, algorithm=settings.ALGORITHM)
     return encoded_jwt
 
-def verify_password(plain_password, hashed_password):
-    # Bcrypt has a 72-character limit. Truncate to avoid errors.
-    return pwd_context.verify(plain_password[:72], hashed_password)
+async def verify_password(plain_password: str, hashed_password: str) -> bool:
+    return await auth_pool.run(check_password, plain_password, hashed_password)
 
-def get_password_hash(password):
-    # Bcrypt has a 72-character limit. Truncate to avoid errors.
-    return pwd_context.hash(password[:72])
+async def get_password_hash(password: str) -> str:
+    return await auth_pool.run(hash_password, password)
+
+def _auth_busy() -> HTTPException:
+    return HTTPException(
+        status_code=503,
+        detail="Too many sign-ins right now, please retry in a moment.",
+        headers={"Retry-After": str(AUTH_RETRY_AFTER_SECONDS)},
+    )
 
 # Models
 class UserRegister(BaseModel):
@@ -71,69 +87,79 @@ def _auth_error_message(e: Exception) -> str:
 
 
 @router.post("/register", response_model=Token)
-def register(user: UserRegister):
+async def register(user: UserRegister):
     full_name = f"{user.first_name} {user.last_name}"
-    if not supabase:
+    if "@" in user.username:
+        # Login treats anything with '@' as an email
+        raise HTTPException(status_code=400, detail="Username cannot contain '@'.")
+    if not db.enabled:
          # Mock registration for dev without DB
          access_token = create_access_token(data={"sub": user.email, "id": "mock_id"})
          return {"access_token": access_token, "token_type": "bearer", "user_name": user.first_name}
 
+    # Shed before touching the database when the hashing queue is already full
+    if auth_pool.saturated:
+        raise _auth_busy()
+
     try:
-        # Check email or username (query each separately to avoid .or_() escaping issues with @ in email)
-        by_email = supabase.table("users").select("id").eq("email", user.email).execute()
-        by_username = supabase.table("users").select("id").eq("username", user.username).execute()
-        if (by_email.data and len(by_email.data) > 0) or (by_username.data and len(by_username.data) > 0):
+        # Check email and username together; recently seen misses are answered from memory
+        by_email, by_username = await asyncio.gather(
+            find_user(user.email, field="email"), find_user(user.username, field="username")
+        )
+        if by_email or by_username:
             raise HTTPException(status_code=400, detail="Email or username already registered.")
 
-        hashed_password = get_password_hash(user.password)
+        hashed_password = await get_password_hash(user.password)
         new_user_data = {
             "email": user.email,
             "username": user.username,
             "full_name": full_name,
             "password_hash": hashed_password,
         }
-        response = supabase.table("users").insert(new_user_data).execute()
+        response = await db.query("users", lambda t: t.insert(new_user_data))
         if not response.data:
             raise HTTPException(status_code=500, detail="Failed to create user.")
+        forget_missing(user.email, user.username)
         user_record = response.data[0]
         access_token = create_access_token(data={"sub": user_record["email"], "id": user_record["id"]})
         return {"access_token": access_token, "token_type": "bearer", "user_name": user.first_name}
     except HTTPException:
         raise
+    except (PoolSaturated, asyncio.TimeoutError):
+        raise _auth_busy()
     except Exception as e:
         raise HTTPException(status_code=500, detail=_auth_error_message(e))
 
 @router.post("/login", response_model=Token)
-def login(user: UserLogin):
+async def login(user: UserLogin):
     # Dummy login for testing
     if user.username_or_email == "aegulasandeep@gmail.com" and user.password == "237y1a66b0@0402":
         access_token = create_access_token(data={"sub": "aegulasandeep@gmail.com", "id": "dummy_id"})
         return {"access_token": access_token, "token_type": "bearer", "user_name": "Sandeep"}
 
-    if not supabase:
+    if not db.enabled:
         # Mock login for dev without DB
         if user.password == "password":
             return {"access_token": "mock_token", "token_type": "bearer", "user_name": "Sandeep"}
         raise HTTPException(status_code=400, detail="Incorrect username/email or password (Mock: use 'password')")
 
+    if auth_pool.saturated:
+        raise _auth_busy()
+
     try:
-        # Find by email or username (two queries to avoid .or_() escaping with @)
-        by_email = supabase.table("users").select("*").eq("email", user.username_or_email).execute()
-        by_username = supabase.table("users").select("*").eq("username", user.username_or_email).execute()
-        user_record = None
-        if by_email.data and len(by_email.data) > 0:
-            user_record = by_email.data[0]
-        elif by_username.data and len(by_username.data) > 0:
-            user_record = by_username.data[0]
+        # By email if the input has '@' (falling back to legacy '@' usernames), otherwise by username
+        user_record = await find_user(user.username_or_email)
         if not user_record:
             raise HTTPException(status_code=400, detail="Incorrect username/email or password.")
-        if not verify_password(user.password, user_record.get("password_hash") or ""):
+        if not await verify_password(user.password, user_record.get("password_hash") or ""):
             raise HTTPException(status_code=400, detail="Incorrect username/email or password.")
         access_token = create_access_token(data={"sub": user_record["email"], "id": user_record["id"]})
         name = (user_record.get("full_name") or "").split(" ")[0] or "User"
         return {"access_token": access_token, "token_type": "bearer", "user_name": name}
     except HTTPException:
         raise
+    except (PoolSaturated, asyncio.TimeoutError):
+        raise _auth_busy()
     except Exception as e:
         raise HTTPException(status_code=500, detail=_auth_error_message(e))
 
@@ -1,29 +1,59 @@
-from fastapi import APIRouter, HTTPException, Query
-from pydantic import BaseModel
-from typing import List, Optional
-from app.core.database import supabase
-import google.generativeai as genai
-from app.core.config import settings
-import json
-import re
-
-# Configure Gemini
-api_key = settings.GEMINI_API_KEY or settings.GOOGLE_API_KEY
-if api_key:
-    genai.configure(api_key=api_key)
-
-model = genai.GenerativeModel('gemini-3-flash-preview')
+from fastapi import APIRouter, HTTPException, Query, Depends
+from pydantic import BaseModel, Field
+from typing import Dict, List, Literal, Optional, Tuple
+from app.core.database import db
+from app.core import llm
+from app.core.json_stream import parse_llm_json
+from app.core.security import current_user_id
+from app.services.question_pool import question_pool
+from app.services import skill_matcher
+from app.services.progress_service import record_progress
+import asyncio
 
 router = APIRouter()
 
+# Below this local confidence, hybrid mode asks the LLM instead
+HYBRID_MIN_CONFIDENCE = 0.5
+# Batch evaluation limits
+MAX_BATCH_JOBS = 50
+JOBS_PER_PROMPT = 8
+MAX_JD_CHARS_IN_PROMPT = 2000
+# Local scoring cost grows with JD length, so descriptions longer than the
+# matcher reads (skill_matcher.MAX_JD_CHARS) are rejected (422)
+
 class EvaluationRequest(BaseModel):
     resume_skills: List[str]
-    job_description: str
+    job_description: str = Field(..., max_length=skill_matcher.MAX_JD_CHARS)
     job_role: Optional[str] = "General"
     personal_info: Optional[dict] = None
 
+class BatchJob(BaseModel):
+    job_role: Optional[str] = "General"
+    job_description: str = Field(..., max_length=skill_matcher.MAX_JD_CHARS)
+
+class BatchEvaluationRequest(BaseModel):
+    resume_skills: List[str]
+    jobs: List[BatchJob] = Field(..., min_length=1, max_length=MAX_BATCH_JOBS)
+
+def pad_missing_skills(missing_skills: List[str]) -> List[str]:
+    """Ensure exactly 4 missing skills."""
+    if len(missing_skills) > 4:
+        return missing_skills[:4]
+    # Pad with generic suggestions if needed
+    missing_skills = list(missing_skills)
+    generic_skills = ["Problem Solving", "Communication", "Time Management", "Teamwork"]
+    while len(missing_skills) < 4 and generic_skills:
+        skill = generic_skills.pop(0)
+        if skill not in missing_skills:
+            missing_skills.append(skill)
+    return missing_skills
+
 @router.post("/")
-def evaluate_skills(request: EvaluationRequest, user_id: Optional[str] = Query(None)):
+async def evaluate_skills(
+    request: EvaluationRequest,
+    user_id: Optional[str] = Depends(current_user_id),
+    mode: Literal["fast", "llm", "hybrid"] = Query("hybrid", description="fast: local engine only, llm: always Gemini, hybrid: Gemini only when local confidence is low")
+):
     if not request.resume_skills:
         # If no skills are detected, the score is naturally low, but we provide guidance
         return {
@@ -35,73 +65,56 @@ def evaluate_skills(request: EvaluationRequest, user_id: Optional[str] = Query(N
             "job_role": request.job_role
         }
 
-    prompt = f"""
-    You are a professional hiring manager. Evaluate the following resume skills against the target job role and description.
-    Target Job Role: {request.job_role}
-    Job Description: {request.job_description}
-    Resume Skills: {", ".join(request.resume_skills)}
+    # Local deterministic scoring first; the LLM is only consulted when asked or unsure
+    # TF-IDF scoring is CPU-bound, so it runs on a worker thread rather than the event loop
+    local = await asyncio.to_thread(skill_matcher.score_skills, request.resume_skills, request.job_description)
+    score = local["match_score"]
+    matched_skills = local["matched_skills"]
+    missing_skills = local["missing_skills"]
 
-    Tasks:
-    1. Calculate a match_score (0-100) based on how well the candidate's skills align with the role. Be fair but encouraging.
-    2. Identify matched_skills: list of skills from the resume that are directly or semantically relevant to the job.
-    3. Identify missing_skills: list of EXACTLY 4 critical skills/tools mentioned in the job description that are missing from the resume. 
-       Prioritize these by importance for the role. If fewer than 4 are missing, suggest related skills that would strengthen the profile.
+    if mode == "llm" or (mode == "hybrid" and local["confidence"] < HYBRID_MIN_CONFIDENCE):
+        prompt = f"""
+        You are a professional hiring manager. Evaluate the following resume skills against the target job role and description.
+        Target Job Role: {request.job_role}
+        Job Description: {request.job_description}
+        Resume Skills: {", ".join(request.resume_skills)}
 
-    Return ONLY a JSON object with this structure:
-    {{
-      "match_score": integer,
-      "matched_skills": [string],
-      "missing_skills": [exactly 4 strings, ordered by importance]
-    }}
-    
-    Return ONLY valid JSON.
-    """
+        Tasks:
+        1. Calculate a match_score (0-100) based on how well the candidate's skills align with the role. Be fair but encouraging.
+        2. Identify matched_skills: list of skills from the resume that are directly or semantically relevant to the job.
+        3. Identify missing_skills: list of EXACTLY 4 critical skills/tools mentioned in the job description that are missing from the resume. 
+           Prioritize these by importance for the role. If fewer than 4 are missing, suggest related skills that would strengthen the profile.
+
+        Return ONLY a JSON object with this structure:
+        {{
+          "match_score": integer,
+          "matched_skills": [string],
+          "missing_skills": [exactly 4 strings, ordered by importance]
+        }}
     
-    try:
-        response = model.generate_content(prompt)
-        content = response.text.strip()
+        Return ONLY valid JSON.
+        """
         
-        # Robust JSON extraction
-        start_idx = content.find('{')
-        end_idx = content.rfind('}')
-        if start_idx != -1 and end_idx != -1:
-            eval_results = json.loads(content[start_idx:end_idx+1])
-        else:
-            raise ValueError("No JSON found in LLM response")
-            
-        score = eval_results.get("match_score", 0)
-        matched_skills = eval_results.get("matched_skills", [])
-        missing_skills = eval_results.get("missing_skills", [])
-        
-        # Ensure exactly 4 missing skills
-        if len(missing_skills) > 4:
-            missing_skills = missing_skills[:4]
-        elif len(missing_skills) < 4:
-            # Pad with generic suggestions if needed
-            generic_skills = ["Problem Solving", "Communication", "Time Management", "Teamwork"]
-            while len(missing_skills) < 4 and generic_skills:
-                skill = generic_skills.pop(0)
-                if skill not in missing_skills:
-                    missing_skills.append(skill)
-        
-    except Exception as e:
-        print(f"Evaluation AI Error: {e}")
-        # Improved Fallback: fuzzy/substring matching
-        job_desc_lower = request.job_description.lower()
-        matched_skills = []
-        for skill in request.resume_skills:
-            if skill.lower() in job_desc_lower or any(word in job_desc_lower for word in skill.lower().split()):
-                matched_skills.append(skill)
-        
-        # Base score on matches, but at least 20 if they have skills
-        score = (len(matched_skills) / len(request.resume_skills)) * 100 if request.resume_skills else 0
-        score = max(score, 20) if request.resume_skills else 0
-        missing_skills = ["Communication", "Problem Solving", "Technical Documentation", "Collaboration"]
+        try:
+            content = await llm.generate(prompt, endpoint="evaluate")
+            eval_results = parse_llm_json(content)
+                
+            score = eval_results.get("match_score", 0)
+            matched_skills = eval_results.get("matched_skills", [])
+            missing_skills = eval_results.get("missing_skills", [])
+        except Exception as e:
+            print(f"Evaluation AI Error: {e}")
+            await llm.forget(prompt, endpoint="evaluate")
+            # Keep the local engine's result
 
+    missing_skills = pad_missing_skills(missing_skills)
     score = round(score, 2)
+
+    # Warm the quiz pool for the topics this user will most likely study next
+    question_pool.prewarm(missing_skills[:4])
     
     # Store in database if possible
-    if supabase and user_id:
+    if db.enabled and user_id:
         try:
             eval_data = {
                 "user_id": user_id,
@@ -110,7 +123,8 @@ def evaluate_skills(request: EvaluationRequest, user_id: Optional[str] = Query(N
                 "strengths": matched_skills,
                 "gaps": missing_skills
             }
-            supabase.table("skill_evaluations").insert(eval_data).execute()
+            await db.query("skill_evaluations", lambda t: t.insert(eval_data))
+            await record_progress(user_id, evaluations=1, match_score=eval_data["match_score"])
         except Exception as e:
             print(f"Error saving evaluation: {e}")
 
@@ -124,3 +138,115 @@ def evaluate_skills(request: EvaluationRequest, user_id: Optional[str] = Query(N
         "personal_info": request.personal_info,
         "job_role": request.job_role
     }
+
+def build_batch_prompt(resume_skills: List[str], jobs: List[Tuple[int, BatchJob]]) -> str:
+    postings = "\n\n".join(
+        f"[Job {index}] Role: {job.job_role}\nDescription: {job.job_description[:MAX_JD_CHARS_IN_PROMPT]}"
+        for index, job in jobs
+    )
+    return f"""
+    You are a professional hiring manager. Evaluate ONE candidate's resume skills against EACH of the job postings below.
+    Resume Skills: {", ".join(resume_skills)}
+
+    {postings}
+
+    For every job, calculate a match_score (0-100), the matched_skills from the resume that are relevant to that job,
+    and EXACTLY 4 missing_skills from that job description, ordered by importance.
+
+    Return ONLY a JSON object with this structure:
+    {{
+      "results": [
+        {{"index": job number from the [Job N] label, "match_score": integer, "matched_skills": [string], "missing_skills": [4 strings]}}
+      ]
+    }}
+
+    Return ONLY valid JSON.
+    """
+
+async def llm_score_jobs(resume_skills: List[str], jobs: List[Tuple[int, BatchJob]]) -> Dict[int, dict]:
+    """Score several postings with one packed prompt. Returns {job index: result} for what parsed."""
+    prompt = build_batch_prompt(resume_skills, jobs)
+    wanted = {index for index, _ in jobs}
+    try:
+        content = await llm.generate(prompt, endpoint="evaluate_batch")
+        results = {}
+        for item in parse_llm_json(content).get("results", []):
+            index = item.get("index")
+            if index in wanted:
+                results[index] = {
+                    "match_score": float(item.get("match_score") or 0),
+                    "matched_skills": item.get("matched_skills") or [],
+                    "missing_skills": item.get("missing_skills") or [],
+                }
+        return results
+    except Exception as e:
+        print(f"Batch Evaluation AI Error: {e}")
+        await llm.forget(prompt, endpoint="evaluate_batch")
+        return {}
+
+@router.post("/batch")
+async def evaluate_batch(
+    request: BatchEvaluationRequest,
+    user_id: Optional[str] = Depends(current_user_id),
+    mode: Literal["fast", "llm", "hybrid"] = Query("hybrid", description="Same meaning as for POST /evaluate, applied per job")
+):
+    """
+    Score one resume against many job descriptions and return them ranked by match.
+
+    Every job is scored locally in one vectorized pass. Jobs that need the LLM
+    (all of them in llm mode, low-confidence ones in hybrid mode) are packed
+    JOBS_PER_PROMPT to a prompt and those prompts run concurrently. All
+    evaluations are stored with a single bulk insert.
+    """
+    scored = await asyncio.to_thread(
+        skill_matcher.score_skills_batch, request.resume_skills, [job.job_description for job in request.jobs]
+    )
+
+    if mode != "fast" and request.resume_skills:
+        needs_llm = [
+            (index, job) for index, (job, local) in enumerate(zip(request.jobs, scored))
+            if mode == "llm" or local["confidence"] < HYBRID_MIN_CONFIDENCE
+        ]
+        chunks = [needs_llm[i:i + JOBS_PER_PROMPT] for i in range(0, len(needs_llm), JOBS_PER_PROMPT)]
+        for llm_results in await asyncio.gather(*(llm_score_jobs(request.resume_skills, chunk) for chunk in chunks)):
+            for index, result in llm_results.items():
+                scored[index] = result
+
+    results = []
+    for index, (job, result) in enumerate(zip(request.jobs, scored)):
+        score = round(result["match_score"], 2)
+        missing_skills = pad_missing_skills(result["missing_skills"])
+        results.append({
+            "index": index,
+            "job_role": job.job_role,
+            "score": score,
+            "match_score": score,
+            "matched_skills": result["matched_skills"],
+            "missing_skills": missing_skills,
+            "top_topics": missing_skills[:4],
+        })
+    results.sort(key=lambda r: r["match_score"], reverse=True)
+    for rank, result in enumerate(results, start=1):
+        result["rank"] = rank
+
+    # Store every evaluation in one round trip
+    if db.enabled and user_id:
+        try:
+            rows = [
+                {
+                    "user_id": user_id,
+                    "job_role": result["job_role"],
+                    "match_score": int(result["match_score"]),
+                    "strengths": result["matched_skills"],
+                    "gaps": result["missing_skills"]
+                }
+                for result in results
+            ]
+            await db.query("skill_evaluations", lambda t: t.insert(rows))
+            # The profile's "last match score" is the best match of the batch, not whichever job came last
+            best_match = max(row["match_score"] for row in rows)
+            await record_progress(user_id, evaluations=len(rows), match_score=best_match)
+        except Exception as e:
+            print(f"Error saving batch evaluations: {e}")
+
+    return {"count": len(results), "results": results}
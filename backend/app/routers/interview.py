@@ -1,32 +1,24 @@
-from fastapi import APIRouter, Query
+from fastapi import APIRouter, Depends
 from typing import Optional
-from app.core.database import supabase
+from app.core.database import db
+from app.core import llm
+from app.core.json_stream import StreamingJSONParser, parse_llm_json
+from app.core.sse import sse_event, sse_response
+from app.core.security import current_user_id
+from app.services.progress_service import record_progress
 from pydantic import BaseModel
-import google.generativeai as genai
-from app.core.config import settings
-import json
-import re
 
 router = APIRouter()
 
-# Configure Gemini
-api_key = settings.GEMINI_API_KEY or settings.GOOGLE_API_KEY
-if api_key:
-    genai.configure(api_key=api_key)
-
-# Using gemini-3-flash-preview as verified in list_models.py
-model = genai.GenerativeModel('gemini-3-flash-preview')
-
 class EvaluationRequest(BaseModel):
     role: str
     round: str
     transcript: list # List of {sender: str, text: str}
 
-@router.post("/evaluate")
-def evaluate_interview(request: EvaluationRequest, user_id: Optional[str] = Query(None)):
+def build_interview_prompt(request: EvaluationRequest) -> str:
     transcript_str = "\n".join([f"{m['sender'].upper()}: {m['text']}" for m in request.transcript])
     
-    prompt = f"""
+    return f"""
     You are an expert interviewer evaluating a candidate for a {request.role} role specifically for the {request.round} round.
     
     Review the following interview transcript:
@@ -39,7 +31,7 @@ def evaluate_interview(request: EvaluationRequest, user_id: Optional[str] = Quer
     4. Technical Accuracy (if applicable)
     5. Soft Skills Feedback (tone, confidence)
     
-    Return the response as a valid JSON object with the following keys:
+    Return the response as a valid JSON object with the following keys, in this order:
     - score: integer
     - feedback: string (brief 1-sentence summary)
     - suggestions: list of exactly 3 strings (actionable improvement points)
@@ -47,35 +39,32 @@ def evaluate_interview(request: EvaluationRequest, user_id: Optional[str] = Quer
     
     Return ONLY valid JSON. No markdown.
     """
+
+async def save_interview(request: EvaluationRequest, data: dict, user_id: Optional[str]):
+    if db.enabled and user_id:
+        try:
+            interview_data = {
+                "user_id": user_id,
+                "job_role": request.role,
+                "mode": request.round,
+                "score": data.get("score", 0),
+                "feedback": data.get("feedback", ""),
+                "metadata": data 
+            }
+            await db.query("interviews", lambda t: t.insert(interview_data))
+            await record_progress(user_id, interview_score=interview_data["score"])
+        except Exception as e:
+            print(f"Error saving interview results: {e}")
+
+@router.post("/evaluate")
+async def evaluate_interview(request: EvaluationRequest, user_id: Optional[str] = Depends(current_user_id)):
+    prompt = build_interview_prompt(request)
     
     try:
-        response = model.generate_content(prompt)
-        content = response.text.strip()
-        
-        # Robust JSON extraction
-        start_idx = content.find('{')
-        end_idx = content.rfind('}')
-        if start_idx != -1 and end_idx != -1:
-            data = json.loads(content[start_idx:end_idx+1])
-        else:
-            # Fallback cleaning
-            clean_content = re.sub(r'```json\n?|```', '', content)
-            data = json.loads(clean_content)
+        content = await llm.generate(prompt, endpoint="interview")
+        data = parse_llm_json(content)
 
-        if supabase and user_id:
-            try:
-                interview_data = {
-                    "user_id": user_id,
-                    "job_role": request.role,
-                    "mode": request.round,
-                    "score": data.get("score", 0),
-                    "feedback": data.get("feedback", ""),
-                    "metadata": data 
-                }
-                supabase.table("interviews").insert(interview_data).execute()
-            except Exception as e:
-                print(f"Error saving interview results: {e}")
-                
+        await save_interview(request, data, user_id)
         return data
     except Exception as e:
         print(f"Interview Evaluation AI Error: {e}")
@@ -89,3 +78,39 @@ def evaluate_interview(request: EvaluationRequest, user_id: Optional[str] = Quer
             ],
             "detailed_analysis": f"AI evaluation encountered an error, but based on your transcript, you showed good engagement. Error details: {str(e)}"
         }
+
+@router.post("/evaluate/stream")
+async def evaluate_interview_stream(request: EvaluationRequest, user_id: Optional[str] = Depends(current_user_id)):
+    """
+    Server-Sent Events version of POST /interview/evaluate.
+
+    Events: "start" immediately, then "score", "feedback" and "suggestions" as
+    each field closes, "analysis" text deltas while detailed_analysis streams,
+    and finally "done" with the full evaluation (or "error").
+    """
+    prompt = build_interview_prompt(request)
+
+    async def events():
+        yield sse_event("start", {"role": request.role, "round": request.round})
+
+        parser = StreamingJSONParser()
+        try:
+            async for chunk in llm.stream(prompt, endpoint="interview"):
+                for kind, field, value in parser.feed(chunk):
+                    if kind == "delta" and field == "detailed_analysis":
+                        yield sse_event("analysis", {"text": value})
+                    elif kind == "field" and field in ("score", "feedback", "suggestions"):
+                        yield sse_event(field, {field: value})
+            # Keep what completed if the stream was cut off, as long as the score made it
+            data = parser.close()
+            if "score" not in data:
+                raise ValueError("No evaluation found in LLM response")
+        except Exception as e:
+            print(f"Interview Evaluation Stream Error: {e}")
+            yield sse_event("error", {"message": str(e)})
+            return
+
+        await save_interview(request, data, user_id)
+        yield sse_event("done", data)
+
+    return sse_response(events())
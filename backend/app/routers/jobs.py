@@ -1,13 +1,14 @@
 from fastapi import APIRouter, Query
 from typing import Optional
-import requests
 from app.core.config import settings
+from app.core import http
 from app.services.job_service import search_jobs, format_job_data, get_sample_jobs
+from app.services.market_data import fetch_conversion_rates
 
 router = APIRouter()
 
 @router.get("/search")
-def search_job_listings(
+async def search_job_listings(
     query: str = Query(..., description="Job title or keywords (e.g., 'Python Developer')"),
     location: str = Query("India", description="Location (e.g., 'Bangalore', 'Remote')"),
     employment_type: Optional[str] = Query(None, description="FULLTIME, PARTTIME, CONTRACTOR, INTERN"),
@@ -17,9 +18,9 @@ def search_job_listings(
     """
     Search for real-time job listings from LinkedIn, Indeed, Glassdoor, etc.
     Uses JSearch API (RapidAPI) to aggregate jobs from multiple platforms.
-    Results are cached for 1 hour to reduce API calls.
+    Results are cached for 1 hour and served stale for up to 6 more while they refresh.
     """
-    api_response = search_jobs(
+    api_response = await search_jobs(
         query=query,
         location=location,
         employment_type=employment_type,
@@ -51,13 +52,13 @@ def search_job_listings(
     }
 
 @router.get("/news")
-def get_market_news(query: str = "technology"):
+async def get_market_news(query: str = "technology"):
     if not settings.NEWS_API_KEY:
         return {"error": "News API not configured"}
         
-    url = f"https://newsapi.org/v2/everything?q={query}&apiKey={settings.NEWS_API_KEY}"
+    url = "https://newsapi.org/v2/everything"
     try:
-        resp = requests.get(url)
+        resp = await http.get("newsapi", url, params={"q": query, "apiKey": settings.NEWS_API_KEY})
         return resp.json().get("articles", [])[:5]
     except Exception:
         return []
@@ -72,16 +73,14 @@ def get_job_listings(role: str):
     ]
 
 @router.get("/exchange-rates")
-def get_exchange_rates(base_currency: str = "USD"):
+async def get_exchange_rates(base_currency: str = "USD"):
     if not settings.EXCHANGE_API_KEY:
         return {"error": "Exchange API not configured"}
         
-    url = f"https://v6.exchangerate-api.com/v6/{settings.EXCHANGE_API_KEY}/latest/{base_currency}"
     try:
-        resp = requests.get(url)
-        data = resp.json()
-        if data.get("result") == "success":
-             return data.get("conversion_rates", {})
+        rates = await fetch_conversion_rates(base_currency)
+        if rates is not None:
+             return rates
         return {"error": "Failed to fetch rates"}
     except Exception:
         return {"error": "Service unavailable"}
@@ -1,11 +1,17 @@
 from fastapi import APIRouter
 from pydantic import BaseModel
-import requests
 from app.core.config import settings
 from typing import List, Optional
-from fastapi import APIRouter, Query
-from app.core.database import supabase
+from fastapi import APIRouter, Depends
+from app.core.database import db
+from app.core import llm, http
+from app.core.cache import ResponseCache, cache_backend
+from app.core.json_stream import StreamingJSONParser, parse_llm_json
+from app.core.sse import sse_event, sse_response
+from app.core.security import current_user_id
+from app.services.progress_service import record_progress
 from datetime import datetime
+import asyncio
 
 
 router = APIRouter()
@@ -15,16 +21,13 @@ class PlanRequest(BaseModel):
     skills_found: List[str]
     missing_skills: List[str]
 
-import google.generativeai as genai
-import json
 
-# Configure Gemini
-api_key = settings.GEMINI_API_KEY or settings.GOOGLE_API_KEY
-if api_key:
-    genai.configure(api_key=api_key)
-model = genai.GenerativeModel('gemini-3-flash-preview')
+# Search results barely change day to day, and every API search costs 100 quota units
+video_cache = ResponseCache(
+    "youtube", settings.YOUTUBE_CACHE_TTL_DAYS * 24 * 3600, 2000, cache_backend(settings.YOUTUBE_CACHE_DB_PATH)
+)
 
-def search_youtube_videos(query: str, max_results: int = 1):
+async def search_youtube_videos(query: str, max_results: int = 1):
     if not settings.YOUTUBE_API_KEY:
         print("Warning: YouTube API Key missing. Returning search results link.")
         return [{
@@ -43,8 +46,13 @@ def search_youtube_videos(query: str, max_results: int = 1):
         "type": "video"
     }
 
+    cache_key = f"{' '.join(query.lower().split())}|{max_results}"
+    cached = await video_cache.get(cache_key)
+    if cached is not None:
+        return cached
+
     try:
-        response = requests.get(url, params=params)
+        response = await http.get("youtube", url, params=params)
         response.raise_for_status()
         data = response.json()
 
@@ -56,12 +64,14 @@ def search_youtube_videos(query: str, max_results: int = 1):
                 "thumbnail": item["snippet"]["thumbnails"]["medium"]["url"],
                 "channel": item["snippet"]["channelTitle"]
             })
+        if videos:
+            await video_cache.set(cache_key, videos)
         return videos
     except Exception as e:
         print(f"YouTube API Error: {e}")
         return []
 
-def search_pexels_images(query: str, max_results: int = 1):
+async def search_pexels_images(query: str, max_results: int = 1):
     if not settings.PEXELS_API_KEY:
         return []
         
@@ -70,7 +80,7 @@ def search_pexels_images(query: str, max_results: int = 1):
     params = {"query": query, "per_page": max_results}
     
     try:
-        response = requests.get(url, headers=headers, params=params)
+        response = await http.get("pexels", url, headers=headers, params=params)
         response.raise_for_status()
         data = response.json()
         return [photo["src"]["medium"] for photo in data.get("photos", [])]
@@ -78,8 +88,7 @@ def search_pexels_images(query: str, max_results: int = 1):
         print(f"Pexels API Error: {e}")
         return []
 
-@router.post("/")
-def generate_plan(request: PlanRequest, user_id: Optional[str] = Query(None)):
+def build_plan_prompt(request: PlanRequest) -> str:
     # Use missing_skills as the top 4 topics for the learning plan
     top_topics = request.missing_skills[:4] if len(request.missing_skills) >= 4 else request.missing_skills
     
@@ -87,7 +96,7 @@ def generate_plan(request: PlanRequest, user_id: Optional[str] = Query(None)):
     while len(top_topics) < 4:
         top_topics.append(f"{request.role} Fundamentals")
     
-    prompt = f"""
+    return f"""
     You are a career coach. A user wants to become a {request.role}.
     They already know: {', '.join(request.skills_found)}.
     They need to learn these 4 topics (in priority order): {', '.join(top_topics)}.
@@ -107,37 +116,40 @@ def generate_plan(request: PlanRequest, user_id: Optional[str] = Query(None)):
     Do not include markdown tags.
     """
 
+async def save_plan(raw_plan: dict, user_id: Optional[str]):
+    if db.enabled and user_id:
+        try:
+            await db.query("learning_plans", lambda t: t.insert({
+                "user_id": user_id,
+                "plan_data": raw_plan,
+                "status": "in-progress"
+            }))
+        except Exception as db_e:
+            print(f"DB Error saving plan: {db_e}")
+
+@router.post("/")
+async def generate_plan(request: PlanRequest, user_id: Optional[str] = Depends(current_user_id)):
+    prompt = build_plan_prompt(request)
+
     try:
-        response = model.generate_content(prompt)
-        content = response.text.strip()
-        
-        # Robust JSON extraction
-        start_idx = content.find('{')
-        end_idx = content.rfind('}')
-        if start_idx != -1 and end_idx != -1:
-            raw_plan = json.loads(content[start_idx:end_idx+1])
-        else:
-            raise ValueError("No JSON found in LLM response")
-
-        # Enrich with YouTube links (2-3 videos per topic)
-        for week in raw_plan.get("weeks", []):
-            query = week.get("search_query", week.get("focus", ""))
-            week["videos"] = search_youtube_videos(query, max_results=2)
-            week["completed"] = False  # Initialize completion status
+        content = await llm.generate(prompt, endpoint="plan")
+        raw_plan = parse_llm_json(content)
 
-        if supabase and user_id:
-            try:
-                supabase.table("learning_plans").insert({
-                    "user_id": user_id,
-                    "plan_data": raw_plan,
-                    "status": "in-progress"
-                }).execute()
-            except Exception as db_e:
-                print(f"DB Error saving plan: {db_e}")
+        # Enrich with YouTube links (2-3 videos per topic), all weeks concurrently
+        weeks = raw_plan.get("weeks", [])
+        video_lists = await asyncio.gather(*(
+            search_youtube_videos(week.get("search_query", week.get("focus", "")), max_results=2)
+            for week in weeks
+        ))
+        for week, videos in zip(weeks, video_lists):
+            week["videos"] = videos
+            week["completed"] = False  # Initialize completion status
 
+        await save_plan(raw_plan, user_id)
         return raw_plan
     except Exception as e:
         print(f"Plan Generation Error: {e}")
+        await llm.forget(prompt, endpoint="plan")
         # Final fallback template if AI fails
         return {
             "weeks": [
@@ -147,22 +159,88 @@ def generate_plan(request: PlanRequest, user_id: Optional[str] = Query(None)):
                     "description": "Mastering the core concepts.",
                     "tasks": ["Study basics", "Complete exercises"],
                     "outcomes": ["Understand core principles"],
-                    "videos": search_youtube_videos(request.role + " fundamentals")
+                    "videos": await search_youtube_videos(request.role + " fundamentals")
                 }
             ]
         }
 
+@router.post("/stream")
+async def generate_plan_stream(request: PlanRequest, user_id: Optional[str] = Depends(current_user_id)):
+    """
+    Server-Sent Events version of POST /plan.
+
+    Events: "start" immediately, "week" as each week object closes in the LLM
+    stream, "videos" as each week's YouTube lookup finishes, then "done" with
+    the full plan (or "error").
+    """
+    prompt = build_plan_prompt(request)
+
+    async def events():
+        yield sse_event("start", {"role": request.role})
+
+        queue = asyncio.Queue()
+        weeks = []
+
+        async def attach_videos(week: dict):
+            query = week.get("search_query", week.get("focus", ""))
+            week["videos"] = await search_youtube_videos(query, max_results=2)
+            await queue.put(("videos", {"week": week.get("week"), "videos": week["videos"]}))
+
+        async def produce():
+            lookups = []
+            try:
+                parser = StreamingJSONParser()
+                async for chunk in llm.stream(prompt, endpoint="plan"):
+                    for kind, field, value in parser.feed(chunk):
+                        if kind == "item" and field == "weeks" and isinstance(value, dict):
+                            value["completed"] = False  # Initialize completion status
+                            weeks.append(value)
+                            await queue.put(("week", value))
+                            lookups.append(asyncio.create_task(attach_videos(value)))
+                if not weeks:
+                    raise ValueError("No weeks found in LLM response")
+                await asyncio.gather(*lookups)
+            except Exception as e:
+                print(f"Plan Stream Error: {e}")
+                await llm.forget(prompt, endpoint="plan")
+                await queue.put(("error", {"message": str(e)}))
+            finally:
+                for task in lookups:
+                    task.cancel()
+            await queue.put(None)
+
+        producer = asyncio.create_task(produce())
+        failed = False
+        try:
+            while True:
+                item = await queue.get()
+                if item is None:
+                    break
+                failed = failed or item[0] == "error"
+                yield sse_event(*item)
+
+            if not failed:
+                raw_plan = {"weeks": weeks}
+                await save_plan(raw_plan, user_id)
+                yield sse_event("done", raw_plan)
+        finally:
+            producer.cancel()
+
+    return sse_response(events())
+
 @router.post("/complete-week")
-def complete_week(week_number: int, topic: str, user_id: Optional[str] = Query(None)):
+async def complete_week(week_number: int, topic: str, user_id: Optional[str] = Depends(current_user_id)):
     """Mark a specific week as completed and indicate quiz readiness"""
     
     # For now, return success without database dependency
     # In production, this would update the learning_plans table
     
-    if supabase and user_id:
+    if db.enabled and user_id:
         try:
             # Fetch current plan
-            res = supabase.table("learning_plans").select("*").eq("user_id", user_id).order("created_at", desc=True).limit(1).execute()
+            res = await db.query(
+                "learning_plans", lambda t: t.select("*").eq("user_id", user_id).order("created_at", desc=True).limit(1)
+            )
             if res.data:
                 plan = res.data[0]
                 weeks = plan["plan_data"].get("weeks", [])
@@ -174,10 +252,13 @@ def complete_week(week_number: int, topic: str, user_id: Optional[str] = Query(N
                         week["completed_at"] = str(datetime.now())
                         
                 # Update back to DB
-                supabase.table("learning_plans").update({"plan_data": plan["plan_data"]}).eq("id", plan["id"]).execute()
+                await db.query(
+                    "learning_plans", lambda t: t.update({"plan_data": plan["plan_data"]}).eq("id", plan["id"])
+                )
                 
                 # Count completed weeks
                 completed_count = sum(1 for w in weeks if w.get("completed"))
+                await record_progress(user_id, completed_modules=completed_count)
                 
                 return {
                     "success": True,
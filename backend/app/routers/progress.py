@@ -1,81 +1,146 @@
-from fastapi import APIRouter
-from app.core.database import supabase
-from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, Query
+from app.core.database import db
+from app.core.security import authorized_user_id
+from app.models.schemas import UserProgressBase
+from app.services.market_data import market_snapshot
+from app.services.progress_service import get_progress
+from datetime import datetime
+from typing import Dict, Optional, Tuple
+import asyncio
+import base64
+import uuid
 
 router = APIRouter()
 
-import requests
-from app.core.config import settings
+# History entries embedded in the dashboard payload; older ones are paged via the history endpoints
+DASHBOARD_HISTORY_LIMIT = 10
+MAX_PAGE_SIZE = 100
+
+# Per history table: (columns a client may request, summary columns returned by default)
+HISTORY_COLUMNS: Dict[str, Tuple[set, str]] = {
+    "quizzes": (
+        {"id", "user_id", "domain", "difficulty", "score", "total_questions", "created_at"},
+        "id,domain,difficulty,score,total_questions,created_at",
+    ),
+    "interviews": (
+        {"id", "user_id", "job_role", "mode", "score", "feedback", "metadata", "created_at"},
+        "id,job_role,mode,score,created_at",
+    ),
+}
+
+def select_columns(table: str, fields: Optional[str]) -> str:
+    """Validated column list for a history query; defaults to the table's summary columns."""
+    allowed, summary = HISTORY_COLUMNS[table]
+    if not fields:
+        return summary
+    requested = [f.strip() for f in fields.split(",") if f.strip()]
+    unknown = [f for f in requested if f not in allowed]
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown field(s) for {table}: {', '.join(unknown)}")
+    # The cursor is built from these, so they are always selected
+    for column in ("created_at", "id"):
+        if column not in requested:
+            requested.append(column)
+    return ",".join(requested)
+
+def parse_cursor(cursor: str) -> Tuple[str, str]:
+    """
+    (created_at, id) from a next_cursor, re-serialized from parsed values so
+    nothing from the client reaches the filter string verbatim.
+    """
+    try:
+        created_at, row_id = base64.urlsafe_b64decode(cursor.encode()).decode().split("|")
+        return datetime.fromisoformat(created_at).isoformat(), str(uuid.UUID(row_id))
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+async def fetch_history(table: str, user_id: str, limit: int, before: Optional[str] = None, fields: Optional[str] = None) -> dict:
+    """
+    One page of a user's history, newest first.
+
+    Keyset pagination on (created_at, id): `before` is the next_cursor of the
+    previous page, so every page is an index range scan however deep it is.
+    """
+    columns = select_columns(table, fields)
+    if before:
+        created_at, row_id = parse_cursor(before)
+
+    def build(t):
+        query = t.select(columns).eq("user_id", user_id)
+        if before:
+            query = query.or_(f'created_at.lt."{created_at}",and(created_at.eq."{created_at}",id.lt.{row_id})')
+        # One extra row tells us whether there is a next page
+        return query.order("created_at", desc=True).order("id", desc=True).limit(limit + 1)
+
+    res = await db.query(table, build)
+    items = res.data[:limit]
+    next_cursor = None
+    if len(res.data) > limit:
+        last = items[-1]
+        next_cursor = base64.urlsafe_b64encode(f"{last['created_at']}|{last['id']}".encode()).decode()
+    return {"items": items, "next_cursor": next_cursor}
 
 @router.get("/{user_id}")
-def get_user_progress(user_id: str):
-    if not supabase:
+async def get_user_progress(user_id: str = Depends(authorized_user_id)):
+    if not db.enabled:
         return {"error": "Database not connected"}
 
     try:
-        # 1. Fetch Basic Stats
-        plans = supabase.table("learning_plans").select("*").eq("user_id", user_id).execute()
-        quizzes = supabase.table("quizzes").select("*").eq("user_id", user_id).execute()
-        interviews = supabase.table("interviews").select("*").eq("user_id", user_id).execute()
-        user_res = supabase.table("users").select("badges").eq("id", user_id).execute()
-        
-        # Calculate Aggregates
-        completed_modules = 0
-        if plans.data:
-            for week in plans.data[0]["plan_data"].get("weeks", []):
-                if week.get("completed"):
-                    completed_modules += 1
-        
+        # 1. Stats from the aggregate row; history and badges are independent, so fetch them concurrently
+        progress, quizzes, interviews, user_res = await asyncio.gather(
+            get_progress(user_id),
+            fetch_history("quizzes", user_id, DASHBOARD_HISTORY_LIMIT),
+            fetch_history("interviews", user_id, DASHBOARD_HISTORY_LIMIT),
+            db.query("users", lambda t: t.select("badges").eq("id", user_id)),
+        )
+        progress = UserProgressBase(**(progress or {}))
+
         avg_quiz_score = 0
-        if quizzes.data:
-            avg_quiz_score = sum([q["score"] for q in quizzes.data]) / len(quizzes.data)
+        if progress.quizzes_taken:
+            avg_quiz_score = progress.quiz_score_total / progress.quizzes_taken
             
         badges = user_res.data[0].get("badges") if user_res.data else []
 
-        # 2. Fetch Market Insights (News API)
-        news_data = []
-        if settings.NEWS_API_KEY:
-            try:
-                news_url = f"https://newsapi.org/v2/top-headlines?category=technology&language=en&apiKey={settings.NEWS_API_KEY}"
-                n_res = requests.get(news_url)
-                if n_res.status_code == 200:
-                    news_data = n_res.json().get("articles", [])[:3]
-            except Exception as e:
-                print(f"News API error: {e}")
-
-        # 3. Fetch Exchange Insights (Market value trend proxy)
-        market_trend = {}
-        if settings.EXCHANGE_API_KEY:
-            try:
-                # Using USD to INR as a sample market trend
-                ex_url = f"https://v6.exchangerate-api.com/v6/{settings.EXCHANGE_API_KEY}/latest/USD"
-                e_res = requests.get(ex_url)
-                if e_res.status_code == 200:
-                    market_trend = {
-                        "base": "USD",
-                        "rates": {
-                            "INR": e_res.json().get("conversion_rates", {}).get("INR")
-                        }
-                    }
-            except Exception as e:
-                print(f"Exchange API error: {e}")
+        # 2. Market insights come from the background snapshot, no external calls here
+        insights = market_snapshot.read()
 
         return {
             "user_id": user_id,
             "stats": {
-                "completed_modules": completed_modules,
+                "completed_modules": progress.completed_modules,
                 "average_quiz_score": round(avg_quiz_score, 1),
-                "quizzes_taken": len(quizzes.data),
-                "interviews_done": len(interviews.data),
+                "quizzes_taken": progress.quizzes_taken,
+                "interviews_done": progress.interviews_done,
+                "completed_activities": progress.completed_activities,
+                "overall_profile_score": progress.overall_profile_score,
                 "badges": badges
             },
-            "quiz_history": quizzes.data,
-            "interview_history": interviews.data,
-            "insights": {
-                "news": news_data,
-                "market": market_trend
-            }
+            "quiz_history": quizzes["items"],
+            "interview_history": interviews["items"],
+            "insights": insights
         }
     except Exception as e:
         print(f"Progress computation error: {e}")
         return {"error": str(e)}
+
+@router.get("/{user_id}/quizzes")
+async def get_quiz_history(
+    user_id: str = Depends(authorized_user_id),
+    limit: int = Query(20, ge=1, le=MAX_PAGE_SIZE),
+    before: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    fields: Optional[str] = Query(None, description="Comma-separated columns; defaults to a summary")
+):
+    if not db.enabled:
+        return {"error": "Database not connected"}
+    return await fetch_history("quizzes", user_id, limit, before, fields)
+
+@router.get("/{user_id}/interviews")
+async def get_interview_history(
+    user_id: str = Depends(authorized_user_id),
+    limit: int = Query(20, ge=1, le=MAX_PAGE_SIZE),
+    before: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    fields: Optional[str] = Query(None, description="Comma-separated columns, e.g. feedback,metadata; defaults to a summary")
+):
+    if not db.enabled:
+        return {"error": "Database not connected"}
+    return await fetch_history("interviews", user_id, limit, before, fields)
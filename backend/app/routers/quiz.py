@@ -1,71 +1,66 @@
-from fastapi import APIRouter, HTTPException
-from pydantic import BaseModel
-from app.core.database import supabase
+from fastapi import APIRouter, HTTPException, Depends
+from pydantic import BaseModel, Field
+from typing import Optional
+from app.core.database import db
 from app.models.schemas import QuizCreate
-import google.generativeai as genai
-from app.core.config import settings
-import json
-import re
+from app.core import llm
+from app.core.json_stream import parse_llm_json
+from app.core.security import current_claims, current_user_id
+from app.services.question_pool import question_pool, build_quiz_prompt, clean_questions, normalize_key
+from app.services.progress_service import record_progress
 
 router = APIRouter()
 
-# Reuse configuration if possible, or re-configure safely
-api_key = settings.GEMINI_API_KEY or settings.GOOGLE_API_KEY
-if api_key:
-    genai.configure(api_key=api_key)
-model = genai.GenerativeModel('gemini-3-flash-preview')
+MAX_QUIZ_QUESTIONS = 20
 
 class QuizRequest(BaseModel):
     topic: str
     difficulty: str = "Medium"
-    count: int = 5
+    count: int = Field(5, ge=1, le=MAX_QUIZ_QUESTIONS)
 
 @router.post("/")
-def generate_quiz(request: QuizRequest):
-    prompt = f"""
-    Generate {request.count} {request.difficulty} multiple-choice questions about {request.topic}.
-    Each question must be challenging and relevant.
-    Return a valid JSON object with a key "questions" containing an array of objects.
-    Each object must have:
-    - id: (unique number)
-    - question: (string)
-    - options: (list of 4 strings)
-    - correct: (the exact correct option string)
-    - explanation: (brief reason why it is correct)
-    
-    Return ONLY valid JSON. Do not include markdown naming like ```json.
-    """
-    
+async def generate_quiz(request: QuizRequest, user_id: Optional[str] = Depends(current_user_id)):
+    # Serve from the pre-generated pool when it has enough unseen questions
+    pooled = await question_pool.draw(request.topic, request.difficulty, request.count, user_id)
+    if pooled is not None:
+        return {"questions": pooled}
+
+    # The pool could not cover the request, so generate live. This call is not cached: the same
+    # prompt would otherwise hand back the same set to everyone who has used up the pool.
+    seen = question_pool.seen_questions(request.topic, request.difficulty, user_id)
+    prompt = build_quiz_prompt(request.topic, request.difficulty, request.count, avoid=seen)
+
     try:
-        response = model.generate_content(prompt)
-        content = response.text.strip()
-        
-        # Robust JSON extraction
-        start_idx = content.find('{')
-        end_idx = content.rfind('}')
-        if start_idx != -1 and end_idx != -1:
-            json_str = content[start_idx:end_idx+1]
-            data = json.loads(json_str)
-            return data
-        
-        content = re.sub(r"```json", "", content)
-        content = re.sub(r"```", "", content)
-        return json.loads(content)
+        content = await llm.generate(prompt, endpoint="quiz")
+        data = parse_llm_json(content)
+
+        # Bank the freshly generated questions so the next request can be served from the pool
+        try:
+            stored = await question_pool.add(
+                normalize_key(request.topic, request.difficulty), clean_questions(data.get("questions", []))
+            )
+            if user_id and stored:
+                await question_pool.record_seen(user_id, [q["id"] for q in stored])
+        except Exception as pool_e:
+            print(f"Question pool store error: {pool_e}")
+        return data
     except Exception as e:
         print(f"Quiz Generation Error: {e}")
         return {"error": str(e)}
 
 @router.post("/submit")
-def submit_quiz(quiz_result: QuizCreate):
-    if not supabase:
+async def submit_quiz(quiz_result: QuizCreate, claims: Optional[dict] = Depends(current_claims)):
+    if not db.enabled:
          raise HTTPException(status_code=503, detail="Database unavailable")
 
     try:
         # data = quiz_result.model_dump() # Pydantic v2
         data = quiz_result.dict()
-        data['user_id'] = str(data['user_id'])
+        # A signed-in user can only record quizzes for themselves
+        data['user_id'] = claims["id"] if claims else str(data['user_id'])
         
-        response = supabase.table("quizzes").insert(data).execute()
+        response = await db.query("quizzes", lambda t: t.insert(data))
+        await record_progress(data['user_id'], quiz_score=data['score'], quiz_questions=data['total_questions'])
         return response.data
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
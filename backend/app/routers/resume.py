@@ -1,26 +1,67 @@
-from fastapi import APIRouter, UploadFile, File, HTTPException, Query
-from fastapi.responses import Response
-from app.services.resume_parser import extract_text_from_pdf, parse_resume_with_llm
-from app.services.pdf_generator import generate_resume_pdf
-from app.core.database import supabase
-from typing import Optional
+from fastapi import APIRouter, UploadFile, File, HTTPException, Query, Request, Depends
+from fastapi.responses import Response, StreamingResponse
+from pydantic import BaseModel
+from app.services.resume_parser import (
+    RESUME_PARSER_VERSION, cached_extraction_info, content_hash, extract_text, find_parsed_resume,
+    parse_resume_with_llm, remember_parsed_resume
+)
+from app.services.bulk_resume import BulkUploadError, BulkUploadTooLarge, bulk_processor, collect_pdfs
+from app.services.pdf_generator import DEFAULT_TEMPLATE, TEMPLATES, get_template, resume_digest
+from app.services.resume_export import MAX_BATCH_RESUMES, render_pool, render_resume, stream_resume_zip
+from app.core.config import settings
+from app.core.database import db
+from app.core.executors import PoolSaturated
+from app.core.security import current_user_id
+from typing import List, Optional
+import asyncio
 
 router = APIRouter()
 
+class BatchGenerateRequest(BaseModel):
+    resumes: List[dict]
+    template: str = DEFAULT_TEMPLATE
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    # Weak comparison: W/"x" matches "x"
+    return any(tag.strip().removeprefix("W/") == etag for tag in if_none_match.split(","))
+
 @router.post("/parse")
-async def parse_resume(file: UploadFile = File(...), user_id: Optional[str] = Query(None)):
+async def parse_resume(response: Response, file: UploadFile = File(...), user_id: Optional[str] = Depends(current_user_id)):
     if file.content_type != "application/pdf":
         raise HTTPException(status_code=400, detail="Only PDF files are supported")
     
     contents = await file.read()
-    text = extract_text_from_pdf(contents)
-    
-    if not text:
-         raise HTTPException(status_code=400, detail="Could not extract text from PDF")
-         
-    parsed_data = parse_resume_with_llm(text)
+    digest = content_hash(contents)
+
+    # Re-uploads of the same file reuse the earlier parse
+    parsed_data = await find_parsed_resume(digest)
+    response.headers["X-Resume-Cache"] = "hit" if parsed_data is not None else "miss"
+
+    if parsed_data is None:
+        try:
+            extraction = await extract_text(contents, digest)
+        except PoolSaturated:
+            raise HTTPException(status_code=503, detail="Resume parser is busy, please retry shortly", headers={"Retry-After": "5"})
+        except asyncio.TimeoutError:
+            raise HTTPException(status_code=400, detail="PDF took too long to process")
+
+        # Catches page counts the upload guard could not see (compressed object streams)
+        if extraction["total_pages"] > settings.PDF_MAX_UPLOAD_PAGES:
+            raise HTTPException(status_code=413, detail=f"PDF has more than {settings.PDF_MAX_UPLOAD_PAGES} pages")
+        if not extraction["text"]:
+             raise HTTPException(status_code=400, detail="Could not extract text from PDF")
+
+        parsed_data = await parse_resume_with_llm(extraction["text"])
+        await remember_parsed_resume(digest, parsed_data)
+        extraction_info = {k: v for k, v in extraction.items() if k != "text"}
+    else:
+        extraction_info = await cached_extraction_info(digest)
     
-    if supabase and user_id:
+    if db.enabled and user_id:
         try:
             resume_data = {
                 "user_id": user_id,
@@ -28,20 +69,100 @@ async def parse_resume(file: UploadFile = File(...), user_id: Optional[str] = Qu
                 "parsed_content": parsed_data,
                 "score": 0 
             }
-            supabase.table("resumes").insert(resume_data).execute()
+            if "error" in parsed_data:
+                await db.query("resumes", lambda t: t.insert(resume_data))
+            else:
+                # One row per user and file: a re-upload leaves the existing row alone
+                resume_data["content_hash"] = digest
+                resume_data["parser_version"] = RESUME_PARSER_VERSION
+                await db.query("resumes", lambda t: t.upsert(
+                    resume_data, on_conflict="user_id,content_hash,parser_version", ignore_duplicates=True
+                ))
         except Exception as e:
             print(f"Error saving resume: {e}")
     
-    return parsed_data
+    # Stored parsed_content stays as the LLM returned it; extraction details are response-only
+    return {**parsed_data, "extraction": extraction_info}
+
+@router.post("/bulk", status_code=202)
+async def parse_resumes_bulk(files: List[UploadFile] = File(...), user_id: Optional[str] = Depends(current_user_id)):
+    """
+    Queue many resumes at once: PDFs and/or zip archives of PDFs.
+    Returns a batch id straight away; poll /resume/bulk/{batch_id} for progress.
+    """
+    # Indexed from the spooled uploads; nothing is decompressed or held in memory here
+    uploads = [(f.filename or "resume.pdf", f.file) for f in files]
+    try:
+        upload = await asyncio.to_thread(collect_pdfs, uploads)
+    except BulkUploadTooLarge as e:
+        raise HTTPException(status_code=413, detail=str(e))
+    except BulkUploadError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    batch = bulk_processor.submit(upload, user_id)
+    return {
+        "batch_id": batch.batch_id,
+        "total": len(upload),
+        "status_url": f"/resume/bulk/{batch.batch_id}",
+    }
+
+@router.get("/bulk/{batch_id}")
+async def get_bulk_status(batch_id: str, include_results: bool = Query(False), user_id: Optional[str] = Depends(current_user_id)):
+    batch = await bulk_processor.get(batch_id)
+    # Another user's batch looks the same as a missing one
+    if batch is None or (batch["user_id"] and batch["user_id"] != user_id):
+        raise HTTPException(status_code=404, detail="Batch not found")
+    if not include_results:
+        batch = {**batch, "files": [{k: v for k, v in f.items() if k != "result"} for f in batch["files"]]}
+    return batch
+
+@router.get("/templates")
+def list_templates():
+    return [{"name": t.name, "description": t.description} for t in TEMPLATES.values()]
 
 @router.post("/generate")
-async def generate_pdf(data: dict):
+async def generate_pdf(data: dict, request: Request, template: str = Query(DEFAULT_TEMPLATE)):
+    try:
+        get_template(template)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    # The ETag comes from the input alone, so a match is answered without rendering
+    etag = f'"{resume_digest(data, template)}"'
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers={"ETag": etag})
+
     try:
-        pdf_bytes = generate_resume_pdf(data)
-        return Response(
-            content=pdf_bytes,
-            media_type="application/pdf",
-            headers={"Content-Disposition": "attachment; filename=resume.pdf"}
-        )
+        _, pdf_bytes = await render_resume(data, template)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
+
+    return Response(
+        content=pdf_bytes,
+        media_type="application/pdf",
+        headers={
+            "Content-Disposition": "attachment; filename=resume.pdf",
+            "ETag": etag,
+            "Cache-Control": "private, no-cache",
+        }
+    )
+
+@router.post("/generate/batch")
+async def generate_pdf_batch(request: BatchGenerateRequest):
+    """Render many resumes with one template; streams back a zip as each PDF finishes."""
+    try:
+        get_template(request.template)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if not request.resumes:
+        raise HTTPException(status_code=400, detail="No resumes to render")
+    if len(request.resumes) > MAX_BATCH_RESUMES:
+        raise HTTPException(status_code=400, detail=f"A batch can hold at most {MAX_BATCH_RESUMES} resumes")
+    if render_pool.saturated:
+        raise HTTPException(status_code=503, detail="Resume renderer is busy, please retry shortly", headers={"Retry-After": "5"})
+
+    return StreamingResponse(
+        stream_resume_zip(request.resumes, request.template),
+        media_type="application/zip",
+        headers={"Content-Disposition": f"attachment; filename=resumes_{request.template}.zip"}
+    )
@@ -0,0 +1,292 @@
+import asyncio
+import shutil
+import tempfile
+import time
+import uuid
+import zipfile
+from collections import OrderedDict
+from typing import BinaryIO, Dict, List, Optional, Tuple
+from app.core.config import settings
+from app.core.cache import ResponseCache, cache_backend
+from app.core.database import db
+from app.core.executors import PoolSaturated
+from app.services.resume_parser import (
+    RESUME_PARSER_VERSION, content_hash, extract_text, find_parsed_resume, parse_resume_with_llm,
+    pdf_pool, remember_parsed_resume
+)
+
+MAX_BULK_FILES = 1000
+INSERT_BATCH_SIZE = 50     # rows per bulk insert into resumes
+PERSIST_INTERVAL = 2.0     # seconds between batch snapshots written to the shared cache
+MAX_BATCHES_KEPT = 50      # finished batches kept in memory for polling
+BATCH_TTL = 24 * 3600
+SPOOL_MAX_BYTES = 1024 * 1024  # uploads larger than this are copied to disk, not kept in memory
+
+# Batch snapshots are shared, so a poll that lands on another worker still finds the batch
+batch_cache = ResponseCache("resume_batches", BATCH_TTL, MAX_BATCHES_KEPT, cache_backend(settings.CACHE_DB_PATH))
+
+
+class BulkUploadError(ValueError):
+    """The upload cannot be turned into a batch (bad zip, too many files, no PDFs)."""
+
+
+class BulkUploadTooLarge(BulkUploadError):
+    """A file, or the uncompressed total, is over its size limit."""
+
+
+class BulkUpload:
+    """
+    The PDFs of one bulk request, read one at a time as the pipeline reaches them.
+
+    Uploads are copied to temporary files owned by the batch (the request's own
+    spooled files are closed once it returns), and zip entries stay compressed
+    until read(). close() releases everything.
+    """
+
+    def __init__(self):
+        self.names: List[str] = []
+        self._sources: List[Tuple[BinaryIO, Optional[zipfile.ZipInfo], Optional[zipfile.ZipFile]]] = []
+        self._files: List[BinaryIO] = []
+        self.total_bytes = 0
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def add(self, name: str, file: BinaryIO, size: int, info: Optional[zipfile.ZipInfo] = None,
+            archive: Optional[zipfile.ZipFile] = None):
+        if size > settings.PDF_MAX_UPLOAD_BYTES:
+            raise BulkUploadTooLarge(f"{name} is larger than the per-file limit")
+        if len(self.names) >= MAX_BULK_FILES:
+            raise BulkUploadError(f"A batch can hold at most {MAX_BULK_FILES} files")
+        self.total_bytes += size
+        if self.total_bytes > settings.BULK_MAX_UPLOAD_BYTES:
+            raise BulkUploadTooLarge(f"Uncompressed upload exceeds {settings.BULK_MAX_UPLOAD_BYTES // (1024 * 1024)} MB")
+        self.names.append(name)
+        self._sources.append((file, info, archive))
+
+    def read(self, index: int) -> bytes:
+        """The PDF bytes of one file. Blocking; call it off the event loop."""
+        file, info, archive = self._sources[index]
+        if archive is None:
+            file.seek(0)
+            return file.read()
+        # Reads past the declared size are cut off, so a lying header cannot inflate this further
+        with archive.open(info) as entry:
+            return entry.read(settings.PDF_MAX_UPLOAD_BYTES + 1)
+
+    def close(self):
+        for file in self._files:
+            file.close()
+        self._files.clear()
+
+
+def collect_pdfs(uploads: List[Tuple[str, BinaryIO]]) -> BulkUpload:
+    """
+    Index uploaded PDFs and zip archives of PDFs without decompressing anything.
+
+    Zip entries are checked against the per-file limit, and all files together
+    against BULK_MAX_UPLOAD_BYTES, from their declared uncompressed sizes.
+    Anything that is not a .pdf (folders, __MACOSX metadata, other uploads)
+    is skipped. Blocking (copies the uploads); call it off the event loop.
+    """
+    upload = BulkUpload()
+    try:
+        for name, source in uploads:
+            file = tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_BYTES)
+            upload._files.append(file)
+            shutil.copyfileobj(source, file)
+            size = file.tell()
+            file.seek(0)
+            if file.read(4) == b"PK\x03\x04":
+                try:
+                    archive = zipfile.ZipFile(file)
+                except zipfile.BadZipFile:
+                    raise BulkUploadError(f"{name} is not a valid zip archive")
+                for info in archive.infolist():
+                    if info.is_dir() or not info.filename.lower().endswith(".pdf") or info.filename.startswith("__MACOSX/"):
+                        continue
+                    upload.add(info.filename.rsplit("/", 1)[-1], file, info.file_size, info, archive)
+            elif name.lower().endswith(".pdf"):
+                upload.add(name, file, size)
+        if not len(upload):
+            raise BulkUploadError("No PDF files found in the upload")
+    except Exception:
+        upload.close()
+        raise
+    return upload
+
+
+class ResumeBatch:
+    def __init__(self, batch_id: str, user_id: Optional[str], file_names: List[str]):
+        self.batch_id = batch_id
+        self.user_id = user_id
+        self.created_at = time.time()
+        self.finished_at: Optional[float] = None
+        # Per-file status: queued -> extracting -> parsing -> done | failed
+        self.files = [
+            {"index": i, "file_name": name, "status": "queued", "cached": False, "error": None, "result": None}
+            for i, name in enumerate(file_names)
+        ]
+        self.saved = 0
+
+    def counts(self) -> Dict[str, int]:
+        counts = {"queued": 0, "extracting": 0, "parsing": 0, "done": 0, "failed": 0}
+        for f in self.files:
+            counts[f["status"]] += 1
+        return counts
+
+    def to_dict(self) -> dict:
+        return {
+            "batch_id": self.batch_id,
+            "user_id": self.user_id,
+            "status": "completed" if self.finished_at else "processing",
+            "total": len(self.files),
+            "counts": self.counts(),
+            "saved": self.saved,
+            "created_at": self.created_at,
+            "finished_at": self.finished_at,
+            "files": self.files,
+        }
+
+
+class BulkResumeProcessor:
+    """
+    Runs resume batches through a two-stage pipeline.
+
+    Each file is hashed and checked against earlier parses first. New files
+    are extracted in the PDF process pool; batch jobs take at most
+    pdf_pool.max_workers slots, so interactive /resume/parse uploads still
+    find room in its queue. As soon as a file's text is ready it moves to the
+    LLM stage, which runs BULK_LLM_CONCURRENCY calls at a time. Parsed rows
+    are written to resumes in bulk upserts of INSERT_BATCH_SIZE.
+
+    Files are read from the upload only when their turn comes, and at most
+    twice the extraction slots' worth of PDF bytes is held at once.
+    """
+
+    def __init__(self, llm_concurrency: int):
+        self.llm_concurrency = llm_concurrency
+        self._batches: "OrderedDict[str, ResumeBatch]" = OrderedDict()
+        self._tasks: Dict[str, asyncio.Task] = {}
+
+    def submit(self, upload: BulkUpload, user_id: Optional[str]) -> ResumeBatch:
+        batch = ResumeBatch(uuid.uuid4().hex, user_id, upload.names)
+        self._batches[batch.batch_id] = batch
+        while len(self._batches) > MAX_BATCHES_KEPT:
+            oldest_id, _ = next(iter(self._batches.items()))
+            if oldest_id in self._tasks:
+                break
+            self._batches.pop(oldest_id)
+        task = asyncio.create_task(self._run(batch, upload))
+        self._tasks[batch.batch_id] = task
+        task.add_done_callback(lambda t: self._tasks.pop(batch.batch_id, None))
+        return batch
+
+    async def get(self, batch_id: str) -> Optional[dict]:
+        batch = self._batches.get(batch_id)
+        if batch is not None:
+            return batch.to_dict()
+        return await batch_cache.get(batch_id)
+
+    async def _persist(self, batch: ResumeBatch):
+        await batch_cache.set(batch.batch_id, batch.to_dict())
+
+    async def _run(self, batch: ResumeBatch, upload: BulkUpload):
+        extract_slots = asyncio.Semaphore(pdf_pool.max_workers)
+        # Files being read, hashed, looked up or extracted; the next ones are ready when a slot frees
+        read_slots = asyncio.Semaphore(pdf_pool.max_workers * 2)
+        llm_slots = asyncio.Semaphore(self.llm_concurrency)
+        pending_rows: List[dict] = []
+        last_persist = 0.0
+
+        async def flush_rows():
+            rows = pending_rows[:]
+            pending_rows.clear()
+            if not rows:
+                return
+            try:
+                await db.query("resumes", lambda t: t.upsert(
+                    rows, on_conflict="user_id,content_hash,parser_version", ignore_duplicates=True
+                ))
+                batch.saved += len(rows)
+            except Exception as e:
+                print(f"Error saving resume batch {batch.batch_id}: {e}")
+
+        async def process(entry: dict):
+            nonlocal last_persist
+            try:
+                async with read_slots:
+                    data = await asyncio.to_thread(upload.read, entry["index"])
+                    if len(data) > settings.PDF_MAX_UPLOAD_BYTES:
+                        raise ValueError("File is larger than the per-file limit")
+                    digest = content_hash(data)
+                    parsed = await find_parsed_resume(digest)
+                    entry["cached"] = parsed is not None
+                    if parsed is None:
+                        entry["status"] = "extracting"
+                        async with extract_slots:
+                            extraction = await self._extract(data, digest)
+                    # The PDF bytes are not needed past this point
+                    data = None
+                if parsed is None:
+                    if not extraction["text"]:
+                        raise ValueError("Could not extract text from PDF")
+                    entry["status"] = "parsing"
+                    async with llm_slots:
+                        parsed = await parse_resume_with_llm(extraction["text"])
+                    if "error" in parsed:
+                        raise ValueError(parsed["error"])
+                    await remember_parsed_resume(digest, parsed)
+                entry["result"] = parsed
+                entry["status"] = "done"
+                if db.enabled and batch.user_id:
+                    pending_rows.append({
+                        "user_id": batch.user_id,
+                        "file_name": entry["file_name"],
+                        "parsed_content": parsed,
+                        "score": 0,
+                        "content_hash": digest,
+                        "parser_version": RESUME_PARSER_VERSION,
+                    })
+                    if len(pending_rows) >= INSERT_BATCH_SIZE:
+                        await flush_rows()
+            except Exception as e:
+                entry["status"] = "failed"
+                entry["error"] = str(e) or e.__class__.__name__
+            if time.time() - last_persist >= PERSIST_INTERVAL:
+                last_persist = time.time()
+                await self._persist(batch)
+
+        try:
+            await asyncio.gather(*(process(entry) for entry in batch.files))
+            await flush_rows()
+        finally:
+            upload.close()
+            batch.finished_at = time.time()
+            await self._persist(batch)
+            counts = batch.counts()
+            print(f"Resume batch {batch.batch_id}: {counts['done']} done, {counts['failed']} failed")
+
+    @staticmethod
+    async def _extract(data: bytes, digest: str) -> dict:
+        # Interactive uploads may have filled the pool's queue; wait for room instead of failing the file
+        while True:
+            try:
+                return await extract_text(data, digest)
+            except PoolSaturated:
+                await asyncio.sleep(0.2)
+
+    async def stop(self):
+        for task in list(self._tasks.values()):
+            task.cancel()
+        for task in list(self._tasks.values()):
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+
+    def stats(self) -> dict:
+        return {"batches": len(self._batches), "running": len(self._tasks)}
+
+
+bulk_processor = BulkResumeProcessor(settings.BULK_LLM_CONCURRENCY)
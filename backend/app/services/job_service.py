@@ -1,45 +1,64 @@
-import requests
+import httpx
 from typing import List, Dict, Optional
-from datetime import datetime, timedelta
+from datetime import timedelta
 from app.core.config import settings
+from app.core import http
+from app.core.cache import StaleWhileRevalidateCache, cache_backend
 
-# Simple in-memory cache
-job_cache = {}
+# Bounded job search cache: fresh for CACHE_DURATION, then served stale for
+# STALE_DURATION while a background refresh runs
 CACHE_DURATION = timedelta(hours=1)
+STALE_DURATION = timedelta(hours=6)
+CACHE_MAX_ENTRIES = 500
+CACHE_MAX_BYTES = 20 * 1024 * 1024
+# Only what format_job_data reads is kept; descriptions are cut to what it shows
+CACHED_JOB_FIELDS = (
+    "job_id", "job_title", "employer_name", "employer_logo", "job_employment_type",
+    "job_min_salary", "job_max_salary", "job_salary_currency", "job_is_remote",
+    "job_city", "job_state", "job_country", "job_apply_link", "job_google_link",
+    "job_publisher", "job_posted_at_datetime_utc", "job_required_skills",
+)
+CACHED_DESCRIPTION_CHARS = 200
 
-def search_jobs(
+job_cache = StaleWhileRevalidateCache(
+    "jobs",
+    fresh_ttl=CACHE_DURATION.total_seconds(),
+    stale_ttl=STALE_DURATION.total_seconds(),
+    max_entries=CACHE_MAX_ENTRIES,
+    max_bytes=CACHE_MAX_BYTES,
+    should_cache=lambda data: data.get("status") != "error",
+    store=cache_backend(settings.CACHE_DB_PATH),
+)
+
+ACCESS_DENIED_MESSAGE = "JSearch API access denied (403). Subscribe to JSearch on RapidAPI (free tier available), then add JSEARCH_API_KEY to your backend .env. Get your key: https://rapidapi.com/letscrape-6bRBa3QguO5/api/jsearch"
+
+def _normalize(value: Optional[str]) -> str:
+    return " ".join((value or "").lower().split())
+
+def job_cache_key(query: str, location: str, employment_type: Optional[str], date_posted: str, page: int) -> str:
+    """Case- and whitespace-insensitive cache key for a search."""
+    return "|".join([
+        _normalize(query),
+        _normalize(location),
+        _normalize(employment_type).upper(),
+        _normalize(date_posted),
+        str(page),
+    ])
+
+def compact_job(job: Dict) -> Dict:
+    compact = {field: job[field] for field in CACHED_JOB_FIELDS if field in job}
+    description = job.get("job_description")
+    if description:
+        compact["job_description"] = description[:CACHED_DESCRIPTION_CHARS]
+    return compact
+
+async def _fetch_jobs(
     query: str,
-    location: str = "India",
-    employment_type: Optional[str] = None,
-    date_posted: str = "all",
-    page: int = 1
+    location: str,
+    employment_type: Optional[str],
+    date_posted: str,
+    page: int
 ) -> Dict:
-    """
-    Search for jobs using JSearch API
-    
-    Args:
-        query: Job title or keywords (e.g., "Python Developer")
-        location: Location (e.g., "Bangalore, India")
-        employment_type: FULLTIME, PARTTIME, CONTRACTOR, INTERN
-        date_posted: all, today, 3days, week, month
-        page: Page number for pagination
-    """
-    
-    # Check cache
-    cache_key = f"{query}_{location}_{employment_type}_{date_posted}_{page}"
-    if cache_key in job_cache:
-        cached_data, cached_time = job_cache[cache_key]
-        if datetime.now() - cached_time < CACHE_DURATION:
-            print(f"Returning cached results for: {cache_key}")
-            return cached_data
-    
-    if not settings.JSEARCH_API_KEY:
-        return {
-            "status": "error",
-            "message": "JSearch API key not configured. Please add JSEARCH_API_KEY to your .env file.",
-            "data": []
-        }
-    
     url = "https://jsearch.p.rapidapi.com/search"
     
     params = {
@@ -59,30 +78,27 @@ def search_jobs(
     
     try:
         print(f"Fetching jobs from JSearch API: {query} in {location}")
-        response = requests.get(url, headers=headers, params=params, timeout=10)
+        response = await http.get("jsearch", url, headers=headers, params=params)
 
         if response.status_code == 403:
             return {
                 "status": "error",
-                "message": "JSearch API access denied (403). Subscribe to JSearch on RapidAPI (free tier available), then add JSEARCH_API_KEY to your backend .env. Get your key: https://rapidapi.com/letscrape-6bRBa3QguO5/api/jsearch",
+                "message": ACCESS_DENIED_MESSAGE,
                 "data": []
             }
 
         response.raise_for_status()
         data = response.json()
-
-        # Cache the result
-        job_cache[cache_key] = (data, datetime.now())
-        print(f"Cached {len(data.get('data', []))} jobs")
-
+        data["data"] = [compact_job(job) for job in data.get("data", [])]
         return data
-    except requests.exceptions.RequestException as e:
+    except (httpx.HTTPError, ValueError) as e:
+        # ValueError: a 200 whose body is not JSON (HTML error page, truncated response)
         print(f"JSearch API Error: {e}")
         msg = str(e)
         if "403" in msg or "Forbidden" in msg:
             return {
                 "status": "error",
-                "message": "JSearch API access denied (403). Subscribe to JSearch on RapidAPI (free tier available), then add JSEARCH_API_KEY to your backend .env. Get your key: https://rapidapi.com/letscrape-6bRBa3QguO5/api/jsearch",
+                "message": ACCESS_DENIED_MESSAGE,
                 "data": []
             }
         return {
@@ -91,6 +107,38 @@ def search_jobs(
             "data": []
         }
 
+async def search_jobs(
+    query: str,
+    location: str = "India",
+    employment_type: Optional[str] = None,
+    date_posted: str = "all",
+    page: int = 1
+) -> Dict:
+    """
+    Search for jobs using JSearch API
+    
+    Args:
+        query: Job title or keywords (e.g., "Python Developer")
+        location: Location (e.g., "Bangalore, India")
+        employment_type: FULLTIME, PARTTIME, CONTRACTOR, INTERN
+        date_posted: all, today, 3days, week, month
+        page: Page number for pagination
+
+    Results go through job_cache; error responses are returned but never cached.
+    """
+    if not settings.JSEARCH_API_KEY:
+        return {
+            "status": "error",
+            "message": "JSearch API key not configured. Please add JSEARCH_API_KEY to your .env file.",
+            "data": []
+        }
+
+    cache_key = job_cache_key(query, location, employment_type, date_posted, page)
+    return await job_cache.get_or_load(
+        cache_key,
+        lambda: _fetch_jobs(query, location, employment_type, date_posted, page)
+    )
+
 def get_sample_jobs(query: str, location: str, employment_type: Optional[str] = None) -> List[Dict]:
     """Return sample job listings when real API is unavailable (e.g. 403 / no key)."""
     type_label = {
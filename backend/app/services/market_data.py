@@ -0,0 +1,159 @@
+import asyncio
+import time
+from datetime import datetime, timezone
+from typing import Optional
+from app.core.config import settings
+from app.core import http
+from app.core.cache import ResponseCache, cache_backend
+
+# Rates on the free plan update once a day; an hour keeps every worker well under quota
+RATES_TTL = 3600
+
+# Headlines are shared through the cache backend too, so N workers make one or two calls per refresh
+# interval rather than N. The TTL is half the interval: a refresh that finds another worker's entry
+# still gets headlines at most half an interval old, instead of up to a whole one.
+NEWS_TTL = settings.MARKET_REFRESH_MINUTES * 60 / 2
+
+rates_cache = ResponseCache("exchangerate", RATES_TTL, 50, cache_backend(settings.CACHE_DB_PATH))
+news_cache = ResponseCache("news", NEWS_TTL, 10, cache_backend(settings.CACHE_DB_PATH))
+
+async def fetch_conversion_rates(base_currency: str = "USD") -> Optional[dict]:
+    """
+    Latest conversion rates for base_currency, or None if the API reported a failure.
+
+    Successful results are cached; transport errors propagate to the caller.
+    """
+    base_currency = base_currency.strip().upper()
+    cached = await rates_cache.get(base_currency)
+    if cached is not None:
+        return cached
+
+    url = f"https://v6.exchangerate-api.com/v6/{settings.EXCHANGE_API_KEY}/latest/{base_currency}"
+    resp = await http.get("exchangerate", url)
+    data = resp.json()
+    if data.get("result") != "success":
+        return None
+    rates = data.get("conversion_rates", {})
+    await rates_cache.set(base_currency, rates)
+    return rates
+
+async def fetch_tech_news() -> Optional[dict]:
+    """
+    Top technology headlines from News API as {"articles", "fetched_at"}, or
+    None if they could not be fetched. fetched_at is when News API was called,
+    which for a cache hit may be before this call.
+    """
+    if not settings.NEWS_API_KEY:
+        return {"articles": [], "fetched_at": None}
+    cached = await news_cache.get("technology-headlines")
+    if cached is not None:
+        return cached
+    try:
+        n_res = await http.get(
+            "newsapi",
+            "https://newsapi.org/v2/top-headlines",
+            params={"category": "technology", "language": "en", "apiKey": settings.NEWS_API_KEY},
+        )
+        if n_res.status_code == 200:
+            news = {"articles": n_res.json().get("articles", [])[:3], "fetched_at": time.time()}
+            await news_cache.set("technology-headlines", news)
+            return news
+        print(f"News API error: HTTP {n_res.status_code}")
+    except Exception as e:
+        print(f"News API error: {e}")
+    return None
+
+async def fetch_market_trend() -> Optional[dict]:
+    """USD to INR as a sample market value trend proxy, or None if it could not be fetched."""
+    if not settings.EXCHANGE_API_KEY:
+        return {}
+    try:
+        rates = await fetch_conversion_rates("USD")
+        if rates is not None:
+            return {
+                "base": "USD",
+                "rates": {
+                    "INR": rates.get("INR")
+                }
+            }
+    except Exception as e:
+        print(f"Exchange API error: {e}")
+    return None
+
+
+class MarketSnapshot:
+    """
+    News headlines and exchange rates, refreshed in the background.
+
+    The data is the same for every user, so the dashboard reads this snapshot
+    instead of calling the APIs per request. A failed refresh keeps the last
+    good values; read() reports when the snapshot was refreshed and how old
+    the headlines themselves are (they may come from another worker's fetch).
+    """
+
+    def __init__(self, interval: float):
+        self.interval = interval
+        self.news: list = []
+        self.news_fetched_at: Optional[float] = None
+        self.market: dict = {}
+        self.updated_at: Optional[float] = None
+        self.refreshes = 0
+        self.errors = 0
+        self._task: Optional[asyncio.Task] = None
+
+    async def refresh(self):
+        news, market = await asyncio.gather(fetch_tech_news(), fetch_market_trend())
+        if news is None or market is None:
+            self.errors += 1
+        if news is not None:
+            self.news = news["articles"]
+            self.news_fetched_at = news["fetched_at"]
+        if market is not None:
+            self.market = market
+        if news is not None or market is not None:
+            self.updated_at = time.time()
+        self.refreshes += 1
+
+    async def _run(self):
+        while True:
+            try:
+                await self.refresh()
+            except Exception as e:
+                self.errors += 1
+                print(f"Market snapshot refresh error: {e}")
+            await asyncio.sleep(self.interval)
+
+    def start(self):
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def read(self) -> dict:
+        """Current snapshot; no network I/O."""
+        return {
+            "news": self.news,
+            "market": self.market,
+            "updated_at": datetime.fromtimestamp(self.updated_at, timezone.utc).isoformat() if self.updated_at else None,
+            "age_seconds": round(time.time() - self.updated_at) if self.updated_at else None,
+            "news_age_seconds": round(time.time() - self.news_fetched_at) if self.news_fetched_at else None,
+        }
+
+    def stats(self) -> dict:
+        snapshot = self.read()
+        return {
+            "refreshes": self.refreshes,
+            "errors": self.errors,
+            "age_seconds": snapshot["age_seconds"],
+            "news_age_seconds": snapshot["news_age_seconds"],
+            "interval_seconds": self.interval,
+        }
+
+
+market_snapshot = MarketSnapshot(settings.MARKET_REFRESH_MINUTES * 60)
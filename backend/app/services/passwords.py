@@ -0,0 +1,13 @@
+from passlib.context import CryptContext
+
+# bcrypt runs in the auth worker pool (see routers/auth.py); this module has no app
+# imports so the workers start quickly and do not load settings or clients
+pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+
+def hash_password(password: str) -> str:
+    # Bcrypt has a 72-character limit. Truncate to avoid errors.
+    return pwd_context.hash(password[:72])
+
+def check_password(plain_password: str, hashed_password: str) -> bool:
+    # Bcrypt has a 72-character limit. Truncate to avoid errors.
+    return pwd_context.verify(plain_password[:72], hashed_password)
@@ -1,87 +1,203 @@
-from reportlab.lib.pagesizes import letter
-from reportlab.pdfgen import canvas
+from reportlab.lib.pagesizes import letter, A4
 from reportlab.lib import colors
 from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle
+from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer
+from typing import Dict, Tuple
+import hashlib
 import io
+import json
 
-def generate_resume_pdf(data: dict) -> bytes:
-    buffer = io.BytesIO()
-    doc = SimpleDocTemplate(buffer, pagesize=letter, rightMargin=72, leftMargin=72, topMargin=72, bottomMargin=18)
-    
-    styles = getSampleStyleSheet()
-    
-    # Custom Styles
-    name_style = ParagraphStyle(
-        'NameStyle',
-        parent=styles['Heading1'],
-        fontSize=24,
-        textColor=colors.indigo,
-        alignment=1, # Center
-        spaceAfter=10
-    )
-    
-    section_title_style = ParagraphStyle(
-        'SectionTitle',
-        parent=styles['Heading2'],
-        fontSize=14,
-        textColor=colors.indigo,
-        borderPadding=5,
-        borderWidth=0,
-        spaceBefore=12,
-        spaceAfter=6,
-        underlineWidth=1
-    )
-    
-    normal_style = styles['Normal']
-    
-    story = []
-    
-    # Header
-    personal = data.get('personal', {})
-    story.append(Paragraph(f"{personal.get('firstName', '')} {personal.get('lastName', '')}", name_style))
-    story.append(Paragraph(f"{personal.get('email', '')} | {personal.get('phone', '')}", styles['Normal']))
-    story.append(Spacer(1, 12))
-    
-    # Summary
-    if personal.get('summary'):
-        story.append(Paragraph("PROFESSIONAL SUMMARY", section_title_style))
-        story.append(Paragraph(personal.get('summary'), normal_style))
+# Bump when a layout changes, so memoized PDFs and ETags from the old layout are not served
+RESUME_LAYOUT_VERSION = 1
+
+DEFAULT_TEMPLATE = "classic"
+
+class ResumeTemplate:
+    """
+    A resume layout: page setup, section order and paragraph styles.
+
+    Styles are built once when the template is registered; rendering only
+    reads them, so one template serves every request (and every worker
+    process imports its own copy).
+    """
+
+    def __init__(self, name: str, description: str, pagesize: Tuple[float, float], margins: Tuple[int, int, int, int],
+                 sections: Tuple[str, ...], name_style: ParagraphStyle, section_title_style: ParagraphStyle,
+                 normal_style: ParagraphStyle, italic_style: ParagraphStyle):
+        self.name = name
+        self.description = description
+        self.pagesize = pagesize
+        self.margins = margins  # left, right, top, bottom
+        self.sections = sections
+        self.name_style = name_style
+        self.section_title_style = section_title_style
+        self.normal_style = normal_style
+        self.italic_style = italic_style
+
+_base = getSampleStyleSheet()
+
+TEMPLATES: Dict[str, ResumeTemplate] = {
+    "classic": ResumeTemplate(
+        "classic",
+        "Centered header with indigo section titles",
+        pagesize=letter,
+        margins=(72, 72, 72, 18),
+        sections=("summary", "experience", "education", "projects", "skills"),
+        name_style=ParagraphStyle(
+            'NameStyle',
+            parent=_base['Heading1'],
+            fontSize=24,
+            textColor=colors.indigo,
+            alignment=1, # Center
+            spaceAfter=10
+        ),
+        section_title_style=ParagraphStyle(
+            'SectionTitle',
+            parent=_base['Heading2'],
+            fontSize=14,
+            textColor=colors.indigo,
+            borderPadding=5,
+            borderWidth=0,
+            spaceBefore=12,
+            spaceAfter=6,
+            underlineWidth=1
+        ),
+        normal_style=_base['Normal'],
+        italic_style=_base['Italic'],
+    ),
+    "modern": ResumeTemplate(
+        "modern",
+        "Left-aligned header, skills first, teal accents",
+        pagesize=A4,
+        margins=(54, 54, 54, 36),
+        sections=("summary", "skills", "experience", "projects", "education"),
+        name_style=ParagraphStyle(
+            'ModernName',
+            parent=_base['Heading1'],
+            fontName='Helvetica-Bold',
+            fontSize=22,
+            textColor=colors.HexColor("#0f766e"),
+            spaceAfter=6
+        ),
+        section_title_style=ParagraphStyle(
+            'ModernSectionTitle',
+            parent=_base['Heading2'],
+            fontName='Helvetica-Bold',
+            fontSize=12,
+            textColor=colors.HexColor("#0f766e"),
+            spaceBefore=10,
+            spaceAfter=4
+        ),
+        normal_style=ParagraphStyle('ModernNormal', parent=_base['Normal'], fontName='Helvetica', fontSize=10, leading=13),
+        italic_style=ParagraphStyle('ModernItalic', parent=_base['Italic'], fontName='Helvetica-Oblique', fontSize=9,
+                                    textColor=colors.grey),
+    ),
+    "compact": ResumeTemplate(
+        "compact",
+        "Dense single-page serif layout for long histories",
+        pagesize=letter,
+        margins=(40, 40, 36, 24),
+        sections=("summary", "experience", "projects", "education", "skills"),
+        name_style=ParagraphStyle(
+            'CompactName',
+            parent=_base['Heading1'],
+            fontName='Times-Bold',
+            fontSize=16,
+            spaceAfter=2
+        ),
+        section_title_style=ParagraphStyle(
+            'CompactSectionTitle',
+            parent=_base['Heading2'],
+            fontName='Times-Bold',
+            fontSize=11,
+            spaceBefore=6,
+            spaceAfter=2
+        ),
+        normal_style=ParagraphStyle('CompactNormal', parent=_base['Normal'], fontName='Times-Roman', fontSize=9, leading=11),
+        italic_style=ParagraphStyle('CompactItalic', parent=_base['Italic'], fontName='Times-Italic', fontSize=9, leading=11),
+    ),
+}
+
+def get_template(name: str) -> ResumeTemplate:
+    template = TEMPLATES.get(name)
+    if template is None:
+        raise ValueError(f"Unknown resume template '{name}'. Available: {', '.join(TEMPLATES)}")
+    return template
+
+def resume_digest(data: dict, template: str = DEFAULT_TEMPLATE) -> str:
+    """SHA-256 of the canonical JSON form of a resume dict (key order and whitespace do not matter) and template."""
+    canonical = json.dumps(data, sort_keys=True, separators=(",", ":"), ensure_ascii=False, default=str)
+    return hashlib.sha256(f"v{RESUME_LAYOUT_VERSION}:{template}:{canonical}".encode("utf-8")).hexdigest()
+
+# Section renderers, in the order a template lists them
+
+def _summary(data: dict, t: ResumeTemplate, story: list):
+    summary = data.get('personal', {}).get('summary')
+    if summary:
+        story.append(Paragraph("PROFESSIONAL SUMMARY", t.section_title_style))
+        story.append(Paragraph(summary, t.normal_style))
         story.append(Spacer(1, 12))
-        
-    # Experience
+
+def _experience(data: dict, t: ResumeTemplate, story: list):
     if data.get('experience'):
-        story.append(Paragraph("EXPERIENCE", section_title_style))
+        story.append(Paragraph("EXPERIENCE", t.section_title_style))
         for exp in data['experience']:
-            story.append(Paragraph(f"<b>{exp.get('role', '')}</b> | {exp.get('company', '')}", normal_style))
-            story.append(Paragraph(f"{exp.get('start', '')} - {exp.get('end', '')}", styles['Italic']))
-            story.append(Paragraph(exp.get('description', ''), normal_style))
+            story.append(Paragraph(f"<b>{exp.get('role', '')}</b> | {exp.get('company', '')}", t.normal_style))
+            story.append(Paragraph(f"{exp.get('start', '')} - {exp.get('end', '')}", t.italic_style))
+            story.append(Paragraph(exp.get('description', ''), t.normal_style))
             story.append(Spacer(1, 8))
-            
-    # Education
+
+def _education(data: dict, t: ResumeTemplate, story: list):
     if data.get('education'):
-        story.append(Paragraph("EDUCATION", section_title_style))
+        story.append(Paragraph("EDUCATION", t.section_title_style))
         for edu in data['education']:
-            story.append(Paragraph(f"<b>{edu.get('degree', '')} in {edu.get('field', '')}</b>", normal_style))
-            story.append(Paragraph(f"{edu.get('school', '')} | Graduated: {edu.get('year', '')}", normal_style))
+            story.append(Paragraph(f"<b>{edu.get('degree', '')} in {edu.get('field', '')}</b>", t.normal_style))
+            story.append(Paragraph(f"{edu.get('school', '')} | Graduated: {edu.get('year', '')}", t.normal_style))
             story.append(Spacer(1, 6))
-            
-    # Projects
+
+def _projects(data: dict, t: ResumeTemplate, story: list):
     if data.get('projects'):
-        story.append(Paragraph("PROJECTS", section_title_style))
+        story.append(Paragraph("PROJECTS", t.section_title_style))
         for proj in data['projects']:
-            story.append(Paragraph(f"<b>{proj.get('title', '')}</b> | {proj.get('techStack', '')}", normal_style))
-            story.append(Paragraph(proj.get('description', ''), normal_style))
+            story.append(Paragraph(f"<b>{proj.get('title', '')}</b> | {proj.get('techStack', '')}", t.normal_style))
+            story.append(Paragraph(proj.get('description', ''), t.normal_style))
             story.append(Spacer(1, 6))
-            
-    # Skills
+
+def _skills(data: dict, t: ResumeTemplate, story: list):
     if data.get('skills'):
-        story.append(Paragraph("SKILLS", section_title_style))
+        story.append(Paragraph("SKILLS", t.section_title_style))
         skills_text = ", ".join(data['skills'])
-        story.append(Paragraph(skills_text, normal_style))
-        
+        story.append(Paragraph(skills_text, t.normal_style))
+
+SECTIONS = {
+    "summary": _summary,
+    "experience": _experience,
+    "education": _education,
+    "projects": _projects,
+    "skills": _skills,
+}
+
+def generate_resume_pdf(data: dict, template: str = DEFAULT_TEMPLATE) -> bytes:
+    t = get_template(template)
+    buffer = io.BytesIO()
+    left, right, top, bottom = t.margins
+    # invariant drops the timestamp and random document id, so the same input renders the same bytes
+    doc = SimpleDocTemplate(buffer, pagesize=t.pagesize, rightMargin=right, leftMargin=left, topMargin=top,
+                            bottomMargin=bottom, invariant=1)
+
+    story = []
+
+    # Header
+    personal = data.get('personal', {})
+    story.append(Paragraph(f"{personal.get('firstName', '')} {personal.get('lastName', '')}", t.name_style))
+    story.append(Paragraph(f"{personal.get('email', '')} | {personal.get('phone', '')}", t.normal_style))
+    story.append(Spacer(1, 12))
+
+    for section in t.sections:
+        SECTIONS[section](data, t, story)
+
     doc.build(story)
-    
+
     pdf_bytes = buffer.getvalue()
     buffer.close()
     return pdf_bytes
@@ -0,0 +1,44 @@
+import io
+from typing import Iterator
+import PyPDF2
+
+# Kept free of app imports: this module is loaded by the PDF worker processes.
+
+def iter_page_text(pdf_reader: PyPDF2.PdfReader, max_pages: int = 0) -> Iterator[str]:
+    """Text of each page in order ("" for pages without text), parsing a page only when asked for it."""
+    for index, page in enumerate(pdf_reader.pages):
+        if max_pages and index >= max_pages:
+            return
+        yield page.extract_text() or ""
+
+def extract_text_from_pdf(file_bytes: bytes, max_pages: int = 0, max_chars: int = 0) -> dict:
+    """
+    Extract text until max_chars characters have been collected (0 = no budget).
+
+    Pages past the budget or past max_pages are never parsed. Returns
+    {"text", "pages_read", "total_pages", "truncated"}; text is "" if the PDF
+    cannot be read.
+    """
+    result = {"text": "", "pages_read": 0, "total_pages": 0, "truncated": False}
+    try:
+        pdf_reader = PyPDF2.PdfReader(io.BytesIO(file_bytes))
+        result["total_pages"] = len(pdf_reader.pages)
+        parts = []
+        collected = 0
+        for page_text in iter_page_text(pdf_reader, max_pages):
+            result["pages_read"] += 1
+            if page_text:
+                parts.append(page_text)
+                collected += len(page_text) + 1
+            if max_chars and collected >= max_chars:
+                break
+        text = "\n".join(parts).strip()
+        if max_chars and len(text) > max_chars:
+            text = text[:max_chars]
+            result["truncated"] = True
+        if result["pages_read"] < result["total_pages"]:
+            result["truncated"] = True
+        result["text"] = text
+    except Exception as e:
+        print(f"Error reading PDF: {e}")
+    return result
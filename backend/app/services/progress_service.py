@@ -0,0 +1,53 @@
+from typing import Optional
+from app.core.database import db
+
+# Per-user aggregate kept by the record_progress / refresh_user_progress functions
+# in supabase_user_progress.sql
+
+async def record_progress(
+    user_id: Optional[str],
+    quiz_score: Optional[int] = None,
+    quiz_questions: Optional[int] = None,
+    interview_score: Optional[int] = None,
+    evaluations: int = 0,
+    match_score: Optional[int] = None,
+    completed_modules: Optional[int] = None
+):
+    """
+    Fold one event into the user's progress row with a single atomic update.
+
+    Call it after the event is stored in its history table: a user with no
+    row yet is seeded from history, and that recompute counts this event.
+    Best effort: the event itself is already stored, so a failure here is only
+    logged. refresh_progress() can rebuild the row from history.
+    """
+    if not (db.enabled and user_id):
+        return
+    params = {
+        "p_user_id": user_id,
+        "p_quiz_score": quiz_score,
+        "p_quiz_questions": quiz_questions,
+        "p_interview_score": interview_score,
+        "p_evaluations": evaluations,
+        "p_match_score": match_score,
+        "p_completed_modules": completed_modules,
+    }
+    try:
+        await db.rpc("record_progress", params)
+    except Exception as e:
+        print(f"Error updating progress aggregate: {e}")
+
+async def refresh_progress(user_id: str) -> Optional[dict]:
+    """Rebuild the user's progress row from the history tables and return it."""
+    res = await db.rpc("refresh_user_progress", {"p_user_id": user_id})
+    data = res.data
+    if isinstance(data, list):
+        data = data[0] if data else None
+    return data
+
+async def get_progress(user_id: str) -> Optional[dict]:
+    """The user's progress row by primary key, seeded from history on first read."""
+    res = await db.query("user_progress", lambda t: t.select("*").eq("user_id", user_id).limit(1))
+    if res.data:
+        return res.data[0]
+    return await refresh_progress(user_id)
@@ -0,0 +1,276 @@
+import asyncio
+import hashlib
+import json
+import os
+import random
+import sqlite3
+import time
+from collections import defaultdict
+from typing import Dict, List, Optional, Set, Tuple
+from app.core.config import settings
+from app.core import llm
+from app.core.json_stream import parse_llm_json
+
+# Pool sizing per (topic, difficulty)
+LOW_WATER = 15      # refill when fewer unseen questions than this remain
+REFILL_BATCH = 10   # questions requested from the LLM per top-up
+MAX_POOL_SIZE = 200 # stop topping up a key once it holds this many questions
+DIFFICULTIES = ("Easy", "Medium", "Hard")
+PREWARM_DIFFICULTIES = ("Medium",)  # the quiz page's default level
+
+PoolKey = Tuple[str, str]
+
+
+def normalize_key(topic: str, difficulty: str) -> PoolKey:
+    topic_key = " ".join(topic.lower().split())
+    difficulty_key = difficulty.strip().capitalize()
+    if difficulty_key not in DIFFICULTIES:
+        difficulty_key = "Medium"
+    return topic_key, difficulty_key
+
+
+def build_quiz_prompt(topic: str, difficulty: str, count: int, avoid: Optional[List[str]] = None) -> str:
+    avoid_block = ""
+    if avoid:
+        avoid_block = "Do not repeat any of these existing questions:\n" + "\n".join(f"- {q}" for q in avoid)
+
+    return f"""
+    Generate {count} {difficulty} multiple-choice questions about {topic}.
+    Each question must be challenging and relevant.
+    {avoid_block}
+    Return a valid JSON object with a key "questions" containing an array of objects.
+    Each object must have:
+    - id: (unique number)
+    - question: (string)
+    - options: (list of 4 strings)
+    - correct: (the exact correct option string)
+    - explanation: (brief reason why it is correct)
+
+    Return ONLY valid JSON. Do not include markdown naming like ```json.
+    """
+
+
+def clean_questions(raw_questions: List[dict]) -> List[dict]:
+    """Keep well-formed questions, stripped to the fields the pool stores."""
+    questions = []
+    for q in raw_questions:
+        if q.get("question") and isinstance(q.get("options"), list) and q.get("correct") in q["options"]:
+            questions.append({
+                "question": q["question"],
+                "options": q["options"],
+                "correct": q["correct"],
+                "explanation": q.get("explanation", ""),
+            })
+    return questions
+
+
+def _fingerprint(question: dict) -> str:
+    text = " ".join(question["question"].lower().split())
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()
+
+
+class QuestionPool:
+    """
+    Bank of pre-generated quiz questions keyed by normalized (topic, difficulty).
+
+    Questions and per-user "seen" markers live in memory for fast draws and are
+    written through to a SQLite file so the bank survives restarts. A background
+    worker tops up keys that drop below LOW_WATER.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._questions: Dict[PoolKey, List[dict]] = defaultdict(list)
+        self._fingerprints: Dict[PoolKey, Set[str]] = defaultdict(set)
+        self._seen: Dict[str, Set[int]] = defaultdict(set)
+        self._refill_queue: Optional[asyncio.Queue] = None
+        self._pending: Set[PoolKey] = set()
+        self._worker: Optional[asyncio.Task] = None
+        self.draws = 0
+        self.misses = 0
+        self.refills = 0
+
+    # --- storage ---
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.path, timeout=5)
+
+    def load(self):
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS pool_questions ("
+                " id INTEGER PRIMARY KEY AUTOINCREMENT,"
+                " topic TEXT NOT NULL,"
+                " difficulty TEXT NOT NULL,"
+                " fingerprint TEXT NOT NULL,"
+                " data TEXT NOT NULL,"
+                " created_at REAL NOT NULL,"
+                " UNIQUE (topic, difficulty, fingerprint))"
+            )
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS pool_seen ("
+                " user_id TEXT NOT NULL,"
+                " question_id INTEGER NOT NULL,"
+                " PRIMARY KEY (user_id, question_id))"
+            )
+            rows = conn.execute("SELECT id, topic, difficulty, fingerprint, data FROM pool_questions").fetchall()
+            seen_rows = conn.execute("SELECT user_id, question_id FROM pool_seen").fetchall()
+
+        self._questions.clear()
+        self._fingerprints.clear()
+        self._seen.clear()
+        for question_id, topic, difficulty, fingerprint, data in rows:
+            question = json.loads(data)
+            question["id"] = question_id
+            self._questions[(topic, difficulty)].append(question)
+            self._fingerprints[(topic, difficulty)].add(fingerprint)
+        for user_id, question_id in seen_rows:
+            self._seen[user_id].add(question_id)
+
+    def _insert(self, key: PoolKey, questions: List[dict]) -> List[dict]:
+        stored = []
+        with self._connect() as conn:
+            for question in questions:
+                cursor = conn.execute(
+                    "INSERT OR IGNORE INTO pool_questions (topic, difficulty, fingerprint, data, created_at)"
+                    " VALUES (?, ?, ?, ?, ?)",
+                    (key[0], key[1], _fingerprint(question), json.dumps(question), time.time()),
+                )
+                if cursor.rowcount:
+                    stored.append({**question, "id": cursor.lastrowid})
+        return stored
+
+    def _mark_seen(self, user_id: str, question_ids: List[int]):
+        with self._connect() as conn:
+            conn.executemany(
+                "INSERT OR IGNORE INTO pool_seen (user_id, question_id) VALUES (?, ?)",
+                [(user_id, question_id) for question_id in question_ids],
+            )
+
+    async def add(self, key: PoolKey, questions: List[dict]) -> List[dict]:
+        fresh = {}
+        for question in questions:
+            fingerprint = _fingerprint(question)
+            if fingerprint not in self._fingerprints[key]:
+                fresh.setdefault(fingerprint, question)
+        if not fresh:
+            return []
+        stored = await asyncio.to_thread(self._insert, key, list(fresh.values()))
+        # Only rows that made it to disk count as known; a failed write leaves them free to retry
+        self._fingerprints[key].update(_fingerprint(question) for question in stored)
+        self._questions[key].extend(stored)
+        return stored
+
+    # --- draws ---
+    def _unseen(self, key: PoolKey, user_id: Optional[str]) -> List[dict]:
+        seen = self._seen.get(user_id, set()) if user_id else set()
+        return [q for q in self._questions.get(key, []) if q["id"] not in seen]
+
+    def seen_questions(self, topic: str, difficulty: str, user_id: Optional[str], limit: int = 20) -> List[str]:
+        """Text of the most recent pooled questions this user has already been served."""
+        if not user_id:
+            return []
+        seen = self._seen.get(user_id, set())
+        questions = [q["question"] for q in self._questions.get(normalize_key(topic, difficulty), []) if q["id"] in seen]
+        return questions[-limit:]
+
+    async def draw(self, topic: str, difficulty: str, count: int, user_id: Optional[str] = None) -> Optional[List[dict]]:
+        """
+        Return `count` questions the user has not seen yet, or None if the pool
+        cannot cover the request. Either way a refill is scheduled when the
+        key is running low.
+        """
+        key = normalize_key(topic, difficulty)
+        unseen = self._unseen(key, user_id)
+        if len(unseen) - count < LOW_WATER:
+            self.schedule_refill(key)
+
+        if len(unseen) < count:
+            self.misses += 1
+            return None
+
+        self.draws += 1
+        picked = random.sample(unseen, count)
+        if user_id:
+            await self.record_seen(user_id, [q["id"] for q in picked])
+        return picked
+
+    async def record_seen(self, user_id: str, question_ids: List[int]):
+        self._seen[user_id].update(question_ids)
+        try:
+            await asyncio.to_thread(self._mark_seen, user_id, question_ids)
+        except sqlite3.Error as e:
+            print(f"Question pool seen write error: {e}")
+
+    # --- background refill ---
+    def schedule_refill(self, key: PoolKey):
+        if self._refill_queue is None or key in self._pending:
+            return
+        if len(self._questions.get(key, [])) >= MAX_POOL_SIZE:
+            return
+        self._pending.add(key)
+        self._refill_queue.put_nowait(key)
+
+    def prewarm(self, topics: List[str], difficulties=PREWARM_DIFFICULTIES):
+        """Queue top-ups for topics users are likely to be quizzed on next."""
+        for topic in topics:
+            if not topic:
+                continue
+            for difficulty in difficulties:
+                key = normalize_key(topic, difficulty)
+                if len(self._questions.get(key, [])) < LOW_WATER + REFILL_BATCH:
+                    self.schedule_refill(key)
+
+    async def refill(self, key: PoolKey) -> int:
+        topic, difficulty = key
+        existing = [q["question"] for q in self._questions.get(key, [])[-20:]]
+        prompt = build_quiz_prompt(topic, difficulty, REFILL_BATCH, avoid=existing)
+        content = await llm.generate(prompt, endpoint="quiz_pool")
+        stored = await self.add(key, clean_questions(parse_llm_json(content).get("questions", [])))
+        self.refills += 1
+        return len(stored)
+
+    async def _run_worker(self):
+        while True:
+            key = await self._refill_queue.get()
+            try:
+                added = await self.refill(key)
+                print(f"Question pool refilled {key}: +{added}")
+            except Exception as e:
+                print(f"Question pool refill error for {key}: {e}")
+            finally:
+                self._pending.discard(key)
+                self._refill_queue.task_done()
+
+    def start(self):
+        try:
+            self.load()
+        except sqlite3.Error as e:
+            print(f"Warning: question pool storage unavailable, starting empty: {e}")
+        self._refill_queue = asyncio.Queue()
+        self._worker = asyncio.create_task(self._run_worker())
+
+    async def stop(self):
+        if self._worker:
+            self._worker.cancel()
+            try:
+                await self._worker
+            except asyncio.CancelledError:
+                pass
+            self._worker = None
+        self._refill_queue = None
+        self._pending.clear()
+
+    def stats(self) -> dict:
+        return {
+            "keys": len(self._questions),
+            "questions": sum(len(qs) for qs in self._questions.values()),
+            "draws": self.draws,
+            "misses": self.misses,
+            "refills": self.refills,
+            "pending_refills": len(self._pending),
+        }
+
+
+question_pool = QuestionPool(settings.QUESTION_POOL_DB_PATH)
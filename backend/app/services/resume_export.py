@@ -0,0 +1,133 @@
+import asyncio
+import io
+import json
+import re
+import zipfile
+from typing import AsyncIterator, List, Tuple
+from fastapi.concurrency import run_in_threadpool
+from app.core.cache import MemoryCache
+from app.core.config import settings
+from app.core.executors import BoundedProcessPool, PoolSaturated
+from app.core.singleflight import SingleFlight
+from app.services.pdf_generator import generate_resume_pdf, resume_digest
+
+MAX_BATCH_RESUMES = 1000
+PDF_CACHE_TTL = 3600
+
+# Rendered PDFs keyed by resume_digest, so repeated downloads of an unchanged resume skip rendering
+pdf_cache = MemoryCache(max_entries=200, ttl=PDF_CACHE_TTL, max_bytes=32 * 1024 * 1024, sizeof=len)
+pdf_renders = SingleFlight()
+
+# Batch exports render here, one resume per job
+render_pool = BoundedProcessPool(
+    "render",
+    max_workers=settings.RENDER_WORKERS,
+    max_pending=settings.RENDER_MAX_PENDING,
+    timeout=settings.RENDER_TIMEOUT_SECONDS,
+)
+
+
+async def render_resume(data: dict, template: str) -> Tuple[str, bytes]:
+    """(digest, PDF bytes) for one resume, from the memo when the same input was rendered recently."""
+    digest = resume_digest(data, template)
+    pdf_bytes = pdf_cache.get(digest)
+    if pdf_bytes is None:
+        # reportlab is synchronous; render in a worker thread, once per distinct input
+        pdf_bytes = await pdf_renders.do(digest, lambda: run_in_threadpool(generate_resume_pdf, data, template))
+        pdf_cache.set(digest, pdf_bytes)
+    return digest, pdf_bytes
+
+
+def resume_file_name(index: int, data: dict) -> str:
+    personal = data.get("personal") or {}
+    name = re.sub(r"[^A-Za-z0-9]+", "_", f"{personal.get('firstName', '')} {personal.get('lastName', '')}").strip("_")
+    return f"{index + 1:04d}_{name or 'resume'}.pdf"
+
+
+class _ZipChunks(io.RawIOBase):
+    """Write-only, unseekable sink for ZipFile; take() returns what was written since the last call."""
+
+    def __init__(self):
+        self._chunks: List[bytes] = []
+        self._offset = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        self._offset += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._offset
+
+    def take(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+async def _render_for_batch(data: dict, template: str) -> bytes:
+    pdf_bytes = pdf_cache.get(resume_digest(data, template))
+    if pdf_bytes is not None:
+        return pdf_bytes
+    # Other batches may have filled the pool's queue; wait for room instead of failing the resume
+    while True:
+        try:
+            return await render_pool.run(generate_resume_pdf, data, template)
+        except PoolSaturated:
+            await asyncio.sleep(0.2)
+
+
+async def stream_resume_zip(resumes: List[dict], template: str) -> AsyncIterator[bytes]:
+    """
+    Render resumes in the render pool and yield a zip archive as they finish.
+
+    At most two jobs per worker are outstanding, and each PDF is written to
+    the archive and handed to the response as soon as it is ready, so memory
+    holds a handful of PDFs no matter how large the batch is. Entries appear
+    in completion order; names carry the input position. Resumes that fail
+    to render are listed in errors.json at the end of the archive.
+    """
+    sink = _ZipChunks()
+    # PDFs are already compressed; storing them keeps the zip step cheap
+    archive = zipfile.ZipFile(sink, "w", compression=zipfile.ZIP_STORED)
+    window = render_pool.max_workers * 2
+    queued = iter(enumerate(resumes))
+    pending = {}
+    failures = []
+
+    def fill():
+        while len(pending) < window:
+            item = next(queued, None)
+            if item is None:
+                return
+            index, data = item
+            pending[asyncio.ensure_future(_render_for_batch(data, template))] = index
+
+    try:
+        fill()
+        while pending:
+            done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                index = pending.pop(task)
+                try:
+                    pdf_bytes = task.result()
+                except Exception as e:
+                    print(f"Resume batch render error (#{index + 1}): {e!r}")
+                    failures.append({"index": index, "error": str(e) or e.__class__.__name__})
+                    continue
+                archive.writestr(resume_file_name(index, resumes[index]), pdf_bytes)
+            fill()
+            chunk = sink.take()
+            if chunk:
+                yield chunk
+        if failures:
+            archive.writestr("errors.json", json.dumps(failures, indent=2))
+        archive.close()
+        yield sink.take()
+    finally:
+        # Client went away mid-stream: stop waiting on the rest
+        for task in pending:
+            task.cancel()
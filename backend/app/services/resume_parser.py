@@ -1,33 +1,84 @@
-import io
-import PyPDF2
-import google.generativeai as genai
+import hashlib
+from typing import Optional
 from app.core.config import settings
-import json
-import re
+from app.core import llm
+from app.core.cache import ResponseCache, cache_backend
+from app.core.database import db
+from app.core.executors import BoundedProcessPool
+from app.core.json_stream import parse_llm_json
+from app.services.pdf_text import extract_text_from_pdf
 
-# Configure Gemini
-api_key = settings.GEMINI_API_KEY or settings.GOOGLE_API_KEY
-if api_key:
-    genai.configure(api_key=api_key)
-else:
-    print("Warning: No Google/Gemini API key found in settings.")
+# PyPDF2 is pure-Python and CPU-bound; extraction runs here, off the event loop
+pdf_pool = BoundedProcessPool(
+    "pdf",
+    max_workers=settings.PDF_WORKERS,
+    max_pending=settings.PDF_MAX_PENDING,
+    timeout=settings.PDF_TIMEOUT_SECONDS,
+)
 
-model = genai.GenerativeModel('gemini-3-flash-preview')
+# Bump when the parsing prompt or output shape changes, so stored results from the old one are not reused
+RESUME_PARSER_VERSION = 1
+RESUME_CACHE_TTL = 30 * 24 * 3600
 
-def extract_text_from_pdf(file_bytes: bytes) -> str:
+# Both keyed by the SHA-256 of the uploaded file. Text is kept separately so a
+# prompt change only re-runs the LLM, not the PDF extraction.
+text_cache = ResponseCache("resume_text", RESUME_CACHE_TTL, 500, cache_backend(settings.CACHE_DB_PATH))
+parsed_cache = ResponseCache("resume_parsed", RESUME_CACHE_TTL, 500, cache_backend(settings.CACHE_DB_PATH))
+
+def content_hash(file_bytes: bytes) -> str:
+    return hashlib.sha256(file_bytes).hexdigest()
+
+def _text_key(digest: str) -> str:
+    return f"{digest}:p{settings.PDF_MAX_PAGES}:c{settings.PDF_MAX_CHARS}"
+
+async def extract_text(file_bytes: bytes, digest: Optional[str] = None) -> dict:
+    """
+    extract_text_from_pdf in the PDF pool, cached by content hash.
+
+    Stops at PDF_MAX_PAGES pages or PDF_MAX_CHARS characters, whichever comes
+    first. Returns the same dict as extract_text_from_pdf.
+    """
+    digest = digest or content_hash(file_bytes)
+    cached = await text_cache.get(_text_key(digest))
+    if cached is not None:
+        return cached
+    extraction = await pdf_pool.run(extract_text_from_pdf, file_bytes, settings.PDF_MAX_PAGES, settings.PDF_MAX_CHARS)
+    if extraction["text"]:
+        await text_cache.set(_text_key(digest), extraction)
+    return extraction
+
+async def cached_extraction_info(digest: str) -> Optional[dict]:
+    """Pages read and truncation for an already extracted file, if still cached."""
+    cached = await text_cache.get(_text_key(digest))
+    if cached is None:
+        return None
+    return {k: v for k, v in cached.items() if k != "text"}
+
+async def find_parsed_resume(digest: str) -> Optional[dict]:
+    """A stored parse of the same file: local cache first, then the resumes table."""
+    key = f"{digest}:v{RESUME_PARSER_VERSION}"
+    cached = await parsed_cache.get(key)
+    if cached is not None:
+        return cached
+    if not db.enabled:
+        return None
     try:
-        pdf_reader = PyPDF2.PdfReader(io.BytesIO(file_bytes))
-        text = ""
-        for page in pdf_reader.pages:
-            page_text = page.extract_text()
-            if page_text:
-                text += page_text + "\n"
-        return text.strip()
+        res = await db.query("resumes", lambda t: t.select("parsed_content")
+                             .eq("content_hash", digest).eq("parser_version", RESUME_PARSER_VERSION).limit(1))
     except Exception as e:
-        print(f"Error reading PDF: {e}")
-        return ""
+        print(f"Resume hash lookup error: {e}")
+        return None
+    if not res.data:
+        return None
+    parsed = res.data[0]["parsed_content"]
+    await parsed_cache.set(key, parsed)
+    return parsed
+
+async def remember_parsed_resume(digest: str, parsed: dict):
+    if "error" not in parsed:
+        await parsed_cache.set(f"{digest}:v{RESUME_PARSER_VERSION}", parsed)
 
-def parse_resume_with_llm(text: str) -> dict:
+async def parse_resume_with_llm(text: str) -> dict:
     if not text:
         print("CRITICAL: Received empty text for resume parsing.")
         return {"error": "Empty text"}
@@ -48,28 +99,16 @@ def parse_resume_with_llm(text: str) -> dict:
     Do not include markdown naming like ```json or ```.
     
     Resume Text:
-    {text[:4000]}
+    {text[:settings.PDF_MAX_CHARS]}
     """
     
     try:
-        response = model.generate_content(prompt)
-        content = response.text.strip()
-        
-        # More robust JSON extraction: find the first { and the last }
-        start_idx = content.find('{')
-        end_idx = content.rfind('}')
-        
-        if start_idx != -1 and end_idx != -1:
-            json_str = content[start_idx:end_idx+1]
-            return json.loads(json_str)
-        
-        # Fallback to cleaning known markdown
-        content = re.sub(r"```json", "", content)
-        content = re.sub(r"```", "", content)
-        return json.loads(content)
+        content = await llm.generate(prompt, endpoint="resume_parse")
+        return parse_llm_json(content)
         
     except Exception as e:
         print(f"LLM Parsing Error: {e}")
+        await llm.forget(prompt, endpoint="resume_parse")
         # Completely silent fallback - no 'Failed' labels
         return {
             "error": str(e),
@@ -0,0 +1,240 @@
+import math
+import re
+from collections import Counter
+from typing import Dict, List, Tuple
+import numpy as np
+
+# Canonical skill vocabulary (display names). Used to spot required skills in a job description.
+SKILL_VOCABULARY = [
+    # Languages
+    "Python", "Java", "JavaScript", "TypeScript", "C", "C++", "C#", "Golang", "Rust", "Kotlin", "Swift",
+    "Ruby", "PHP", "Scala", "MATLAB", "Dart", "Bash", "SQL", "HTML", "CSS", "Sass",
+    # Frontend
+    "React", "Angular", "Vue.js", "Next.js", "Redux", "Tailwind CSS", "Bootstrap", "jQuery", "Svelte",
+    "React Native", "Flutter", "Webpack", "Vite",
+    # Backend
+    "Node.js", "Express.js", "Django", "Flask", "FastAPI", "Spring Boot", "ASP.NET", ".NET",
+    "Ruby on Rails", "Laravel", "GraphQL", "REST APIs", "gRPC", "Microservices", "WebSockets",
+    # Data
+    "PostgreSQL", "MySQL", "MongoDB", "Redis", "SQLite", "Oracle", "Cassandra", "Elasticsearch",
+    "DynamoDB", "Firebase", "Supabase", "Kafka", "RabbitMQ", "Spark", "Hadoop", "Airflow", "Snowflake",
+    "ETL", "Data Warehousing", "Power BI", "Tableau", "Microsoft Excel", "Pandas", "NumPy",
+    # ML / AI
+    "Machine Learning", "Deep Learning", "NLP", "Computer Vision", "TensorFlow", "PyTorch", "Keras",
+    "Scikit-learn", "LLMs", "Generative AI", "Data Analysis", "Data Science", "Statistics",
+    # Cloud / DevOps
+    "AWS", "Azure", "GCP", "Docker", "Kubernetes", "Terraform", "Ansible", "Jenkins", "CI/CD",
+    "GitHub Actions", "Linux", "Nginx", "Serverless", "Prometheus", "Grafana",
+    # Practices / tools
+    "Git", "Agile", "Scrum", "Jira", "Unit Testing", "Test Automation", "Selenium", "Jest", "Cypress",
+    "System Design", "Data Structures", "Algorithms", "OOP", "Design Patterns", "Security",
+    "Figma", "UI/UX", "Networking", "Blockchain",
+    # Soft skills
+    "Communication", "Leadership", "Problem Solving", "Teamwork", "Project Management",
+]
+
+# Common spellings mapped to a canonical skill key. Plain English words ("go", "express",
+# "excel", "rest", "spring") are deliberately not aliased to avoid false positives in JDs.
+SKILL_ALIASES = {
+    "js": "javascript", "ts": "typescript", "python3": "python",
+    "reactjs": "react", "react js": "react", "react.js": "react",
+    "vue": "vue.js", "vuejs": "vue.js", "nextjs": "next.js", "next js": "next.js",
+    "node": "node.js", "nodejs": "node.js", "node js": "node.js", "expressjs": "express.js",
+    "postgres": "postgresql", "psql": "postgresql", "mongo": "mongodb",
+    "k8s": "kubernetes", "amazon web services": "aws", "google cloud": "gcp", "google cloud platform": "gcp",
+    "microsoft azure": "azure", "ci cd": "ci/cd", "cicd": "ci/cd",
+    "ml": "machine learning", "dl": "deep learning", "natural language processing": "nlp",
+    "genai": "generative ai", "gen ai": "generative ai", "llm": "llms",
+    "large language models": "llms", "sklearn": "scikit-learn", "scikit learn": "scikit-learn",
+    "tf": "tensorflow", "rest api": "rest apis", "restful": "rest apis",
+    "restful apis": "rest apis", "restful api": "rest apis", "tailwind": "tailwind css",
+    "springboot": "spring boot", "dotnet": ".net", "rails": "ruby on rails", "ror": "ruby on rails",
+    "oop": "oop", "object oriented programming": "oop", "object-oriented programming": "oop",
+    "dsa": "data structures", "unit tests": "unit testing", "ui ux": "ui/ux", "ux": "ui/ux",
+    "powerbi": "power bi", "ms excel": "microsoft excel",
+    "shell": "bash", "shell scripting": "bash", "github": "git", "problem-solving": "problem solving",
+    "team work": "teamwork", "communication skills": "communication",
+}
+
+_DISPLAY_NAMES: Dict[str, str] = {}
+_TOKEN_RE = re.compile(r"[a-z0-9][a-z0-9+#./-]*")
+MAX_PHRASE_WORDS = 3
+MAX_JD_CHARS = 20000
+MATCH_THRESHOLD = 0.8
+
+
+def normalize_skill(skill: str) -> str:
+    """Lowercase, collapse whitespace and map known aliases to a canonical key."""
+    key = " ".join(skill.lower().strip().strip(".,;:()").split())
+    return SKILL_ALIASES.get(key, key)
+
+
+for _name in SKILL_VOCABULARY:
+    _DISPLAY_NAMES[normalize_skill(_name)] = _name
+
+
+def _tokens(text: str) -> List[str]:
+    return [t.rstrip(".-/") for t in _TOKEN_RE.findall(text.lower()[:MAX_JD_CHARS])]
+
+
+def _phrases(tokens: List[str]) -> List[Tuple[str, int]]:
+    """All 1..MAX_PHRASE_WORDS word n-grams as (canonical phrase, position)."""
+    phrases = []
+    for n in range(1, MAX_PHRASE_WORDS + 1):
+        for i in range(len(tokens) - n + 1):
+            phrases.append((normalize_skill(" ".join(tokens[i:i + n])), i))
+    return phrases
+
+
+def _char_ngrams(text: str, n: int = 3) -> List[str]:
+    padded = f" {text} "
+    if len(padded) <= n:
+        return [padded]
+    return [padded[i:i + n] for i in range(len(padded) - n + 1)]
+
+
+def _tfidf_matrix(docs: List[str], basis_rows: int) -> np.ndarray:
+    """
+    L2-normalized character-trigram TF-IDF rows for each doc.
+
+    Only the columns for trigrams of the first `basis_rows` docs are kept:
+    every similarity we need has one of those docs on one side, so the other
+    columns would only multiply by zero. Norms still use every trigram, which
+    keeps the cosines exact while the matrix stays a few hundred columns wide
+    however long the job description is.
+    """
+    grams = [Counter(_char_ngrams(doc)) for doc in docs]
+    doc_freq: Counter = Counter()
+    for counts in grams:
+        doc_freq.update(counts.keys())
+    total = len(docs)
+    idf = {gram: math.log((1 + total) / (1 + df)) + 1 for gram, df in doc_freq.items()}
+
+    columns: Dict[str, int] = {}
+    for counts in grams[:basis_rows]:
+        for gram in counts:
+            columns.setdefault(gram, len(columns))
+
+    matrix = np.zeros((total, max(len(columns), 1)), dtype=np.float32)
+    norms = np.ones((total, 1), dtype=np.float32)
+    for row, counts in enumerate(grams):
+        squared = 0.0
+        for gram, count in counts.items():
+            weight = count * idf[gram]
+            squared += weight * weight
+            col = columns.get(gram)
+            if col is not None:
+                matrix[row, col] = weight
+        if squared:
+            norms[row, 0] = math.sqrt(squared)
+    return matrix / norms
+
+
+def _vocabulary_hits(phrases: List[Tuple[str, int]]) -> Dict[str, Tuple[int, int]]:
+    found: Dict[str, Tuple[int, int]] = {}
+    # "communication" and "communication skills" at the same spot are one mention
+    for phrase, position in set(phrases):
+        if phrase in _DISPLAY_NAMES:
+            count, first = found.get(phrase, (0, position))
+            found[phrase] = (count + 1, min(first, position))
+    return found
+
+
+def extract_jd_skills(job_description: str) -> Dict[str, Tuple[int, int]]:
+    """Vocabulary skills mentioned in a JD as {canonical: (count, first position)}."""
+    return _vocabulary_hits(_phrases(_tokens(job_description)))
+
+
+def _ranked_names(jd_skills: Dict[str, Tuple[int, int]], keys: List[str]) -> List[str]:
+    """Display names of `keys`, most mentioned first, then by first appearance in the JD."""
+    ranked = sorted(keys, key=lambda k: (-jd_skills[k][0], jd_skills[k][1]))
+    return [_DISPLAY_NAMES[k] for k in ranked]
+
+
+def score_skills(resume_skills: List[str], job_description: str) -> dict:
+    """
+    Score resume skills against a job description without calling the LLM.
+
+    Every resume skill and every vocabulary skill found in the JD is embedded
+    as a character-trigram TF-IDF vector, and all pairs are compared in one
+    cosine-similarity matrix product. Returns match_score, matched_skills,
+    missing_skills (ranked by mentions, then by how early they appear) and a
+    0-1 confidence that reflects how much of the JD was recognised.
+    """
+    return score_skills_batch(resume_skills, [job_description])[0]
+
+
+def score_skills_batch(resume_skills: List[str], job_descriptions: List[str]) -> List[dict]:
+    """
+    Score one set of resume skills against many job descriptions at once.
+
+    All JDs share one TF-IDF matrix, so the whole batch costs two matrix
+    products instead of one pass per JD. Results are in input order, each
+    shaped like score_skills().
+    """
+    resume_keys = [normalize_skill(s) for s in resume_skills if s and s.strip()]
+    resume_names = [s for s in resume_skills if s and s.strip()]
+
+    jds = []
+    for job_description in job_descriptions:
+        jd_tokens = _tokens(job_description)
+        jd_phrases_with_pos = _phrases(jd_tokens)
+        jd_skills = _vocabulary_hits(jd_phrases_with_pos)
+        jd_phrases = sorted({phrase for phrase, _ in jd_phrases_with_pos})
+        jds.append((len(jd_tokens), jd_skills, list(jd_skills), jd_phrases))
+
+    if not resume_keys:
+        return [
+            {"match_score": 0, "matched_skills": [], "missing_skills": _ranked_names(jd_skills, jd_keys), "confidence": 0.0}
+            for _, jd_skills, jd_keys, _ in jds
+        ]
+
+    # One matrix for everything so the IDF weights are shared
+    docs = list(resume_keys)
+    for _, _, jd_keys, jd_phrases in jds:
+        docs.extend(jd_keys)
+        docs.extend(jd_phrases)
+    vectors = _tfidf_matrix(docs, basis_rows=len(resume_keys))
+    resume_vecs = vectors[:len(resume_keys)]
+    # (resume skills x everything) cosine similarities for the whole batch
+    similarity = resume_vecs @ vectors[len(resume_keys):].T
+
+    results = []
+    offset = 0
+    for token_count, jd_skills, jd_keys, jd_phrases in jds:
+        skill_sims = similarity[:, offset:offset + len(jd_keys)]
+        phrase_sims = similarity[:, offset + len(jd_keys):offset + len(jd_keys) + len(jd_phrases)]
+        offset += len(jd_keys) + len(jd_phrases)
+
+        # Resume skill relevance: best match against any JD phrase
+        if jd_phrases:
+            relevance = phrase_sims.max(axis=1)
+        else:
+            relevance = np.zeros(len(resume_keys), dtype=np.float32)
+        matched_skills = [name for name, sim in zip(resume_names, relevance) if sim >= MATCH_THRESHOLD]
+
+        # JD skill coverage: best match against any resume skill
+        if jd_keys:
+            covered = skill_sims.max(axis=0) >= MATCH_THRESHOLD
+            weights = np.array([jd_skills[k][0] for k in jd_keys], dtype=np.float32)
+            coverage_ratio = float(weights[covered].sum() / weights.sum())
+            missing = [k for k, is_covered in zip(jd_keys, covered) if not is_covered]
+            missing_skills = _ranked_names(jd_skills, missing)
+        else:
+            coverage_ratio = len(matched_skills) / len(resume_keys)
+            missing_skills = []
+
+        relevance_ratio = len(matched_skills) / len(resume_keys)
+        match_score = 100 * (0.8 * coverage_ratio + 0.2 * relevance_ratio)
+
+        confidence = min(1.0, len(jd_keys) / 6)
+        if token_count < 15:
+            confidence *= 0.5
+
+        results.append({
+            "match_score": round(match_score, 2),
+            "matched_skills": matched_skills,
+            "missing_skills": missing_skills,
+            "confidence": round(confidence, 2),
+        })
+    return results
@@ -0,0 +1,62 @@
+from typing import Optional
+from app.core.cache import MemoryCache
+from app.core.database import db
+from app.core.singleflight import SingleFlight
+
+# Everything login and register need; password_hash never leaves the auth router
+USER_COLUMNS = "id, email, full_name, password_hash"
+
+# "No such user" answers are remembered briefly, so a burst of attempts against unknown
+# accounts (typos, credential stuffing) does not reach the database on every request.
+# Kept short because a user registered on another worker stays invisible here until it expires.
+MISSING_USER_TTL = 30
+missing_users = MemoryCache(max_entries=10000, ttl=MISSING_USER_TTL)
+lookups = SingleFlight()
+negative_hits = 0
+
+def lookup_field(identifier: str) -> str:
+    """New usernames cannot contain '@', so anything with one is looked up as an email first."""
+    return "email" if "@" in identifier else "username"
+
+async def find_user(identifier: str, field: Optional[str] = None) -> Optional[dict]:
+    """
+    The users row for an email or username, projected to USER_COLUMNS.
+
+    Without a field the identifier's shape picks it; an '@' identifier that is
+    not a known email is retried as a username, since accounts registered
+    before '@' was rejected in usernames may still have one. Raises whatever
+    the database client raises, so callers keep their own error handling;
+    only confirmed misses are cached.
+    """
+    if field:
+        return await _find_by(field, identifier)
+    field = lookup_field(identifier)
+    user = await _find_by(field, identifier)
+    if user is None and field == "email":
+        user = await _find_by("username", identifier)
+    return user
+
+async def _find_by(field: str, identifier: str) -> Optional[dict]:
+    global negative_hits
+    key = f"{field}:{identifier}"
+    if missing_users.get(key):
+        negative_hits += 1
+        return None
+
+    async def fetch():
+        res = await db.query("users", lambda t: t.select(USER_COLUMNS).eq(field, identifier).limit(1))
+        if not res.data:
+            missing_users.set(key, True)
+            return None
+        return res.data[0]
+
+    # Concurrent attempts on the same identifier share one query
+    return await lookups.do(key, fetch)
+
+def forget_missing(email: str, username: str):
+    """Drop cached misses for a user that now exists."""
+    missing_users.delete(f"email:{email}")
+    missing_users.delete(f"username:{username}")
+
+def stats() -> dict:
+    return {"missing_cached": len(missing_users), "negative_hits": negative_hits, **lookups.stats()}
@@ -0,0 +1,89 @@
+"""
+Upstream calls and hit rate when WORKERS processes share a cache, for each
+cache backend.
+
+Every simulated worker has its own ResponseCache (as each uvicorn worker
+would) and replays the same skewed key workload. With the memory backend each
+worker warms its own copy, so upstream calls grow with the worker count; the
+SQLite and Redis backends share one tier, so a value fetched by one worker is
+a hit for the others. The Redis run uses the local stand-in server from
+redis_standin.py. The last column is the mean latency of a lookup that misses
+memory and goes to the backend.
+
+Run from the backend directory:
+    python benchmarks/bench_cache_backends.py
+"""
+import asyncio
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.core.cache import ResponseCache, RedisBackend, SQLiteBackend  # noqa: E402
+from redis_standin import RedisStandIn  # noqa: E402
+
+WORKERS = 4
+LOOKUPS_PER_WORKER = 2000
+DISTINCT_KEYS = 300
+TTL = 3600
+
+
+def workload(seed: int) -> list:
+    rng = random.Random(seed)
+    # Popular searches dominate: Pareto-ish key popularity
+    return [f"key-{min(int(rng.paretovariate(1.2)) - 1, DISTINCT_KEYS - 1)}" for _ in range(LOOKUPS_PER_WORKER)]
+
+
+async def run(backend_factory) -> dict:
+    store = backend_factory()
+    workers = [ResponseCache("bench", TTL, 10000, store) for _ in range(WORKERS)]
+    upstream_calls = 0
+
+    async def replay(cache: ResponseCache, keys: list):
+        nonlocal upstream_calls
+        for key in keys:
+            if await cache.get(key) is None:
+                upstream_calls += 1
+                await cache.set(key, {"payload": key * 20})
+
+    await asyncio.gather(*(replay(cache, workload(i)) for i, cache in enumerate(workers)))
+
+    backend_ms = 0.0
+    if store:
+        started = time.perf_counter()
+        for i in range(200):
+            await store.get("bench", f"key-{i % DISTINCT_KEYS}")
+        backend_ms = (time.perf_counter() - started) / 200 * 1000
+        if isinstance(store, RedisBackend):
+            await store.close()
+
+    hits = sum(cache.hits for cache in workers)
+    lookups = hits + sum(cache.misses for cache in workers)
+    return {"upstream": upstream_calls, "hit_rate": hits / lookups, "backend_ms": backend_ms}
+
+
+async def main():
+    server = RedisStandIn()
+    await server.start()
+    tmp = tempfile.mkdtemp()
+
+    backends = [
+        ("memory", lambda: None),
+        ("sqlite", lambda: SQLiteBackend(os.path.join(tmp, "bench.sqlite3"))),
+        ("redis (stand-in)", lambda: RedisBackend(server.url)),
+    ]
+
+    print(f"{WORKERS} workers x {LOOKUPS_PER_WORKER} lookups over {DISTINCT_KEYS} keys")
+    print(f"{'backend':<18}{'upstream calls':>16}{'hit rate':>10}{'backend get ms':>16}")
+    for name, factory in backends:
+        result = await run(factory)
+        print(f"{name:<18}{result['upstream']:>16}{result['hit_rate']:>10.1%}{result['backend_ms']:>16.3f}")
+
+    await server.stop()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,135 @@
+"""
+Progress dashboard (GET /progress/{user_id}) under concurrent load against
+a PostgREST stand-in with LATENCY seconds per round trip, comparing:
+
+  old: the sync Supabase client in a sync endpoint, four queries one after
+       another on a request threadpool thread
+  new: the async data layer (app.core.database.db), the real route, with
+       the four queries issued together
+
+at a few client concurrencies. Also prints the per-table timings the data
+layer collected during the new runs.
+The stand-in runs in its own process; see postgrest_standin.py.
+
+Run from the backend directory:
+    python benchmarks/bench_db_async.py
+"""
+import asyncio
+import os
+import sys
+import time
+
+import httpx
+from fastapi import FastAPI
+from supabase import create_client
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from postgrest_standin import PostgRESTStandIn  # noqa: E402
+from app.core.config import settings  # noqa: E402
+from app.core.database import db  # noqa: E402
+from app.routers import progress  # noqa: E402
+from app.routers.auth import create_access_token  # noqa: E402
+
+LATENCY = 0.02
+CONCURRENCIES = (1, 10, 50)
+REQUESTS = 400
+HISTORY_ROWS = 30
+
+
+async def seed() -> str:
+    res = await db.query("users", lambda t: t.insert({"email": "student@example.com", "full_name": "Asha Rao",
+                                                      "badges": ["first-quiz"]}))
+    user_id = res.data[0]["id"]
+    await db.query("quizzes", lambda t: t.insert([
+        {"user_id": user_id, "topic": f"Topic {i}", "score": i % 10, "total_questions": 10} for i in range(HISTORY_ROWS)
+    ]))
+    await db.query("interviews", lambda t: t.insert([
+        {"user_id": user_id, "job_role": "Backend", "mode": "technical", "score": 70, "feedback": "ok"}
+        for _ in range(HISTORY_ROWS)
+    ]))
+    await db.rpc("record_progress", {"p_user_id": user_id, "p_quiz_score": 7, "p_quiz_questions": 10})
+    return user_id
+
+
+def build_app(sync_client) -> FastAPI:
+    app = FastAPI()
+    app.include_router(progress.router, prefix="/progress")
+
+    @app.get("/old/progress/{user_id}")
+    def old_progress(user_id: str):
+        progress_row = sync_client.table("user_progress").select("*").eq("user_id", user_id).limit(1).execute()
+        quizzes = sync_client.table("quizzes").select("*").eq("user_id", user_id) \
+            .order("created_at", desc=True).limit(progress.DASHBOARD_HISTORY_LIMIT).execute()
+        interviews = sync_client.table("interviews").select("*").eq("user_id", user_id) \
+            .order("created_at", desc=True).limit(progress.DASHBOARD_HISTORY_LIMIT).execute()
+        badges = sync_client.table("users").select("badges").eq("id", user_id).execute()
+        return {"progress": progress_row.data, "quiz_history": quizzes.data, "interview_history": interviews.data,
+                "badges": badges.data}
+
+    return app
+
+
+async def run(app: FastAPI, path: str, concurrency: int, headers: dict) -> dict:
+    latencies = []
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", headers=headers, timeout=None) as client:
+        remaining = iter(range(REQUESTS))
+
+        async def user():
+            for _ in remaining:
+                started = time.perf_counter()
+                response = await client.get(path)
+                response.raise_for_status()
+                body = response.json()
+                assert "error" not in body and len(body["quiz_history"]) == progress.DASHBOARD_HISTORY_LIMIT, body
+                latencies.append(time.perf_counter() - started)
+
+        started = time.perf_counter()
+        await asyncio.gather(*(user() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        "rps": REQUESTS / elapsed,
+        "p50_ms": latencies[len(latencies) // 2] * 1000,
+        "p95_ms": latencies[int(len(latencies) * 0.95)] * 1000,
+    }
+
+
+async def main():
+    server = PostgRESTStandIn(latency=LATENCY)
+    server.start()
+    settings.SUPABASE_URL = server.url
+    settings.SUPABASE_KEY = "standin-key"
+    try:
+        await db.connect()
+        user_id = await seed()
+        app = build_app(create_client(server.url, "standin-key"))
+        # The dashboard only serves the signed-in user's own data
+        headers = {"Authorization": f"Bearer {create_access_token({'sub': 'student@example.com', 'id': user_id})}"}
+        db.metrics.clear()
+
+        print(f"{REQUESTS} dashboard loads per run, {LATENCY * 1000:.0f} ms per round trip, "
+              f"DB_MAX_CONNECTIONS={settings.DB_MAX_CONNECTIONS}")
+        print(f"{'path':<34}{'clients':>8}{'req/s':>8}{'p50 ms':>9}{'p95 ms':>9}")
+        for concurrency in CONCURRENCIES:
+            for label, path in [
+                ("old: sync client, sequential", f"/old/progress/{user_id}"),
+                ("new: async data layer, gathered", f"/progress/{user_id}"),
+            ]:
+                r = await run(app, path, concurrency, headers)
+                print(f"{label:<34}{concurrency:>8}{r['rps']:>8.1f}{r['p50_ms']:>9.1f}{r['p95_ms']:>9.1f}")
+
+        print("\nper-table timings from the data layer (new runs)")
+        print(f"{'table':<26}{'queries':>9}{'errors':>8}{'p50 ms':>9}{'p95 ms':>9}")
+        for table, stats in db.stats().items():
+            print(f"{table:<26}{stats['requests']:>9}{stats['errors']:>8}{stats['p50_ms']:>9.1f}{stats['p95_ms']:>9.1f}")
+    finally:
+        await db.close()
+        server.stop()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,56 @@
+"""
+Cost of resolving the signed-in user from a bearer token: jwt.decode on
+every request (uncached) versus the claims LRU in app.core.security (cached),
+and the full current_claims -> current_user_id dependency chain on a cache hit.
+
+Run from the backend directory:
+    python benchmarks/bench_jwt_decode.py
+"""
+import asyncio
+import os
+import sys
+import time
+
+from fastapi.security import HTTPAuthorizationCredentials
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.core import security  # noqa: E402
+from app.routers.auth import create_access_token  # noqa: E402
+
+ITERATIONS = 100_000
+
+
+def per_call_us(fn, iterations: int = ITERATIONS) -> float:
+    started = time.perf_counter()
+    for _ in range(iterations):
+        fn()
+    return (time.perf_counter() - started) / iterations * 1e6
+
+
+async def dependency_us(credentials: HTTPAuthorizationCredentials, iterations: int = ITERATIONS) -> float:
+    started = time.perf_counter()
+    for _ in range(iterations):
+        claims = await security.current_claims(credentials)
+        await security.current_user_id(claims, None)
+    return (time.perf_counter() - started) / iterations * 1e6
+
+
+def main():
+    token = create_access_token({"sub": "student@example.com", "id": "3f1c2a9e-0000-4000-8000-000000000001"})
+    credentials = HTTPAuthorizationCredentials(scheme="Bearer", credentials=token)
+    security.token_claims(token)
+
+    rows = [
+        ("uncached: jwt.decode", per_call_us(lambda: security.decode_access_token(token), ITERATIONS // 10)),
+        ("cached: token_claims", per_call_us(lambda: security.token_claims(token))),
+        ("cached: dependency chain", asyncio.run(dependency_us(credentials))),
+    ]
+    print(f"HS256 token, {len(token)} bytes")
+    print(f"{'path':<28}{'us/call':>10}")
+    for label, us in rows:
+        print(f"{label:<28}{us:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+"""
+Requests per second for an LLM-backed endpoint at 200 concurrent users,
+comparing the old blocking path (sync endpoint + model.generate_content)
+with the shared async client (async endpoint + llm.generate).
+
+Gemini is replaced by a stub that takes LLM_LATENCY seconds, so the numbers
+only reflect how the server schedules waiting requests, not network noise.
+The probe column is the latency of GET / measured while the load is running.
+
+Run from the backend directory:
+    python benchmarks/bench_llm_concurrency.py
+"""
+import asyncio
+import os
+import sys
+import time
+
+import httpx
+from fastapi import FastAPI
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.core import llm  # noqa: E402
+
+CONCURRENCY = 200
+REQUESTS = 1000
+LLM_LATENCY = 0.5
+
+
+class _Response:
+    text = '{"ok": true}'
+
+
+class StubModel:
+    def generate_content(self, prompt):
+        time.sleep(LLM_LATENCY)
+        return _Response()
+
+    async def generate_content_async(self, prompt, **kwargs):
+        await asyncio.sleep(LLM_LATENCY)
+        return _Response()
+
+
+def build_app() -> FastAPI:
+    stub = StubModel()
+    llm.model = stub
+    app = FastAPI()
+
+    @app.get("/")
+    def root():
+        return {"message": "ok"}
+
+    @app.post("/old")
+    def old_path():
+        return {"text": stub.generate_content("prompt").text.strip()}
+
+    @app.post("/new")
+    async def new_path():
+        return {"text": await llm.generate("prompt")}
+
+    return app
+
+
+async def run(path: str) -> dict:
+    app = build_app()
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+        remaining = iter(range(REQUESTS))
+
+        async def user():
+            for _ in remaining:
+                await client.post(path)
+
+        async def probe(samples: list):
+            while True:
+                started = time.perf_counter()
+                await client.get("/")
+                samples.append(time.perf_counter() - started)
+                await asyncio.sleep(0.05)
+
+        probe_samples = []
+        probe_task = asyncio.create_task(probe(probe_samples))
+        started = time.perf_counter()
+        await asyncio.gather(*(user() for _ in range(CONCURRENCY)))
+        elapsed = time.perf_counter() - started
+        probe_task.cancel()
+
+    probe_samples.sort()
+    return {
+        "rps": REQUESTS / elapsed,
+        "probe_p50_ms": probe_samples[len(probe_samples) // 2] * 1000 if probe_samples else 0.0,
+        "probe_max_ms": probe_samples[-1] * 1000 if probe_samples else 0.0,
+    }
+
+
+async def main():
+    print(f"{CONCURRENCY} concurrent users, {REQUESTS} requests, stub LLM latency {LLM_LATENCY}s")
+    print(f"{'path':<28}{'req/s':>10}{'GET / p50 ms':>16}{'GET / max ms':>16}")
+    for label, path in [("old: sync generate_content", "/old"), ("new: async llm.generate", "/new")]:
+        result = await run(path)
+        print(f"{label:<28}{result['rps']:>10.1f}{result['probe_p50_ms']:>16.1f}{result['probe_max_ms']:>16.1f}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,132 @@
+"""
+Login storm: STUDENTS clients all sign in at once while two unrelated
+endpoints are probed, comparing bcrypt verify inside a sync endpoint (old:
+FastAPI's request threadpool) with the auth process pool (new).
+
+One probe endpoint is sync (it needs a threadpool thread, like most routers
+here) and one is async. Clients that get 503 wait Retry-After and try again,
+as the frontend would. Both login endpoints do only the password check, so
+the numbers reflect where bcrypt runs, not the database.
+
+Run from the backend directory:
+    python benchmarks/bench_login_storm.py
+"""
+import asyncio
+import os
+import sys
+import time
+
+import httpx
+from fastapi import FastAPI, HTTPException
+from pydantic import BaseModel
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.routers import auth  # noqa: E402
+from app.services.passwords import check_password, hash_password  # noqa: E402
+
+STUDENTS = 300
+PASSWORD = "correct horse battery staple"
+
+
+class Login(BaseModel):
+    password: str
+
+
+def build_app(password_hash: str) -> FastAPI:
+    app = FastAPI()
+
+    @app.post("/old/login")
+    def old_login(body: Login):
+        if not check_password(body.password, password_hash):
+            raise HTTPException(status_code=400)
+        return {"ok": True}
+
+    @app.post("/new/login")
+    async def new_login(body: Login):
+        if auth.auth_pool.saturated:
+            raise auth._auth_busy()
+        try:
+            ok = await auth.verify_password(body.password, password_hash)
+        except (auth.PoolSaturated, asyncio.TimeoutError):
+            raise auth._auth_busy()
+        if not ok:
+            raise HTTPException(status_code=400)
+        return {"ok": True}
+
+    @app.get("/probe/sync")
+    def probe_sync():
+        return {"ok": True}
+
+    @app.get("/probe/async")
+    async def probe_async():
+        return {"ok": True}
+
+    return app
+
+
+def percentile(samples: list, p: float) -> float:
+    samples = sorted(samples)
+    return samples[min(len(samples) - 1, int(p * len(samples)))] * 1000 if samples else float("nan")
+
+
+async def run(app: FastAPI, path: str) -> dict:
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+        shed = 0
+
+        async def student():
+            nonlocal shed
+            while True:
+                response = await client.post(path, json={"password": PASSWORD})
+                if response.status_code != 503:
+                    response.raise_for_status()
+                    return
+                shed += 1
+                await asyncio.sleep(float(response.headers["Retry-After"]))
+
+        async def probe(probe_path: str, samples: list):
+            while True:
+                started = time.perf_counter()
+                await client.get(probe_path)
+                samples.append(time.perf_counter() - started)
+                await asyncio.sleep(0.05)
+
+        sync_samples, async_samples = [], []
+        probes = [asyncio.create_task(probe("/probe/sync", sync_samples)),
+                  asyncio.create_task(probe("/probe/async", async_samples))]
+        started = time.perf_counter()
+        await asyncio.gather(*(student() for _ in range(STUDENTS)))
+        elapsed = time.perf_counter() - started
+        for task in probes:
+            task.cancel()
+
+    return {
+        "elapsed": elapsed,
+        "shed": shed,
+        "sync_p50": percentile(sync_samples, 0.5),
+        "sync_p99": percentile(sync_samples, 0.99),
+        "async_p50": percentile(async_samples, 0.5),
+        "async_p99": percentile(async_samples, 0.99),
+    }
+
+
+async def main():
+    password_hash = hash_password(PASSWORD)
+    app = build_app(password_hash)
+    # Start the workers before timing so process spawn is not counted
+    await asyncio.gather(*(auth.verify_password(PASSWORD, password_hash) for _ in range(auth.auth_pool.max_workers)))
+
+    print(f"{STUDENTS} simultaneous logins, {auth.auth_pool.max_workers} auth workers, "
+          f"{auth.auth_pool.max_pending} queued at most")
+    print(f"{'path':<22}{'seconds':>9}{'503s':>7}{'sync p50':>10}{'sync p99':>10}{'async p50':>11}{'async p99':>11}")
+    for label, path in [("old: threadpool", "/old/login"), ("new: auth pool", "/new/login")]:
+        r = await run(app, path)
+        print(f"{label:<22}{r['elapsed']:>9.1f}{r['shed']:>7}{r['sync_p50']:>10.1f}{r['sync_p99']:>10.1f}"
+              f"{r['async_p50']:>11.1f}{r['async_p99']:>11.1f}")
+    print("probe latencies in ms")
+    auth.auth_pool.shutdown()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,101 @@
+"""
+Bulk resume ingestion throughput in files per minute, comparing one
+/resume/parse request per file (old) with a single /resume/bulk zip upload
+polled until the batch completes (new).
+
+Uses the same generated PDFs and stub LLM as bench_resume_parse.py, with the
+LLM response cache off. Every file is distinct across both runs (and across
+invocations of this script), so the content-hash dedupe never answers.
+
+Run from the backend directory:
+    python benchmarks/bench_resume_bulk.py
+"""
+import asyncio
+import contextlib
+import io
+import os
+import sys
+import time
+import uuid
+import zipfile
+
+import httpx
+from fastapi import FastAPI
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from bench_resume_parse import LLM_LATENCY, StubModel, make_pdf  # noqa: E402
+from app.core import llm  # noqa: E402
+from app.routers import resume  # noqa: E402
+from app.services.bulk_resume import bulk_processor  # noqa: E402
+from app.services.pdf_text import extract_text_from_pdf  # noqa: E402
+from app.services.resume_parser import pdf_pool  # noqa: E402
+
+FILES = 60
+POLL_INTERVAL = 0.2
+
+
+def build_app() -> FastAPI:
+    llm.model = StubModel()
+    llm.caches = {}
+    app = FastAPI()
+    app.include_router(resume.router, prefix="/resume")
+    return app
+
+
+async def run_sequential(client: httpx.AsyncClient, pdfs: list) -> float:
+    started = time.perf_counter()
+    for i, pdf in enumerate(pdfs):
+        response = await client.post("/resume/parse", files={"file": (f"cv{i}.pdf", pdf, "application/pdf")})
+        response.raise_for_status()
+    return time.perf_counter() - started
+
+
+async def run_bulk(client: httpx.AsyncClient, pdfs: list) -> float:
+    archive = io.BytesIO()
+    with zipfile.ZipFile(archive, "w") as zf:
+        for i, pdf in enumerate(pdfs):
+            zf.writestr(f"resumes/cv{i}.pdf", pdf)
+
+    started = time.perf_counter()
+    response = await client.post("/resume/bulk", files={"files": ("resumes.zip", archive.getvalue(), "application/zip")})
+    response.raise_for_status()
+    status_url = response.json()["status_url"]
+    while True:
+        status = (await client.get(status_url)).json()
+        if status["status"] == "completed":
+            break
+        await asyncio.sleep(POLL_INTERVAL)
+    elapsed = time.perf_counter() - started
+    if status["counts"]["done"] != len(pdfs):
+        raise RuntimeError(f"Batch finished with counts {status['counts']}")
+    return elapsed
+
+
+async def main():
+    run_id = uuid.uuid4().hex[:8]
+    sequential_pdfs = [make_pdf(f"{run_id}-s{i}") for i in range(FILES)]
+    bulk_pdfs = [make_pdf(f"{run_id}-b{i}") for i in range(FILES)]
+    # Start the workers before timing so process spawn is not counted
+    await pdf_pool.run(extract_text_from_pdf, sequential_pdfs[0], 1)
+
+    print(f"{FILES} files, stub LLM {LLM_LATENCY}s, {pdf_pool.max_workers} PDF workers, "
+          f"{bulk_processor.llm_concurrency} concurrent LLM calls in bulk")
+    print(f"{'path':<30}{'seconds':>10}{'files/min':>12}")
+    app = build_app()
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+        for label, runner, pdfs in [
+            ("old: /resume/parse per file", run_sequential, sequential_pdfs),
+            ("new: /resume/bulk zip", run_bulk, bulk_pdfs),
+        ]:
+            # The parser logs every call; keep the table readable
+            with contextlib.redirect_stdout(io.StringIO()):
+                elapsed = await runner(client, pdfs)
+            print(f"{label:<30}{elapsed:>10.1f}{FILES / elapsed * 60:>12.0f}")
+    pdf_pool.shutdown()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
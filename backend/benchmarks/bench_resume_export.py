@@ -0,0 +1,72 @@
+"""
+Resume PDF rendering throughput by template: PDFs per second rendering one
+resume at a time in the server process (one /resume/generate per resume)
+versus one /resume/generate/batch request rendering in the worker pool and
+streaming a zip back.
+
+Every resume is distinct, so the rendered-PDF memo never answers.
+
+Run from the backend directory:
+    python benchmarks/bench_resume_export.py
+"""
+import asyncio
+import os
+import sys
+import time
+
+import httpx
+from fastapi import FastAPI
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from bench_resume_generate import RESUME  # noqa: E402
+from app.routers import resume  # noqa: E402
+from app.services.pdf_generator import TEMPLATES, generate_resume_pdf  # noqa: E402
+from app.services.resume_export import render_pool  # noqa: E402
+
+RESUMES = 120
+
+
+def make_resumes(tag: str) -> list:
+    return [dict(RESUME, personal=dict(RESUME["personal"], firstName=f"{tag}{i}")) for i in range(RESUMES)]
+
+
+async def run_single(client: httpx.AsyncClient, template: str) -> float:
+    started = time.perf_counter()
+    for data in make_resumes(f"single-{template}-"):
+        response = await client.post("/resume/generate", params={"template": template}, json=data)
+        response.raise_for_status()
+    return RESUMES / (time.perf_counter() - started)
+
+
+async def run_batch(client: httpx.AsyncClient, template: str) -> tuple:
+    started = time.perf_counter()
+    total = 0
+    async with client.stream("POST", "/resume/generate/batch",
+                             json={"template": template, "resumes": make_resumes(f"batch-{template}-")}) as response:
+        response.raise_for_status()
+        async for chunk in response.aiter_raw():
+            total += len(chunk)
+    return RESUMES / (time.perf_counter() - started), total
+
+
+async def main():
+    app = FastAPI()
+    app.include_router(resume.router, prefix="/resume")
+    # Start the workers before timing so process spawn is not counted
+    await asyncio.gather(*(render_pool.run(generate_resume_pdf, RESUME, "classic") for _ in range(render_pool.max_workers * 2)))
+
+    print(f"{RESUMES} resumes per run, {render_pool.max_workers} render workers")
+    print(f"{'template':<10}{'single PDFs/s':>15}{'batch PDFs/s':>14}{'zip KB':>9}")
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+        for template in TEMPLATES:
+            single = await run_single(client, template)
+            batch, zip_bytes = await run_batch(client, template)
+            print(f"{template:<10}{single:>15.1f}{batch:>14.1f}{zip_bytes // 1024:>9}")
+    render_pool.shutdown()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
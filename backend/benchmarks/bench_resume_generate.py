@@ -0,0 +1,92 @@
+"""
+/resume/generate for repeated downloads of an unchanged resume, comparing
+rendering inline on every request (old) with the memoized, ETag-aware
+endpoint (new).
+
+"new: conditional" sends If-None-Match with the ETag from the first
+response, as a client with the PDF already on disk would.
+
+Run from the backend directory:
+    python benchmarks/bench_resume_generate.py
+"""
+import asyncio
+import os
+import sys
+import time
+
+import httpx
+from fastapi import FastAPI
+from fastapi.responses import Response
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.routers import resume  # noqa: E402
+from app.services import resume_export  # noqa: E402
+from app.services.pdf_generator import generate_resume_pdf  # noqa: E402
+
+CONCURRENCY = 8
+DOWNLOADS = 200
+
+RESUME = {
+    "personal": {"firstName": "Asha", "lastName": "Rao", "email": "asha@example.com", "phone": "99999 00000",
+                 "summary": "Backend engineer focused on Python services and data pipelines. " * 3},
+    "experience": [
+        {"role": f"Engineer {i}", "company": f"Company {i}", "start": "2019", "end": "2021",
+         "description": "Designed and ran FastAPI services backed by PostgreSQL and Redis. " * 4}
+        for i in range(6)
+    ],
+    "education": [{"degree": "B.Tech", "field": "Computer Science", "school": "NIT", "year": "2019"}],
+    "projects": [
+        {"title": f"Project {i}", "techStack": "Python, FastAPI", "description": "Job matching service. " * 5}
+        for i in range(4)
+    ],
+    "skills": ["Python", "FastAPI", "PostgreSQL", "Redis", "Docker", "Kubernetes"],
+}
+
+
+def build_app() -> FastAPI:
+    app = FastAPI()
+    app.include_router(resume.router, prefix="/resume")
+
+    @app.post("/old/generate")
+    async def old_generate(data: dict):
+        return Response(content=generate_resume_pdf(data), media_type="application/pdf")
+
+    return app
+
+
+async def run(path: str, conditional: bool = False) -> float:
+    resume_export.pdf_cache._entries.clear()
+    transport = httpx.ASGITransport(app=build_app())
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+        headers = {}
+        if conditional:
+            first = await client.post(path, json=RESUME)
+            headers["If-None-Match"] = first.headers["ETag"]
+        remaining = iter(range(DOWNLOADS))
+
+        async def user():
+            for _ in remaining:
+                response = await client.post(path, json=RESUME, headers=headers)
+                assert response.status_code in (200, 304)
+
+        started = time.perf_counter()
+        await asyncio.gather(*(user() for _ in range(CONCURRENCY)))
+        elapsed = time.perf_counter() - started
+    return DOWNLOADS / elapsed
+
+
+async def main():
+    pdf_bytes = generate_resume_pdf(RESUME)
+    print(f"{CONCURRENCY} concurrent clients, {DOWNLOADS} downloads of one resume ({len(pdf_bytes) // 1024} KB PDF)")
+    print(f"{'path':<24}{'downloads/s':>13}")
+    for label, path, conditional in [
+        ("old: render each time", "/old/generate", False),
+        ("new: memoized", "/resume/generate", False),
+        ("new: conditional (304)", "/resume/generate", True),
+    ]:
+        print(f"{label:<24}{await run(path, conditional):>13.1f}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,137 @@
+"""
+Concurrent /resume/parse throughput, and the latency of an unrelated endpoint
+while uploads are being parsed, comparing PyPDF2 inline on the event loop
+(old) with extraction in the bounded PDF process pool (new).
+
+The LLM is a stub that takes LLM_LATENCY seconds and its response cache is
+off, so the numbers reflect how extraction is scheduled. The test PDF is
+generated with reportlab: PAGES pages of dense text. The probe columns are
+GET / latency measured while uploads are in progress. Every upload is a
+distinct file, so the content-hash cache never answers.
+
+Run from the backend directory:
+    python benchmarks/bench_resume_parse.py
+"""
+import asyncio
+import contextlib
+import io
+import os
+import sys
+import time
+
+import httpx
+from fastapi import FastAPI, File, UploadFile
+from reportlab.lib.pagesizes import A4
+from reportlab.pdfgen import canvas
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.core import llm  # noqa: E402
+from app.routers import resume  # noqa: E402
+from app.services.pdf_text import extract_text_from_pdf  # noqa: E402
+from app.services.resume_parser import parse_resume_with_llm, pdf_pool  # noqa: E402
+
+CONCURRENCY = 8
+UPLOADS = 40
+PAGES = 15
+LLM_LATENCY = 0.3
+
+
+class _Response:
+    text = '{"personal": {}, "skills": ["Python"], "education": [], "experience": [], "projects": []}'
+
+
+class StubModel:
+    async def generate_content_async(self, prompt, **kwargs):
+        await asyncio.sleep(LLM_LATENCY)
+        return _Response()
+
+
+def make_pdf(serial: int = 0) -> bytes:
+    buffer = io.BytesIO()
+    pdf = canvas.Canvas(buffer, pagesize=A4)
+    # A distinct first line per file, so the content-hash cache does not short-circuit the run
+    pdf.drawString(30, 820, f"Candidate {serial}")
+    line = "Built and operated Python, FastAPI and PostgreSQL services for high traffic workloads. " * 2
+    for page in range(PAGES):
+        y = 800
+        while y > 40:
+            pdf.drawString(30, y, line[:110])
+            y -= 12
+        pdf.showPage()
+    pdf.save()
+    return buffer.getvalue()
+
+
+def build_app() -> FastAPI:
+    llm.model = StubModel()
+    llm.caches = {}
+    app = FastAPI()
+    app.include_router(resume.router, prefix="/resume")
+
+    @app.get("/")
+    def root():
+        return {"message": "ok"}
+
+    @app.post("/old/parse")
+    async def old_parse(file: UploadFile = File(...)):
+        extraction = extract_text_from_pdf(await file.read())
+        return await parse_resume_with_llm(extraction["text"])
+
+    return app
+
+
+async def run(path: str, pdfs: list) -> dict:
+    app = build_app()
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+        remaining = iter(range(UPLOADS))
+
+        async def user():
+            for i in remaining:
+                response = await client.post(path, files={"file": ("cv.pdf", pdfs[i], "application/pdf")})
+                response.raise_for_status()
+
+        async def probe(samples: list):
+            while True:
+                started = time.perf_counter()
+                await client.get("/")
+                samples.append(time.perf_counter() - started)
+                await asyncio.sleep(0.02)
+
+        probe_samples = []
+        probe_task = asyncio.create_task(probe(probe_samples))
+        started = time.perf_counter()
+        await asyncio.gather(*(user() for _ in range(CONCURRENCY)))
+        elapsed = time.perf_counter() - started
+        probe_task.cancel()
+
+    probe_samples.sort()
+    return {
+        "uploads_per_s": UPLOADS / elapsed,
+        "probe_p50_ms": probe_samples[len(probe_samples) // 2] * 1000 if probe_samples else 0.0,
+        "probe_p95_ms": probe_samples[int(len(probe_samples) * 0.95)] * 1000 if probe_samples else 0.0,
+        "probe_max_ms": probe_samples[-1] * 1000 if probe_samples else 0.0,
+    }
+
+
+async def main():
+    pdfs = [make_pdf(i) for i in range(UPLOADS)]
+    pdf_bytes = pdfs[0]
+    # Start the workers before timing so process spawn is not counted
+    await pdf_pool.run(extract_text_from_pdf, pdf_bytes, 1)
+
+    print(f"{CONCURRENCY} concurrent uploads, {UPLOADS} total, {PAGES}-page PDF ({len(pdf_bytes) // 1024} KB), "
+          f"stub LLM {LLM_LATENCY}s, {pdf_pool.max_workers} PDF workers")
+    print(f"{'path':<24}{'uploads/s':>11}{'GET / p50 ms':>15}{'p95 ms':>10}{'max ms':>10}")
+    for label, path in [("old: inline PyPDF2", "/old/parse"), ("new: PDF process pool", "/resume/parse")]:
+        # parse_resume_with_llm logs every call; keep the table readable
+        with contextlib.redirect_stdout(io.StringIO()):
+            result = await run(path, pdfs)
+        print(f"{label:<24}{result['uploads_per_s']:>11.1f}{result['probe_p50_ms']:>15.1f}"
+              f"{result['probe_p95_ms']:>10.1f}{result['probe_max_ms']:>10.1f}")
+    pdf_pool.shutdown()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
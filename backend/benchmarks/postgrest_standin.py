@@ -0,0 +1,231 @@
+"""
+Minimal PostgREST-compatible server for exercising the data layer locally.
+
+Serves /rest/v1/<table> and /rest/v1/rpc/<fn> from in-memory tables with an
+artificial per-request LATENCY standing in for the round trip to Supabase.
+Supports what this app's queries use: select projection, eq filters, order,
+limit, insert (one row or many, with return=representation), upsert with
+on_conflict + ignore-duplicates, PATCH by eq filter, and the record_progress
+/ refresh_user_progress RPCs with the semantics of supabase_user_progress.sql.
+Any other filter operator is rejected with 400 rather than silently ignored. Not a PostgREST replacement; use it only for
+local checks and benchmarks.
+
+It runs in its own process so its work does not share the event loop (or
+the GIL) of the app under test:
+
+    server = PostgRESTStandIn(latency=0.02)
+    server.start()                  # listens on 127.0.0.1, random port
+    settings.SUPABASE_URL = server.url
+    ...
+    server.stats()                  # {"requests", "in_flight", "max_in_flight"}
+    server.stop()
+"""
+import asyncio
+import json
+import multiprocessing
+import socket
+import time
+import uuid
+from collections import defaultdict
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+
+import httpx
+
+
+def _serve(port: int, latency: float):
+    import uvicorn
+    from starlette.applications import Starlette
+    from starlette.requests import Request
+    from starlette.responses import JSONResponse, Response
+    from starlette.routing import Route
+
+    tables: Dict[str, List[dict]] = defaultdict(list)
+    load = {"requests": 0, "in_flight": 0, "max_in_flight": 0}
+
+    def counted(handler):
+        # Tracks how many requests are being served at once, for GET /_standin/stats
+        async def wrapper(request: Request):
+            load["requests"] += 1
+            load["in_flight"] += 1
+            load["max_in_flight"] = max(load["max_in_flight"], load["in_flight"])
+            try:
+                return await handler(request)
+            finally:
+                load["in_flight"] -= 1
+        return wrapper
+
+    async def stats_route(request: Request):
+        if request.method == "DELETE":
+            load.update(requests=0, max_in_flight=load["in_flight"])
+        return JSONResponse(load)
+
+    def matches(row: dict, filters: list) -> bool:
+        return all(str(row.get(column)) == value for column, value in filters)
+
+    def parse_filters(request: Request) -> list:
+        filters = []
+        for key, value in request.query_params.multi_items():
+            if key in ("select", "order", "limit", "offset", "on_conflict", "columns"):
+                continue
+            operator, _, operand = value.partition(".")
+            if operator != "eq":
+                raise ValueError(f"unsupported filter {key}={value}")
+            filters.append((key, operand))
+        return filters
+
+    def project(row: dict, select: str) -> dict:
+        if not select or select == "*":
+            return dict(row)
+        return {column: row.get(column) for column in select.split(",")}
+
+    async def table_route(request: Request):
+        await asyncio.sleep(latency)
+        table = request.path_params["table"]
+        try:
+            filters = parse_filters(request)
+        except ValueError as e:
+            return JSONResponse({"message": str(e)}, status_code=400)
+        rows = tables[table]
+
+        if request.method == "GET":
+            found = [row for row in rows if matches(row, filters)]
+            for order in reversed(",".join(request.query_params.getlist("order")).split(",")):
+                if order:
+                    column, _, direction = order.partition(".")
+                    found.sort(key=lambda row: str(row.get(column)), reverse=direction.startswith("desc"))
+            if "limit" in request.query_params:
+                found = found[:int(request.query_params["limit"])]
+            select = request.query_params.get("select", "*")
+            return JSONResponse([project(row, select) for row in found])
+
+        body = json.loads(await request.body() or b"null")
+        if request.method == "PATCH":
+            updated = [row for row in rows if matches(row, filters)]
+            for row in updated:
+                row.update(body)
+            return JSONResponse(updated)
+
+        # POST: insert or upsert
+        new_rows = body if isinstance(body, list) else [body]
+        prefer = request.headers.get("prefer", "")
+        conflict = [c for c in request.query_params.get("on_conflict", "").split(",") if c]
+        inserted = []
+        for new in new_rows:
+            if conflict and any(all(row.get(c) == new.get(c) for c in conflict) for row in rows):
+                if "ignore-duplicates" in prefer:
+                    continue
+                return JSONResponse({"message": "duplicate key value violates unique constraint"}, status_code=409)
+            row = {"id": str(uuid.uuid4()), "created_at": datetime.now(timezone.utc).isoformat(), **new}
+            rows.append(row)
+            inserted.append(row)
+        if "return=representation" in prefer:
+            return JSONResponse(inserted, status_code=201)
+        return Response(status_code=201)
+
+    def refresh_progress(user_id: str) -> dict:
+        # refresh_user_progress in supabase_user_progress.sql: recompute the row from history
+        def history(table):
+            return [row for row in tables[table] if row.get("user_id") == user_id]
+
+        quizzes, interviews, evaluations = history("quizzes"), history("interviews"), history("skill_evaluations")
+        plans = sorted(history("learning_plans"), key=lambda row: str(row.get("created_at")))
+        weeks = (plans[-1].get("plan_data") or {}).get("weeks", []) if plans else []
+        latest_evaluation = max(evaluations, key=lambda row: str(row.get("created_at")), default=None)
+        fresh = {
+            "user_id": user_id,
+            "quizzes_taken": len(quizzes),
+            "quiz_score_total": sum(row.get("score") or 0 for row in quizzes),
+            "quiz_questions_total": sum(row.get("total_questions") or 0 for row in quizzes),
+            "interviews_done": len(interviews),
+            "interview_score_total": sum(row.get("score") or 0 for row in interviews),
+            "evaluations_done": len(evaluations),
+            "last_match_score": latest_evaluation.get("match_score") if latest_evaluation else None,
+            "completed_modules": sum(1 for week in weeks if week.get("completed")),
+        }
+        tables["user_progress"][:] = [row for row in tables["user_progress"] if row.get("user_id") != user_id]
+        tables["user_progress"].append(fresh)
+        return with_generated(fresh)
+
+    def with_generated(progress: dict) -> dict:
+        # The generated columns the dashboard reads, minus overall_profile_score
+        progress["completed_activities"] = (progress["quizzes_taken"] + progress["interviews_done"]
+                                            + progress["evaluations_done"] + progress["completed_modules"])
+        return progress
+
+    async def rpc_route(request: Request):
+        await asyncio.sleep(latency)
+        params = json.loads(await request.body() or b"{}")
+        fn = request.path_params["fn"]
+        user_id = params.get("p_user_id")
+        progress = next((row for row in tables["user_progress"] if row.get("user_id") == user_id), None)
+        if fn == "record_progress":
+            # Same arithmetic as record_progress in supabase_user_progress.sql; a user without a row is
+            # seeded from history, which already holds this event
+            if progress is None:
+                return JSONResponse(refresh_progress(user_id))
+            if params.get("p_quiz_score") is not None:
+                progress["quizzes_taken"] += 1
+                progress["quiz_score_total"] += params["p_quiz_score"]
+                progress["quiz_questions_total"] += params.get("p_quiz_questions") or 0
+            if params.get("p_interview_score") is not None:
+                progress["interviews_done"] += 1
+                progress["interview_score_total"] += params["p_interview_score"]
+            progress["evaluations_done"] += params.get("p_evaluations") or 0
+            if params.get("p_match_score") is not None:
+                progress["last_match_score"] = params["p_match_score"]
+            if params.get("p_completed_modules") is not None:
+                progress["completed_modules"] = params["p_completed_modules"]
+            return JSONResponse(with_generated(progress))
+        if fn == "refresh_user_progress":
+            return JSONResponse(refresh_progress(user_id))
+        return JSONResponse({"message": f"function {fn} not found"}, status_code=404)
+
+    app = Starlette(routes=[
+        Route("/_standin/stats", stats_route, methods=["GET", "DELETE"]),
+        Route("/rest/v1/rpc/{fn}", counted(rpc_route), methods=["POST"]),
+        Route("/rest/v1/{table}", counted(table_route), methods=["GET", "POST", "PATCH"]),
+    ])
+    uvicorn.run(app, host="127.0.0.1", port=port, log_level="warning", access_log=False)
+
+
+class PostgRESTStandIn:
+    def __init__(self, latency: float = 0.02, host: str = "127.0.0.1", port: int = 0):
+        self.latency = latency
+        self.host = host
+        self.port = port
+        self._process: Optional[multiprocessing.Process] = None
+
+    @property
+    def url(self) -> str:
+        return f"http://{self.host}:{self.port}"
+
+    def start(self, timeout: float = 10.0):
+        if not self.port:
+            with socket.socket() as probe:
+                probe.bind((self.host, 0))
+                self.port = probe.getsockname()[1]
+        self._process = multiprocessing.get_context("spawn").Process(
+            target=_serve, args=(self.port, self.latency), daemon=True
+        )
+        self._process.start()
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            try:
+                socket.create_connection((self.host, self.port), timeout=0.2).close()
+                return
+            except OSError:
+                time.sleep(0.05)
+        self.stop()
+        raise RuntimeError("PostgREST stand-in did not start")
+
+    def stats(self, reset: bool = False) -> dict:
+        """Requests served and the most served at once (since the last reset)."""
+        with httpx.Client(base_url=self.url) as client:
+            return client.request("DELETE" if reset else "GET", "/_standin/stats").json()
+
+    def stop(self):
+        if self._process is not None:
+            self._process.terminate()
+            self._process.join()
+            self._process = None
@@ -0,0 +1,104 @@
+"""
+Minimal in-process Redis-protocol server for exercising RedisBackend locally.
+
+Speaks just enough RESP2 for the cache: PING, GET, SET (with EX/PX), DEL,
+EXISTS, FLUSHALL and CLIENT (accepted and ignored). Keys expire lazily on
+read. Not a Redis replacement; use it only for local checks and benchmarks.
+
+    server = RedisStandIn()
+    await server.start()            # listens on 127.0.0.1, random port
+    settings.CACHE_REDIS_URL = server.url
+    ...
+    await server.stop()
+"""
+import asyncio
+import time
+from typing import Dict, List, Optional, Tuple
+
+
+class RedisStandIn:
+    def __init__(self, host: str = "127.0.0.1", port: int = 0):
+        self.host = host
+        self.port = port
+        self.data: Dict[bytes, Tuple[bytes, Optional[float]]] = {}
+        self.commands = 0
+        self._server: Optional[asyncio.base_events.Server] = None
+
+    @property
+    def url(self) -> str:
+        return f"redis://{self.host}:{self.port}/0"
+
+    async def start(self):
+        self._server = await asyncio.start_server(self._serve, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+
+    async def stop(self):
+        if self._server:
+            self._server.close()
+            await self._server.wait_closed()
+
+    async def _serve(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            while True:
+                command = await self._read_command(reader)
+                if command is None:
+                    break
+                self.commands += 1
+                writer.write(self._execute(command))
+                await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    @staticmethod
+    async def _read_command(reader: asyncio.StreamReader) -> Optional[List[bytes]]:
+        line = await reader.readline()
+        if not line:
+            return None
+        if not line.startswith(b"*"):
+            return line.strip().split()
+        args = []
+        for _ in range(int(line[1:])):
+            size = int((await reader.readline())[1:])
+            args.append((await reader.readexactly(size + 2))[:-2])
+        return args
+
+    def _live(self, key: bytes) -> Optional[bytes]:
+        entry = self.data.get(key)
+        if entry is None:
+            return None
+        value, expires_at = entry
+        if expires_at is not None and expires_at <= time.time():
+            del self.data[key]
+            return None
+        return value
+
+    def _execute(self, args: List[bytes]) -> bytes:
+        name = args[0].upper()
+        if name == b"PING":
+            return b"+PONG\r\n"
+        if name == b"CLIENT":
+            return b"+OK\r\n"
+        if name == b"GET":
+            value = self._live(args[1])
+            return b"$-1\r\n" if value is None else b"$%d\r\n%s\r\n" % (len(value), value)
+        if name == b"SET":
+            expires_at = None
+            options = [a.upper() for a in args[3:]]
+            for i, option in enumerate(options[:-1]):
+                if option == b"PX":
+                    expires_at = time.time() + int(args[4 + i]) / 1000
+                elif option == b"EX":
+                    expires_at = time.time() + int(args[4 + i])
+            self.data[args[1]] = (args[2], expires_at)
+            return b"+OK\r\n"
+        if name == b"DEL":
+            removed = sum(1 for key in args[1:] if self.data.pop(key, None) is not None)
+            return b":%d\r\n" % removed
+        if name == b"EXISTS":
+            return b":%d\r\n" % sum(1 for key in args[1:] if self._live(key) is not None)
+        if name == b"FLUSHALL":
+            self.data.clear()
+            return b"+OK\r\n"
+        return b"-ERR unknown command '%s'\r\n" % args[0]
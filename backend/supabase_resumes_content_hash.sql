@@ -0,0 +1,13 @@
+-- Run this in Supabase SQL Editor to let /resume/parse reuse earlier results for re-uploaded files.
+-- content_hash is the SHA-256 of the uploaded bytes; parser_version is RESUME_PARSER_VERSION in
+-- app/services/resume_parser.py, so results from an older prompt are not reused.
+
+ALTER TABLE public.resumes ADD COLUMN IF NOT EXISTS content_hash TEXT;
+ALTER TABLE public.resumes ADD COLUMN IF NOT EXISTS parser_version INT;
+
+-- Lookup by file content
+CREATE INDEX IF NOT EXISTS resumes_content_hash_idx ON public.resumes (content_hash, parser_version);
+
+-- One row per user per file; re-uploads are upserted instead of duplicated.
+-- Rows without a hash (failed parses, older rows) never conflict.
+CREATE UNIQUE INDEX IF NOT EXISTS resumes_user_content_hash_key ON public.resumes (user_id, content_hash, parser_version);
@@ -0,0 +1,108 @@
+-- Run this in Supabase SQL Editor to create the per-user progress aggregate.
+-- The API keeps it up to date on every quiz submit, week completion, interview
+-- and skill evaluation, so the dashboard reads one row instead of scanning history.
+
+CREATE TABLE IF NOT EXISTS public.user_progress (
+  user_id UUID PRIMARY KEY REFERENCES public.users(id) ON DELETE CASCADE,
+  quizzes_taken INT NOT NULL DEFAULT 0,
+  quiz_score_total BIGINT NOT NULL DEFAULT 0,
+  quiz_questions_total BIGINT NOT NULL DEFAULT 0,
+  interviews_done INT NOT NULL DEFAULT 0,
+  interview_score_total BIGINT NOT NULL DEFAULT 0,
+  evaluations_done INT NOT NULL DEFAULT 0,
+  last_match_score INT,
+  completed_modules INT NOT NULL DEFAULT 0,
+  completed_activities INT GENERATED ALWAYS AS (quizzes_taken + interviews_done + evaluations_done + completed_modules) STORED,
+  average_quiz_score INT GENERATED ALWAYS AS (
+    CASE WHEN quizzes_taken > 0 THEN round(quiz_score_total::numeric / quizzes_taken)::int ELSE 0 END
+  ) STORED,
+  -- Mean of the quiz percentage, interview average and latest match score, over those that exist
+  overall_profile_score INT GENERATED ALWAYS AS (
+    coalesce(round(
+      (coalesce(quiz_score_total * 100.0 / nullif(quiz_questions_total, 0), 0)
+       + coalesce(interview_score_total::numeric / nullif(interviews_done, 0), 0)
+       + coalesce(last_match_score, 0))
+      / nullif((quiz_questions_total > 0)::int + (interviews_done > 0)::int + (last_match_score IS NOT NULL)::int, 0)
+    )::int, 0)
+  ) STORED,
+  last_updated TIMESTAMPTZ NOT NULL DEFAULT now()
+);
+
+-- Full recompute from the history tables. Seeds a user's row (the backfill below, and
+-- record_progress / the dashboard read when a user has none yet) and repairs drift.
+CREATE OR REPLACE FUNCTION public.refresh_user_progress(p_user_id UUID)
+RETURNS public.user_progress
+LANGUAGE sql AS $$
+  INSERT INTO public.user_progress AS up (
+    user_id, quizzes_taken, quiz_score_total, quiz_questions_total,
+    interviews_done, interview_score_total, evaluations_done, last_match_score, completed_modules
+  )
+  SELECT
+    p_user_id,
+    (SELECT count(*) FROM public.quizzes WHERE user_id = p_user_id),
+    (SELECT coalesce(sum(score), 0) FROM public.quizzes WHERE user_id = p_user_id),
+    (SELECT coalesce(sum(total_questions), 0) FROM public.quizzes WHERE user_id = p_user_id),
+    (SELECT count(*) FROM public.interviews WHERE user_id = p_user_id),
+    (SELECT coalesce(sum(score), 0) FROM public.interviews WHERE user_id = p_user_id),
+    (SELECT count(*) FROM public.skill_evaluations WHERE user_id = p_user_id),
+    (SELECT match_score FROM public.skill_evaluations WHERE user_id = p_user_id ORDER BY created_at DESC LIMIT 1),
+    (SELECT count(*) FROM public.learning_plans lp, jsonb_array_elements(lp.plan_data->'weeks') AS w
+      WHERE lp.id = (SELECT id FROM public.learning_plans WHERE user_id = p_user_id ORDER BY created_at DESC LIMIT 1)
+        AND (w->>'completed')::boolean)
+  ON CONFLICT (user_id) DO UPDATE SET
+    quizzes_taken = excluded.quizzes_taken,
+    quiz_score_total = excluded.quiz_score_total,
+    quiz_questions_total = excluded.quiz_questions_total,
+    interviews_done = excluded.interviews_done,
+    interview_score_total = excluded.interview_score_total,
+    evaluations_done = excluded.evaluations_done,
+    last_match_score = excluded.last_match_score,
+    completed_modules = excluded.completed_modules,
+    last_updated = now()
+  RETURNING *;
+$$;
+
+-- Atomic increment: one update per event, safe under concurrent writes for the same user.
+-- completed_modules is an absolute count (re-completing a week must not double count).
+-- Callers store the event in its history table first, so a user without a row yet is seeded
+-- from history instead; the recompute already includes this event and everything before it.
+CREATE OR REPLACE FUNCTION public.record_progress(
+  p_user_id UUID,
+  p_quiz_score INT DEFAULT NULL,
+  p_quiz_questions INT DEFAULT NULL,
+  p_interview_score INT DEFAULT NULL,
+  p_evaluations INT DEFAULT 0,
+  p_match_score INT DEFAULT NULL,
+  p_completed_modules INT DEFAULT NULL
+) RETURNS public.user_progress
+LANGUAGE plpgsql AS $$
+DECLARE
+  result public.user_progress;
+BEGIN
+  UPDATE public.user_progress SET
+    quizzes_taken = quizzes_taken + (p_quiz_score IS NOT NULL)::int,
+    quiz_score_total = quiz_score_total + coalesce(p_quiz_score, 0),
+    quiz_questions_total = quiz_questions_total + coalesce(p_quiz_questions, 0),
+    interviews_done = interviews_done + (p_interview_score IS NOT NULL)::int,
+    interview_score_total = interview_score_total + coalesce(p_interview_score, 0),
+    evaluations_done = evaluations_done + p_evaluations,
+    last_match_score = coalesce(p_match_score, last_match_score),
+    completed_modules = coalesce(p_completed_modules, completed_modules),
+    last_updated = now()
+  WHERE user_id = p_user_id
+  RETURNING * INTO result;
+
+  IF NOT FOUND THEN
+    result := public.refresh_user_progress(p_user_id);
+  END IF;
+  RETURN result;
+END;
+$$;
+
+-- Backfill every existing user, so counters include activity from before this table existed
+-- even for users whose first post-deploy event is a write. Safe to re-run: it recomputes.
+SELECT count(public.refresh_user_progress(id)) FROM public.users;
+
+-- Indexes for the history queries (latest N per user, keyset pages on created_at, id)
+CREATE INDEX IF NOT EXISTS quizzes_user_created_idx ON public.quizzes (user_id, created_at DESC, id DESC);
+CREATE INDEX IF NOT EXISTS interviews_user_created_idx ON public.interviews (user_id, created_at DESC, id DESC);
@@ -0,0 +1,17 @@
+import os
+import sys
+
+import pytest
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+# The local stand-in servers live with the benchmarks
+sys.path.insert(0, os.path.join(BACKEND_DIR, "benchmarks"))
+
+# Keep tests off the on-disk caches in data/
+os.environ.setdefault("CACHE_BACKEND", "memory")
+
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
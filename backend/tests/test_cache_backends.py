@@ -0,0 +1,94 @@
+import sqlite3
+import time
+
+import pytest
+
+from app.core.cache import CacheBackend, RedisBackend, SQLiteBackend
+from redis_standin import RedisStandIn
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+async def redis_backend():
+    server = RedisStandIn()
+    await server.start()
+    backend = RedisBackend(server.url)
+    yield backend
+    await backend.close()
+    await server.stop()
+
+
+@pytest.fixture
+def sqlite_backend(tmp_path):
+    return SQLiteBackend(str(tmp_path / "cache.sqlite3"))
+
+
+@pytest.fixture(params=["redis", "sqlite"])
+def backend(request):
+    return request.getfixturevalue(f"{request.param}_backend")
+
+
+def test_backend_is_abstract():
+    with pytest.raises(TypeError):
+        CacheBackend()
+
+
+async def test_set_then_get(backend):
+    expires_at = time.time() + 60
+    await backend.set("jobs", "python:pune", {"data": [1, 2]}, expires_at)
+
+    value, stored_expiry = await backend.get("jobs", "python:pune")
+    assert value == {"data": [1, 2]}
+    assert stored_expiry == pytest.approx(expires_at)
+
+
+async def test_missing_key_and_namespaces(backend):
+    await backend.set("jobs", "k", "jobs value", time.time() + 60)
+
+    assert await backend.get("jobs", "other") is None
+    assert await backend.get("rates", "k") is None
+
+
+async def test_entry_expires(backend):
+    await backend.set("jobs", "k", "v", time.time() + 0.05)
+    assert await backend.get("jobs", "k") is not None
+
+    time.sleep(0.1)
+    assert await backend.get("jobs", "k") is None
+
+
+async def test_delete(backend):
+    await backend.set("jobs", "k", "v", time.time() + 60)
+    await backend.delete("jobs", "k")
+
+    assert await backend.get("jobs", "k") is None
+
+
+async def test_redis_ttl_is_set_server_side(redis_backend):
+    await redis_backend.set("jobs", "k", "v", time.time() + 0.05)
+    await redis_backend.set("jobs", "already-expired", "v", time.time() - 1)
+
+    time.sleep(0.1)
+    # The key itself is gone, not just filtered out by the client
+    assert await redis_backend.client.exists(redis_backend._key("jobs", "k")) == 0
+    assert await redis_backend.client.exists(redis_backend._key("jobs", "already-expired")) == 0
+
+
+def test_sqlite_purges_expired_rows_periodically(tmp_path):
+    path = str(tmp_path / "cache.sqlite3")
+    backend = SQLiteBackend(path)
+    store = backend.store
+    store.set("jobs", "new", "v", time.time() + 60)
+    store.set("jobs", "old", "v", time.time() - 1)
+
+    def rows():
+        with sqlite3.connect(path) as conn:
+            return {key for (key,) in conn.execute("SELECT key FROM cache_entries")}
+
+    # Only the first write purged, so the expired row waits for the next interval
+    assert rows() == {"old", "new"}
+
+    store._last_purge = time.time() - store.PURGE_INTERVAL
+    store.set("jobs", "newer", "v", time.time() + 60)
+    assert rows() == {"new", "newer"}
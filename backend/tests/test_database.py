@@ -0,0 +1,131 @@
+import asyncio
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from postgrest.exceptions import APIError
+
+from app.core.config import settings
+from app.core.database import Database
+from app.routers import progress
+from app.routers.auth import create_access_token
+from app.services import user_service
+from app.services.progress_service import record_progress
+from postgrest_standin import PostgRESTStandIn
+
+pytestmark = pytest.mark.anyio
+
+LATENCY = 0.05
+
+
+@pytest.fixture(scope="module")
+def server():
+    server = PostgRESTStandIn(latency=LATENCY)
+    server.start()
+    yield server
+    server.stop()
+
+
+@pytest.fixture
+def configured(server, monkeypatch):
+    monkeypatch.setattr(settings, "SUPABASE_URL", server.url)
+    monkeypatch.setattr(settings, "SUPABASE_KEY", "standin-key")
+
+
+@pytest.fixture
+async def database(configured):
+    database = Database()
+    await database.connect()
+    yield database
+    await database.close()
+
+
+async def test_query_round_trip(database):
+    inserted = await database.query("quizzes", lambda t: t.insert({"user_id": "u-round-trip", "score": 7}))
+    row_id = inserted.data[0]["id"]
+
+    res = await database.query("quizzes", lambda t: t.select("id, score").eq("user_id", "u-round-trip"))
+
+    assert res.data == [{"id": row_id, "score": 7}]
+    assert database.stats()["quizzes"]["requests"] == 2
+    assert database.stats()["quizzes"]["errors"] == 0
+
+
+async def test_rpc(database):
+    await database.query("quizzes", lambda t: t.insert({"user_id": "u-rpc", "score": 4, "total_questions": 10}))
+
+    res = await database.rpc("record_progress", {"p_user_id": "u-rpc", "p_quiz_score": 4, "p_quiz_questions": 10})
+
+    # First event for the user: the row is seeded from history, which already holds the quiz
+    assert res.data["quizzes_taken"] == 1
+    assert res.data["quiz_score_total"] == 4
+    assert database.stats()["rpc:record_progress"]["requests"] == 1
+
+
+async def test_failed_query_is_counted_and_raised(database):
+    with pytest.raises(APIError):
+        await database.query("quizzes", lambda t: t.select("*").gt("score", 5))
+
+    assert database.stats()["quizzes"]["errors"] == 1
+
+
+async def test_concurrency_is_capped_at_max_connections(server, configured, monkeypatch):
+    monkeypatch.setattr(settings, "DB_MAX_CONNECTIONS", 3)
+    database = Database()
+    server.stats(reset=True)
+    try:
+        await asyncio.gather(*(database.query("users", lambda t: t.select("id")) for _ in range(12)))
+    finally:
+        await database.close()
+
+    stats = server.stats()
+    assert stats["requests"] == 12
+    assert stats["max_in_flight"] == 3
+
+
+async def test_at_sign_login_falls_back_to_legacy_usernames(database, monkeypatch):
+    monkeypatch.setattr(user_service, "db", database)
+    await database.query("users", lambda t: t.insert([
+        {"email": "asha@example.com", "username": "asha", "full_name": "Asha Rao"},
+        # Registered before '@' was rejected in usernames
+        {"email": "ravi@example.com", "username": "ravi@work", "full_name": "Ravi Iyer"},
+    ]))
+
+    assert (await user_service.find_user("asha@example.com"))["full_name"] == "Asha Rao"
+    assert (await user_service.find_user("ravi@work"))["email"] == "ravi@example.com"
+    assert await user_service.find_user("ravi@work", field="email") is None
+    assert await user_service.find_user("nobody@example.com") is None
+
+
+async def test_disabled_without_credentials(monkeypatch):
+    monkeypatch.setattr(settings, "SUPABASE_URL", None)
+    monkeypatch.setattr(settings, "SUPABASE_KEY", None)
+    database = Database()
+
+    await database.connect()
+
+    assert not database.enabled
+    assert database._client is None
+
+
+async def test_disabled_when_client_cannot_be_created(monkeypatch):
+    monkeypatch.setattr(settings, "SUPABASE_URL", "not a url")
+    monkeypatch.setattr(settings, "SUPABASE_KEY", "standin-key")
+    database = Database()
+
+    await database.connect()
+
+    assert not database.enabled
+
+
+def test_callers_skip_the_database_when_disabled(monkeypatch):
+    monkeypatch.setattr(settings, "SUPABASE_URL", None)
+    monkeypatch.setattr(settings, "SUPABASE_KEY", None)
+    app = FastAPI()
+    app.include_router(progress.router, prefix="/progress")
+
+    token = create_access_token({"sub": "u1@example.com", "id": "u1"})
+    response = TestClient(app).get("/progress/u1", headers={"Authorization": f"Bearer {token}"})
+    assert response.json() == {"error": "Database not connected"}
+    # Best-effort writes are a no-op rather than an error
+    assert asyncio.run(record_progress("u1", quiz_score=3, quiz_questions=5)) is None
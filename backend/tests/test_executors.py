@@ -0,0 +1,53 @@
+import asyncio
+import time
+
+import pytest
+
+from app.core.executors import BoundedProcessPool
+
+pytestmark = pytest.mark.anyio
+
+
+def nap(seconds: float) -> float:
+    time.sleep(seconds)
+    return seconds
+
+
+@pytest.fixture
+def pool():
+    pool = BoundedProcessPool("test", max_workers=2, max_pending=4, timeout=1.5)
+    yield pool
+    pool.shutdown()
+
+
+async def warm_up(pool):
+    # Spawning workers is slow; keep it out of the timeouts under test
+    await asyncio.gather(*(pool.run(nap, 0) for _ in range(pool.max_workers)))
+
+
+async def test_job_caught_in_a_restart_is_resubmitted(pool):
+    await warm_up(pool)
+    hung = asyncio.ensure_future(pool.run(nap, 30))
+    await asyncio.sleep(1.2)
+    # Still running in the same workers when the hung job times out and they are replaced
+    neighbour = asyncio.ensure_future(pool.run(nap, 0.5))
+
+    with pytest.raises(asyncio.TimeoutError):
+        await hung
+    assert await neighbour == 0.5
+    assert pool.restarts == 1
+    assert pool.stats()["resubmitted"] == 1
+
+
+async def test_late_failure_does_not_tear_down_the_new_workers(pool):
+    await warm_up(pool)
+    old_executor = pool._get_executor()
+    pool._restart(old_executor)
+    new_executor = pool._get_executor()
+
+    # A job that failed on the old executor reports it after the replacement
+    pool._restart(old_executor)
+
+    assert pool._executor is new_executor
+    assert pool.restarts == 1
+    assert await pool.run(nap, 0) == 0
@@ -0,0 +1,104 @@
+import json
+import random
+
+import pytest
+
+from app.core.json_stream import StreamingJSONParser, parse_llm_json
+
+DOCUMENT = json.dumps({
+    "summary": 'Strong "backend" fit {not a brace} [nor a bracket], \\ path C:\\temp\nsecond line',
+    "score": 85,
+    "ratio": -1.5e3,
+    "hired": False,
+    "notes": None,
+    "greeting": "caf\u00e9 \u2014 \U0001f600",
+    "questions": [
+        {"question": "What does {} mean in a dict literal?", "options": ["empty", "set"], "tags": ["a", "b"]},
+        {"question": "Escape \"quotes\" and \\ slashes", "options": ["x", "}"]},
+        12,
+        "plain",
+    ],
+    "meta": {"nested": {"deep": [1, {"x": "]"}]}},
+    "empty": [],
+}, ensure_ascii=False)
+
+# Same document with every non-ASCII character sent as a \u escape
+ESCAPED_DOCUMENT = json.dumps(json.loads(DOCUMENT))
+
+
+def split_randomly(text: str, rng: random.Random):
+    pos = 0
+    while pos < len(text):
+        step = rng.randint(1, 7)
+        yield text[pos:pos + step]
+        pos += step
+
+
+def stream(chunks):
+    parser = StreamingJSONParser()
+    events = []
+    for chunk in chunks:
+        events.extend(parser.feed(chunk))
+    return parser, events, parser.close()
+
+
+@pytest.mark.parametrize("document", [DOCUMENT, ESCAPED_DOCUMENT])
+@pytest.mark.parametrize("seed", range(25))
+def test_random_chunk_splits_match_json_loads(document, seed):
+    expected = json.loads(document)
+    parser, events, result = stream(split_randomly(document, random.Random(seed)))
+
+    assert result == expected
+    assert not parser.truncated
+    fields = {name: value for kind, name, value in events if kind == "field"}
+    assert fields == expected
+    items = [value for kind, name, value in events if kind == "item" and name == "questions"]
+    assert items == expected["questions"]
+
+
+@pytest.mark.parametrize("document", [DOCUMENT, ESCAPED_DOCUMENT])
+def test_string_deltas_survive_escapes_split_across_chunks(document):
+    expected = json.loads(document)
+    # One character at a time splits every escape, including each \uXXXX and surrogate pair
+    _, events, _ = stream(document)
+
+    for name in ("summary", "greeting"):
+        text = "".join(value for kind, field, value in events if kind == "delta" and field == name)
+        assert text == expected[name]
+
+
+def test_braces_inside_strings_do_not_close_the_object():
+    document = '{"a": "}}]]", "b": "{[", "c": 1}'
+    _, _, result = stream([document[:8], document[8:17], document[17:]])
+    assert result == {"a": "}}]]", "b": "{[", "c": 1}
+
+
+def test_text_around_the_object_is_ignored():
+    _, _, result = stream(["```json\n", '{"a": 1}', "\n``` and {more}"])
+    assert result == {"a": 1}
+
+
+def test_truncation_at_every_offset_recovers_only_complete_values():
+    expected = json.loads(DOCUMENT)
+    for cut in range(len(DOCUMENT)):
+        parser, _, result = stream([DOCUMENT[:cut]])
+        assert parser.truncated == parser.started
+        for name, value in result.items():
+            if isinstance(value, list) and value != expected[name]:
+                # An array cut off mid-way keeps only the elements that closed
+                assert value == expected[name][:len(value)], (cut, name)
+            else:
+                assert value == expected[name], (cut, name)
+
+
+@pytest.mark.parametrize("partial", ['{"score": 8', '{"hired": tr', '{"notes": nul', '{"ratio": -1.5e'])
+def test_trailing_scalar_is_dropped_when_cut_off(partial):
+    parser, _, result = stream([partial])
+    assert parser.truncated
+    assert result == {}
+
+
+def test_parse_llm_json_recovers_completed_fields_only():
+    assert parse_llm_json('Here you go: {"score": 85, "summary": "ok", "rating": 4') == {"score": 85, "summary": "ok"}
+    with pytest.raises(ValueError):
+        parse_llm_json('{"score": 8')
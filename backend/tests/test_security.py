@@ -0,0 +1,61 @@
+from typing import Optional
+
+import pytest
+from fastapi import Depends, FastAPI
+from fastapi.testclient import TestClient
+
+from app.core.config import settings
+from app.core.security import current_user_id
+from app.routers import progress
+from app.routers.auth import create_access_token
+
+NO_DATABASE = {"error": "Database not connected"}
+
+
+@pytest.fixture
+def client(monkeypatch):
+    monkeypatch.setattr(settings, "SUPABASE_URL", None)
+    monkeypatch.setattr(settings, "SUPABASE_KEY", None)
+    app = FastAPI()
+    app.include_router(progress.router, prefix="/progress")
+
+    @app.get("/whoami")
+    async def whoami(user_id: Optional[str] = Depends(current_user_id)):
+        return {"user_id": user_id}
+
+    return TestClient(app)
+
+
+def bearer(user_id: str) -> dict:
+    return {"Authorization": f"Bearer {create_access_token({'sub': f'{user_id}@example.com', 'id': user_id})}"}
+
+
+def test_user_routes_need_a_token(client):
+    response = client.get("/progress/u1")
+    assert response.status_code == 401
+    assert response.headers["WWW-Authenticate"] == "Bearer"
+    assert client.get("/progress/u1/quizzes").status_code == 401
+
+
+def test_token_reads_only_its_own_user(client):
+    assert client.get("/progress/u1", headers=bearer("u1")).json() == NO_DATABASE
+    assert client.get("/progress/u2", headers=bearer("u1")).status_code == 403
+
+
+def test_bad_token_is_rejected(client):
+    response = client.get("/progress/u1", headers={"Authorization": "Bearer not-a-token"})
+    assert response.status_code == 401
+
+
+def test_user_id_query_is_ignored_without_a_token(client):
+    assert client.get("/whoami", params={"user_id": "u2"}).json() == {"user_id": None}
+    assert client.get("/whoami", params={"user_id": "u2"}, headers=bearer("u1")).json() == {"user_id": "u1"}
+
+
+def test_compatibility_setting_restores_the_user_id_fallback(client, monkeypatch):
+    monkeypatch.setattr(settings, "ALLOW_USER_ID_WITHOUT_TOKEN", True)
+
+    assert client.get("/whoami", params={"user_id": "u2"}).json() == {"user_id": "u2"}
+    assert client.get("/progress/u1").json() == NO_DATABASE
+    # A token still wins over the fallback
+    assert client.get("/progress/u2", headers=bearer("u1")).status_code == 403
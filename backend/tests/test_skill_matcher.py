@@ -0,0 +1,99 @@
+import pytest
+
+from app.core import llm
+from app.routers import evaluate
+from app.services.skill_matcher import normalize_skill, score_skills, score_skills_batch
+
+BACKEND_JD = (
+    "We are hiring a backend engineer with strong Java, Spring Boot and PostgreSQL experience. "
+    "Kubernetes and Docker are a plus. Java services, Java everywhere. Kafka nice to have."
+)
+EMBEDDED_JD = "Embedded developer writing C firmware for microcontrollers, with C and Linux drivers, Git and Bash"
+GAME_JD = "Game engine developer writing C++ code. Strong C++ and Linux, Git and Algorithms and Data Structures"
+
+
+@pytest.mark.parametrize("spelling, canonical", [
+    ("  ReactJS ", "react"),
+    ("K8s", "kubernetes"),
+    ("Node JS", "node.js"),
+    ("postgres.", "postgresql"),
+    ("scikit learn", "scikit-learn"),
+    # Plain English words are left alone on purpose
+    ("Go", "go"),
+    ("Excel", "excel"),
+])
+def test_normalize_skill_maps_aliases(spelling, canonical):
+    assert normalize_skill(spelling) == canonical
+
+
+def test_aliases_match_the_canonical_skill():
+    result = score_skills(["js", "Postgres", "k8s"], BACKEND_JD)
+    assert result["matched_skills"] == ["Postgres", "k8s"]
+    assert "PostgreSQL" not in result["missing_skills"]
+    assert "Kubernetes" not in result["missing_skills"]
+
+
+@pytest.mark.parametrize("resume_skill, job_description, required", [
+    ("JavaScript", BACKEND_JD, "Java"),
+    ("C++", EMBEDDED_JD, "C"),
+    ("C", GAME_JD, "C++"),
+])
+def test_near_miss_names_do_not_count_as_a_match(resume_skill, job_description, required):
+    result = score_skills([resume_skill], job_description)
+    assert result["matched_skills"] == []
+    assert result["match_score"] == 0
+    assert required in result["missing_skills"]
+
+
+def test_exact_skill_still_matches():
+    result = score_skills(["Java"], BACKEND_JD)
+    assert result["matched_skills"] == ["Java"]
+    assert "Java" not in result["missing_skills"]
+
+
+def test_missing_skills_rank_by_mentions_then_first_position():
+    result = score_skills(["Python"], BACKEND_JD)
+    # Java is mentioned three times; the rest once each, in the order they appear
+    assert result["missing_skills"] == ["Java", "Spring Boot", "PostgreSQL", "Kubernetes", "Docker", "Kafka"]
+
+
+def test_batch_matches_single_scoring_in_input_order():
+    resume = ["Java", "Docker", "Linux", "Git"]
+    jds = [BACKEND_JD, EMBEDDED_JD, GAME_JD, ""]
+    assert score_skills_batch(resume, jds) == [score_skills(resume, jd) for jd in jds]
+
+
+def test_no_resume_skills_lists_every_jd_skill_as_missing():
+    [result] = score_skills_batch(["", "  "], [BACKEND_JD])
+    assert result["match_score"] == 0
+    assert result["confidence"] == 0.0
+    assert result["missing_skills"] == ["Java", "Spring Boot", "PostgreSQL", "Kubernetes", "Docker", "Kafka"]
+
+
+def test_confidence_straddles_the_hybrid_threshold():
+    assert score_skills(["Java"], BACKEND_JD)["confidence"] >= evaluate.HYBRID_MIN_CONFIDENCE
+    # A short JD naming a single skill is not enough to trust the local score
+    assert score_skills(["Python"], "Python developer")["confidence"] < evaluate.HYBRID_MIN_CONFIDENCE
+
+
+@pytest.fixture
+def llm_calls(monkeypatch):
+    calls = []
+
+    async def generate(prompt, endpoint=None, generation_config=None):
+        calls.append(endpoint)
+        return '{"match_score": 42, "matched_skills": ["Python"], "missing_skills": ["Django"]}'
+
+    monkeypatch.setattr(llm, "generate", generate)
+    return calls
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize("job_description, asks_llm", [(BACKEND_JD, False), ("Python developer", True)])
+async def test_hybrid_mode_asks_the_llm_only_below_the_threshold(llm_calls, job_description, asks_llm):
+    request = evaluate.EvaluationRequest(resume_skills=["Python", "Java"], job_description=job_description)
+    result = await evaluate.evaluate_skills(request, user_id=None, mode="hybrid")
+
+    assert llm_calls == (["evaluate"] if asks_llm else [])
+    local = score_skills(["Python", "Java"], job_description)
+    assert result["match_score"] == (42 if asks_llm else local["match_score"])